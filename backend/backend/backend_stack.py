@@ -9,6 +9,8 @@ from aws_cdk import (
     aws_dynamodb as dynamodb,
     aws_iam as iam,
     aws_events as events,
+    aws_events_targets as events_targets,
+    aws_lambda_event_sources as lambda_event_sources,
     RemovalPolicy,
 )
 from constructs import Construct
@@ -26,10 +28,40 @@ class RemindMeBackend(Stack):
             self, 
             "RemindersTable",
             partition_key=dynamodb.Attribute(name="PK", type=dynamodb.AttributeType.STRING),
-            sort_key=dynamodb.Attribute(name="SK", type=dynamodb.AttributeType.STRING)
+            sort_key=dynamodb.Attribute(name="SK", type=dynamodb.AttributeType.STRING),
+            # The list view rebuild re-reads the device's partition; the images only tell it which
+            # changes (a fire moving next_occurrences on) leave the view as it is
+            stream=dynamodb.StreamViewType.NEW_AND_OLD_IMAGES
+        )
+        # Sparse index of reminders delivered by the dispatch sweeper (SCHEDULING_MODE=dispatcher).
+        # fire_bucket is '<time bucket>#<shard>' so each bucket is spread over several partitions.
+        reminders_table.add_global_secondary_index(
+            index_name="DueIndex",
+            partition_key=dynamodb.Attribute(name="fire_bucket", type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(name="next_fire_at", type=dynamodb.AttributeType.NUMBER),
+            projection_type=dynamodb.ProjectionType.INCLUDE,
+            # The sweeper counts a fire's failed deliveries from the retry fields it reads off the index
+            non_key_attributes=["eventbridge_expression", "end_date", "retried_fire_at", "dispatch_attempts"]
+        )
+        # Sparse: only reminders that are not completed carry active_device, so listing upcoming
+        # reminders reads those and not the device's whole history
+        reminders_table.add_global_secondary_index(
+            index_name="ActiveRemindersIndex",
+            partition_key=dynamodb.Attribute(name="active_device", type=dynamodb.AttributeType.STRING),
+            sort_key=dynamodb.Attribute(name="active_fire_at", type=dynamodb.AttributeType.NUMBER),
+            projection_type=dynamodb.ProjectionType.ALL
         )
         reminders_table.apply_removal_policy(RemovalPolicy.RETAIN)
 
+        # Precomputed get-reminder-list documents, one per device. Derived from RemindersTable,
+        # so they can be dropped and rebuilt at any time.
+        reminder_list_views_table = dynamodb.Table(
+            self,
+            "ReminderListViewsTable",
+            partition_key=dynamodb.Attribute(name="device_id", type=dynamodb.AttributeType.STRING),
+            removal_policy=RemovalPolicy.DESTROY
+        )
+
         customer_devices_table = dynamodb.Table(
             self, 
             "CustomerDevices",
@@ -51,6 +83,26 @@ class RemindMeBackend(Stack):
         )
         feedback_table.apply_removal_policy(RemovalPolicy.RETAIN)
 
+        # Cache of LLM parses keyed on normalized reminder text; items expire via TTL
+        parse_cache_table = dynamodb.Table(
+            self,
+            "ParseCacheTable",
+            partition_key=dynamodb.Attribute(name="cache_key", type=dynamodb.AttributeType.STRING),
+            time_to_live_attribute="expires_at",
+            removal_policy=RemovalPolicy.DESTROY
+        )
+
+        # "eventbridge" (one rule/schedule per reminder), "queue" (the same, buffered through the
+        # delivery queue) or "dispatcher" (DueIndex + minute sweeper)
+        scheduling_mode = os.getenv("SCHEDULING_MODE", "eventbridge")
+        # Given to every Lambda whose asset ships schedule_expressions, so they all agree on the
+        # mode and the DueIndex buckets
+        dispatch_environment = {
+            "SCHEDULING_MODE": scheduling_mode,
+            "DISPATCH_BUCKET_SECONDS": os.getenv("DISPATCH_BUCKET_SECONDS", "3600"),
+            "DISPATCH_SHARDS": os.getenv("DISPATCH_SHARDS", "8"),
+        }
+
         # ----------------------
         # 2) IAM ROLE FOR SCHEDULER
         # ----------------------
@@ -74,9 +126,49 @@ class RemindMeBackend(Stack):
         # ----------------------
         # 3) SQS QUEUE
         # ----------------------
-        reminders_queue = sqs.Queue(self, "RemindersQueue")
+        # Jobs that keep failing in the process-reminder-jobs worker end up here
+        reminders_dead_letter_queue = sqs.Queue(
+            self,
+            "RemindersDeadLetterQueue",
+            retention_period=Duration.days(14)
+        )
+        reminders_dead_letter_queue.apply_removal_policy(RemovalPolicy.RETAIN)
+
+        # Async parsing jobs and reminders the synchronous endpoints could not schedule.
+        # The visibility timeout must cover the worker's timeout (60s) with room for retries.
+        reminders_queue = sqs.Queue(
+            self,
+            "RemindersQueue",
+            visibility_timeout=Duration.seconds(360),
+            dead_letter_queue=sqs.DeadLetterQueue(max_receive_count=5, queue=reminders_dead_letter_queue)
+        )
         reminders_queue.apply_removal_policy(RemovalPolicy.RETAIN)
 
+        # Reminder fires in queue mode: schedules send here and process_events drains it in batches,
+        # so a popular minute becomes a few busy invocations instead of thousands of cold starts.
+        # The visibility timeout covers six times process_events' timeout (30s), as Lambda recommends.
+        delivery_dead_letter_queue = sqs.Queue(
+            self,
+            "DeliveryDeadLetterQueue",
+            retention_period=Duration.days(14)
+        )
+        delivery_dead_letter_queue.apply_removal_policy(RemovalPolicy.RETAIN)
+        delivery_queue = sqs.Queue(
+            self,
+            "DeliveryQueue",
+            visibility_timeout=Duration.seconds(180),
+            dead_letter_queue=sqs.DeadLetterQueue(max_receive_count=3, queue=delivery_dead_letter_queue)
+        )
+        delivery_queue.apply_removal_policy(RemovalPolicy.RETAIN)
+        dispatch_environment["DELIVERY_QUEUE_ARN"] = delivery_queue.queue_arn
+        # Notifications FCM rejected for good, or that kept failing, parked by process_events for redrive
+        notification_dead_letter_queue = sqs.Queue(
+            self,
+            "NotificationDeadLetterQueue",
+            retention_period=Duration.days(14)
+        )
+        notification_dead_letter_queue.apply_removal_policy(RemovalPolicy.RETAIN)
+
         # ----------------------
         # 4) LAMBDAS
         # ----------------------
@@ -101,11 +193,86 @@ class RemindMeBackend(Stack):
                 "REMINDERS_QUEUE_URL": reminders_queue.queue_url,
                 "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY"),
                 "EVENTBRIDGE_TARGET": os.getenv("EVENTBRIDGE_TARGET"),
-                "SCHEDULER_ROLE_ARN": scheduler_role.role_arn
+                "SCHEDULER_ROLE_ARN": scheduler_role.role_arn,
+                "FAST_PARSER_MODE": os.getenv("FAST_PARSER_MODE", "on"),
+                "PARSE_CACHE_TABLE_NAME": parse_cache_table.table_name,
+                "LLM_FALLBACK_MODEL": os.getenv("LLM_FALLBACK_MODEL", "gpt-4o-mini"),
+                "ASYNC_PARSING_DEFAULT": os.getenv("ASYNC_PARSING_DEFAULT", "false"),
+                **dispatch_environment
+            },
+            architecture=_lambda.Architecture.X86_64
+        )
+
+        # (a.1) set-reminders-by-text-batch (shares the set_reminder_by_text code)
+        set_reminders_by_text_batch_lambda = _lambda.Function(
+            self,
+            "SetRemindersByTextBatchFunction",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="set_reminders_by_text_batch.handler",
+            timeout=Duration.seconds(60),
+            code=_lambda.Code.from_asset("backend/lambdas/set_reminder_by_text"),
+            layers=[
+                _lambda.LayerVersion.from_layer_version_arn(
+                    self,
+                    "DependenciesLayer7",
+                    os.getenv("LAMBDA_LAYER_ARN")
+                )
+            ],
+            environment={
+                "REMINDERS_TABLE_NAME": reminders_table.table_name,
+                "REMINDERS_QUEUE_ARN": reminders_queue.queue_arn,
+                "REMINDERS_QUEUE_URL": reminders_queue.queue_url,
+                "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY"),
+                "EVENTBRIDGE_TARGET": os.getenv("EVENTBRIDGE_TARGET"),
+                "SCHEDULER_ROLE_ARN": scheduler_role.role_arn,
+                "FAST_PARSER_MODE": os.getenv("FAST_PARSER_MODE", "on"),
+                "PARSE_CACHE_TABLE_NAME": parse_cache_table.table_name,
+                "LLM_FALLBACK_MODEL": os.getenv("LLM_FALLBACK_MODEL", "gpt-4o-mini"),
+                **dispatch_environment
             },
             architecture=_lambda.Architecture.X86_64
         )
 
+        # (a.2) process-reminder-jobs: parses and schedules reminders queued on RemindersQueue
+        process_reminder_jobs_lambda = _lambda.Function(
+            self,
+            "ProcessReminderJobsFunction",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="process_reminder_jobs.handler",
+            timeout=Duration.seconds(60),
+            code=_lambda.Code.from_asset("backend/lambdas/set_reminder_by_text"),
+            layers=[
+                _lambda.LayerVersion.from_layer_version_arn(
+                    self,
+                    "DependenciesLayer8",
+                    os.getenv("LAMBDA_LAYER_ARN")
+                )
+            ],
+            environment={
+                "REMINDERS_TABLE_NAME": reminders_table.table_name,
+                "REMINDERS_QUEUE_ARN": reminders_queue.queue_arn,
+                "REMINDERS_QUEUE_URL": reminders_queue.queue_url,
+                "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY"),
+                "EVENTBRIDGE_TARGET": os.getenv("EVENTBRIDGE_TARGET"),
+                "SCHEDULER_ROLE_ARN": scheduler_role.role_arn,
+                "FAST_PARSER_MODE": os.getenv("FAST_PARSER_MODE", "on"),
+                "PARSE_CACHE_TABLE_NAME": parse_cache_table.table_name,
+                "LLM_FALLBACK_MODEL": os.getenv("LLM_FALLBACK_MODEL", "gpt-4o-mini"),
+                **dispatch_environment
+            },
+            architecture=_lambda.Architecture.X86_64
+        )
+        # Batches share one LLM round-trip; max_concurrency caps how many run against OpenAI at once
+        process_reminder_jobs_lambda.add_event_source(
+            lambda_event_sources.SqsEventSource(
+                reminders_queue,
+                batch_size=10,
+                max_batching_window=Duration.seconds(2),
+                max_concurrency=int(os.getenv("REMINDER_JOBS_MAX_CONCURRENCY", "5")),
+                report_batch_item_failures=True
+            )
+        )
+
         # (b) set-reminder-manually
         set_reminder_manually_lambda = _lambda.Function(
             self,
@@ -127,7 +294,8 @@ class RemindMeBackend(Stack):
                 "REMINDERS_QUEUE_URL": reminders_queue.queue_url,
                 "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY"),
                 "EVENTBRIDGE_TARGET": os.getenv("EVENTBRIDGE_TARGET"),
-                "SCHEDULER_ROLE_ARN": scheduler_role.role_arn
+                "SCHEDULER_ROLE_ARN": scheduler_role.role_arn,
+                **dispatch_environment
             },
             architecture=_lambda.Architecture.X86_64
         )
@@ -170,7 +338,65 @@ class RemindMeBackend(Stack):
             ],
             environment={
                 "REMINDERS_TABLE_NAME": reminders_table.table_name,
-                "EVENTBRIDGE_TARGET": os.getenv("EVENTBRIDGE_TARGET")
+                "REMINDER_LIST_VIEWS_TABLE_NAME": reminder_list_views_table.table_name,
+                "EVENTBRIDGE_TARGET": os.getenv("EVENTBRIDGE_TARGET"),
+                **dispatch_environment
+            },
+            architecture=_lambda.Architecture.X86_64
+        )
+
+        # (d1) rebuild-reminder-list-views, fed by the RemindersTable stream
+        rebuild_reminder_list_views_lambda = _lambda.Function(
+            self,
+            "RebuildReminderListViewsFunction",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="rebuild_reminder_list_views.handler",
+            timeout=Duration.seconds(60),
+            code=_lambda.Code.from_asset("backend/lambdas/get_reminder_list"),
+            layers=[
+                _lambda.LayerVersion.from_layer_version_arn(
+                    self,
+                    "DependenciesLayer11",
+                    os.getenv("LAMBDA_LAYER_ARN")
+                )
+            ],
+            environment={
+                "REMINDERS_TABLE_NAME": reminders_table.table_name,
+                "REMINDER_LIST_VIEWS_TABLE_NAME": reminder_list_views_table.table_name,
+                **dispatch_environment
+            },
+            architecture=_lambda.Architecture.X86_64
+        )
+        rebuild_reminder_list_views_lambda.add_event_source(
+            lambda_event_sources.DynamoEventSource(
+                reminders_table,
+                starting_position=_lambda.StartingPosition.LATEST,
+                batch_size=100,
+                max_batching_window=Duration.seconds(2),
+                retry_attempts=5,
+                bisect_batch_on_error=True,
+                report_batch_item_failures=True
+            )
+        )
+
+        # (d2) get-reminder-calendar, packaged with get-reminder-list whose helpers it shares
+        get_reminder_calendar_lambda = _lambda.Function(
+            self,
+            "GetReminderCalendarFunction",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="get_reminder_calendar.handler",
+            timeout=Duration.seconds(30),
+            code=_lambda.Code.from_asset("backend/lambdas/get_reminder_list"),
+            layers=[
+                _lambda.LayerVersion.from_layer_version_arn(
+                    self,
+                    "DependenciesLayer10",
+                    os.getenv("LAMBDA_LAYER_ARN")
+                )
+            ],
+            environment={
+                "REMINDERS_TABLE_NAME": reminders_table.table_name,
+                **dispatch_environment
             },
             architecture=_lambda.Architecture.X86_64
         )
@@ -216,9 +442,56 @@ class RemindMeBackend(Stack):
                 "REMINDERS_TABLE_NAME": reminders_table.table_name,
                 "SERVICE_ACCOUNT_JSON": os.getenv("SERVICE_ACCOUNT_JSON"),
                 "FIREBASE_PROJECT_ID": os.getenv("FIREBASE_PROJECT_ID"),
+                "DELIVERY_CONCURRENCY": os.getenv("DELIVERY_CONCURRENCY", "16"),
+                "NOTIFICATION_DEAD_LETTER_QUEUE_URL": notification_dead_letter_queue.queue_url,
+                **dispatch_environment
             },
             architecture=_lambda.Architecture.X86_64
         )
+        # Up to 100 fires per invocation; max_concurrency flattens the spike at popular minutes
+        process_events_lambda.add_event_source(
+            lambda_event_sources.SqsEventSource(
+                delivery_queue,
+                batch_size=100,
+                max_batching_window=Duration.seconds(1),
+                max_concurrency=int(os.getenv("DELIVERY_MAX_CONCURRENCY", "20")),
+                report_batch_item_failures=True
+            )
+        )
+
+        # (f.1) dispatch-due-reminders: minute sweeper over the DueIndex (shares the process_events code)
+        dispatch_due_reminders_lambda = _lambda.Function(
+            self,
+            "DispatchDueRemindersFunction",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="dispatch_due_reminders.handler",
+            timeout=Duration.seconds(60),
+            code=_lambda.Code.from_asset("backend/lambdas/process_events"),
+            layers=[
+                _lambda.LayerVersion.from_layer_version_arn(
+                    self,
+                    "DependenciesLayer9",
+                    os.getenv("LAMBDA_LAYER_ARN")
+                )
+            ],
+            environment={
+                "CUSTOMER_DEVICES_TABLE_NAME": customer_devices_table.table_name,
+                "REMINDERS_TABLE_NAME": reminders_table.table_name,
+                "SERVICE_ACCOUNT_JSON": os.getenv("SERVICE_ACCOUNT_JSON"),
+                "FIREBASE_PROJECT_ID": os.getenv("FIREBASE_PROJECT_ID"),
+                "NOTIFICATION_DEAD_LETTER_QUEUE_URL": notification_dead_letter_queue.queue_url,
+                **dispatch_environment
+            },
+            architecture=_lambda.Architecture.X86_64
+        )
+        # A single rule drives every dispatcher-mode reminder; it stays disabled in eventbridge mode
+        events.Rule(
+            self,
+            "DispatchDueRemindersSchedule",
+            schedule=events.Schedule.rate(Duration.minutes(1)),
+            targets=[events_targets.LambdaFunction(dispatch_due_reminders_lambda)],
+            enabled=scheduling_mode == "dispatcher"
+        )
 
         # (g) submit-feedback
         submit_feedback_lambda = _lambda.Function(
@@ -246,14 +519,32 @@ class RemindMeBackend(Stack):
         # ----------------------
         reminders_table.grant_read_write_data(set_reminder_by_text_lambda)
         reminders_table.grant_read_write_data(set_reminder_manually_lambda)
+        parse_cache_table.grant_read_write_data(set_reminder_by_text_lambda)
+        reminders_table.grant_read_write_data(set_reminders_by_text_batch_lambda)
+        parse_cache_table.grant_read_write_data(set_reminders_by_text_batch_lambda)
+        reminders_table.grant_read_write_data(process_reminder_jobs_lambda)
+        parse_cache_table.grant_read_write_data(process_reminder_jobs_lambda)
         reminders_table.grant_read_write_data(manage_customer_device_info_lambda)
         customer_devices_table.grant_read_write_data(manage_customer_device_info_lambda)
         reminders_table.grant_read_data(get_reminder_list_lambda)
+        reminder_list_views_table.grant_read_write_data(get_reminder_list_lambda)
+        reminders_table.grant_read_data(rebuild_reminder_list_views_lambda)
+        reminder_list_views_table.grant_read_write_data(rebuild_reminder_list_views_lambda)
+        reminders_table.grant_read_data(get_reminder_calendar_lambda)
         reminders_table.grant_read_write_data(mark_reminder_complete_lambda)
         reminders_queue.grant_send_messages(set_reminder_by_text_lambda)
         reminders_queue.grant_send_messages(set_reminder_manually_lambda)
-        customer_devices_table.grant_read_data(process_events_lambda)
-        reminders_table.grant_read_data(process_events_lambda)
+        reminders_queue.grant_send_messages(set_reminders_by_text_batch_lambda)
+        # Read/write: deliveries prune tokens FCM reports as unregistered
+        customer_devices_table.grant_read_write_data(process_events_lambda)
+        notification_dead_letter_queue.grant_send_messages(process_events_lambda)
+        reminders_table.grant_read_write_data(process_events_lambda)
+        # Schedules in queue mode: Scheduler jobs send as the scheduler role, rules as EventBridge
+        delivery_queue.grant_send_messages(scheduler_role)
+        delivery_queue.grant_send_messages(iam.ServicePrincipal("events.amazonaws.com"))
+        reminders_table.grant_read_write_data(dispatch_due_reminders_lambda)
+        customer_devices_table.grant_read_write_data(dispatch_due_reminders_lambda)
+        notification_dead_letter_queue.grant_send_messages(dispatch_due_reminders_lambda)
         feedback_table.grant_read_write_data(submit_feedback_lambda)
 
         # ----------------------
@@ -280,6 +571,47 @@ class RemindMeBackend(Stack):
             )
         )
 
+        set_reminders_by_text_batch_lambda.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=[
+                    "events:PutRule",
+                    "events:PutTargets",
+                    # Rolls back the rules of reminders whose item could not be written
+                    "events:RemoveTargets",
+                    "events:DeleteRule",
+                    "scheduler:CreateSchedule",
+                    "scheduler:UpdateSchedule",
+                    "scheduler:DeleteSchedule",
+                    "scheduler:GetSchedule",
+                    "iam:PassRole",
+                ],
+                resources=[
+                    f"arn:aws:events:{self.region}:{self.account}:rule/*",
+                    f"arn:aws:scheduler:{self.region}:{self.account}:schedule/*",
+                    scheduler_role.role_arn,
+                ]
+            )
+        )
+
+        process_reminder_jobs_lambda.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=[
+                    "events:PutRule",
+                    "events:PutTargets",
+                    "scheduler:CreateSchedule",
+                    "scheduler:UpdateSchedule",
+                    "scheduler:DeleteSchedule",
+                    "scheduler:GetSchedule",
+                    "iam:PassRole",
+                ],
+                resources=[
+                    f"arn:aws:events:{self.region}:{self.account}:rule/*",
+                    f"arn:aws:scheduler:{self.region}:{self.account}:schedule/*",
+                    scheduler_role.role_arn,
+                ]
+            )
+        )
+
         set_reminder_manually_lambda.add_to_role_policy(
             iam.PolicyStatement(
                 actions=[
@@ -310,8 +642,22 @@ class RemindMeBackend(Stack):
         # For marking the reminder complete (disabling rules)
         mark_reminder_complete_lambda.add_to_role_policy(
             iam.PolicyStatement(
-                actions=["events:DescribeRule", "events:DisableRule"],
-                resources=[f"arn:aws:events:{self.region}:{self.account}:rule/*"]
+                actions=["events:DescribeRule", "events:DisableRule", "scheduler:DeleteSchedule"],
+                resources=[
+                    f"arn:aws:events:{self.region}:{self.account}:rule/*",
+                    f"arn:aws:scheduler:{self.region}:{self.account}:schedule/*",
+                ]
+            )
+        )
+
+        # For stopping the rules and schedules of reminders that are completed or past their end_date
+        process_events_lambda.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["events:DisableRule", "scheduler:DeleteSchedule"],
+                resources=[
+                    f"arn:aws:events:{self.region}:{self.account}:rule/*",
+                    f"arn:aws:scheduler:{self.region}:{self.account}:schedule/*",
+                ]
             )
         )
 
@@ -339,6 +685,8 @@ class RemindMeBackend(Stack):
         api = apigateway.RestApi(
             self, 
             "RemindersApi",
+            # Lets handlers return gzip-compressed (base64) bodies; request bodies may then arrive base64-encoded too
+            binary_media_types=["*/*"],
             default_cors_preflight_options={
                 "allow_origins": apigateway.Cors.ALL_ORIGINS,
                 "allow_methods": ["OPTIONS", "GET", "POST"],
@@ -358,6 +706,11 @@ class RemindMeBackend(Stack):
         set_reminder_by_text_integration = apigateway.LambdaIntegration(set_reminder_by_text_lambda)
         set_reminder_by_text_resource.add_method("POST", set_reminder_by_text_integration)
 
+        # set-reminders-by-text-batch
+        set_reminders_by_text_batch_resource = api.root.add_resource("set-reminders-by-text-batch")
+        set_reminders_by_text_batch_integration = apigateway.LambdaIntegration(set_reminders_by_text_batch_lambda)
+        set_reminders_by_text_batch_resource.add_method("POST", set_reminders_by_text_batch_integration)
+
         # set-reminder-manually
         set_reminder_manually_resource = api.root.add_resource("set-reminder-manually")
         set_reminder_manually_integration = apigateway.LambdaIntegration(set_reminder_manually_lambda)
@@ -368,6 +721,11 @@ class RemindMeBackend(Stack):
         get_reminder_list_integration = apigateway.LambdaIntegration(get_reminder_list_lambda)
         get_reminder_list_resource.add_method("GET", get_reminder_list_integration)
 
+        # get-reminder-calendar
+        get_reminder_calendar_resource = api.root.add_resource("get-reminder-calendar")
+        get_reminder_calendar_integration = apigateway.LambdaIntegration(get_reminder_calendar_lambda)
+        get_reminder_calendar_resource.add_method("GET", get_reminder_calendar_integration)
+
         # mark-reminder-complete
         mark_reminder_complete_resource = api.root.add_resource("mark-reminder-complete")
         mark_reminder_complete_integration = apigateway.LambdaIntegration(mark_reminder_complete_lambda)
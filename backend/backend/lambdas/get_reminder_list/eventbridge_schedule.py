@@ -0,0 +1,291 @@
+# Shared by several Lambda assets, which are packaged separately: keep every copy of this file
+# identical (tests/unit/test_schedule_expressions.py checks this).
+import re
+import calendar
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+CRON_PATTERN = re.compile(r"cron\(([^)]*)\)$")
+RATE_PATTERN = re.compile(r"rate\((\d+)\s(day|hour|minute|week)s?\)$")
+AT_PATTERN = re.compile(r"at\(([\d-]+)T([\d:]+)\)$")
+
+RATE_UNITS = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}
+MONTH_NAMES = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12
+}
+# AWS numbers days of the week 1-7 starting on Sunday
+DAY_NAMES = {"SUN": 1, "MON": 2, "TUE": 3, "WED": 4, "THU": 5, "FRI": 6, "SAT": 7}
+MIN_YEAR = 1970
+MAX_YEAR = 2199
+
+
+def _value(token, minimum, maximum, names):
+    value = names[token] if token in names else int(token)
+    if not minimum <= value <= maximum:
+        raise ValueError(f"{token} is outside {minimum}-{maximum}")
+    return value
+
+
+def _parse_bits(field, minimum, maximum, names=None):
+    """
+    Bitset (bit n set when value n matches) for a field made of '*', values, ranges and steps.
+
+    Ranges may wrap around the end of the field (FRI-MON, 22-2).
+    """
+    names = names or {}
+    bits = 0
+    for part in field.split(","):
+        part, has_step, step = part.partition("/")
+        step = int(step) if has_step else 1
+        if step < 1:
+            raise ValueError(f"Invalid step in {field}")
+        if part in ("*", "?"):
+            low, high = minimum, maximum
+        elif "-" in part:
+            low, high = (_value(token, minimum, maximum, names) for token in part.split("-", 1))
+        else:
+            low = _value(part, minimum, maximum, names)
+            high = maximum if has_step else low
+        values = range(low, high + 1, step) if low <= high else \
+            [value for value in range(low, high + maximum - minimum + 2, step)]
+        for value in values:
+            bits |= 1 << (value if value <= maximum else value - (maximum - minimum + 1))
+    return bits
+
+
+class CompiledSchedule(ABC):
+    """An EventBridge expression compiled once, answering next-N and range queries."""
+
+    __slots__ = ("expression",)
+
+    @abstractmethod
+    def iter_after(self, after, anchor=None):
+        """Yields fire times strictly after `after`, in order."""
+
+    def next_n(self, after, count, anchor=None):
+        """The next `count` fire times strictly after `after` (fewer if the schedule ends)."""
+        fires = []
+        for fire in self.iter_after(after, anchor):
+            fires.append(fire)
+            if len(fires) == count:
+                break
+        return fires
+
+    def next_after(self, after, anchor=None):
+        """The first fire time strictly after `after`, or None if there is none."""
+        return next(self.iter_after(after, anchor), None)
+
+    def between(self, start, end, anchor=None):
+        """Every fire time with start <= fire <= end."""
+        fires = []
+        for fire in self.iter_after(start - timedelta(microseconds=1), anchor):
+            if fire > end:
+                break
+            fires.append(fire)
+        return fires
+
+
+class CronSchedule(CompiledSchedule):
+    """
+    cron(minutes hours day-of-month month day-of-week year), evaluated in the timezone of the
+    datetimes it is given (UTC for EventBridge rules).
+
+    Every field is compiled to an integer bitset. Day-of-month and day-of-week, including the
+    L, W and # forms that depend on the month, are resolved to a bitset of matching days once
+    per (year, month) and cached, so queries walk months and set bits instead of datetimes.
+    """
+
+    __slots__ = (
+        "times", "month_bits", "year_bits", "dom_bits", "dom_last_offsets", "dom_nearest_weekdays",
+        "dom_last_weekday", "dom_any", "dow_bits", "dow_last", "dow_nth", "dow_any", "_month_days"
+    )
+
+    def __init__(self, expression):
+        match = CRON_PATTERN.match(expression)
+        if not match:
+            raise ValueError("Invalid cron expression format")
+        fields = match.group(1).upper().split()
+        if len(fields) == 5:
+            fields.append("*")
+        if len(fields) != 6:
+            raise ValueError("cron expressions need six fields")
+        minutes, hours, days_of_month, months, days_of_week, years = fields
+
+        self.expression = expression
+        minute_bits = _parse_bits(minutes, 0, 59)
+        hour_bits = _parse_bits(hours, 0, 23)
+        self.times = [
+            hour * 60 + minute
+            for hour in range(24) if hour_bits >> hour & 1
+            for minute in range(60) if minute_bits >> minute & 1
+        ]
+        self.month_bits = _parse_bits(months, 1, 12, MONTH_NAMES)
+        self.year_bits = _parse_bits(years, MIN_YEAR, MAX_YEAR)
+        self._compile_days_of_month(days_of_month)
+        self._compile_days_of_week(days_of_week)
+        if not self.dom_any and not self.dow_any:
+            raise ValueError("One of day-of-month and day-of-week must be '?'")
+        self._month_days = {}
+
+    def _compile_days_of_month(self, field):
+        self.dom_bits = 0
+        self.dom_last_offsets = []
+        self.dom_nearest_weekdays = []
+        self.dom_last_weekday = False
+        self.dom_any = field in ("*", "?")
+        if self.dom_any:
+            return
+        for part in field.split(","):
+            if part == "LW":
+                self.dom_last_weekday = True
+            elif part.startswith("L"):
+                self.dom_last_offsets.append(int(part[2:]) if part.startswith("L-") else 0)
+            elif part.endswith("W"):
+                self.dom_nearest_weekdays.append(_value(part[:-1], 1, 31, {}))
+            else:
+                self.dom_bits |= _parse_bits(part, 1, 31)
+
+    def _compile_days_of_week(self, field):
+        self.dow_bits = 0
+        self.dow_last = []
+        self.dow_nth = []
+        self.dow_any = field in ("*", "?")
+        if self.dow_any:
+            return
+        for part in field.split(","):
+            if part == "L":
+                self.dow_bits |= 1 << 7  # Alone, L is the last day of the week: Saturday
+            elif part.endswith("L"):
+                self.dow_last.append(_value(part[:-1], 1, 7, DAY_NAMES))
+            elif "#" in part:
+                weekday, nth = part.split("#", 1)
+                if not 1 <= int(nth) <= 5:
+                    raise ValueError(f"Invalid # in {field}")
+                self.dow_nth.append((_value(weekday, 1, 7, DAY_NAMES), int(nth)))
+            else:
+                self.dow_bits |= _parse_bits(part, 1, 7, DAY_NAMES)
+
+    def month_days(self, year, month):
+        """Bitset of the days of a month (bit d for day d) on which the schedule fires."""
+        key = year * 12 + month
+        day_bits = self._month_days.get(key)
+        if day_bits is not None:
+            return day_bits
+
+        first_weekday, length = calendar.monthrange(year, month)
+        # AWS day of week (1 = Sunday) of day d is (first_weekday + d) % 7 + 1
+        if not self.dom_any:
+            day_bits = self.dom_bits & ((1 << (length + 1)) - 2)
+            for offset in self.dom_last_offsets:
+                if length - offset >= 1:
+                    day_bits |= 1 << (length - offset)
+            for day in self.dom_nearest_weekdays:
+                day_bits |= 1 << self._nearest_weekday(min(day, length), first_weekday, length)
+            if self.dom_last_weekday:
+                day_bits |= 1 << self._nearest_weekday(length, first_weekday, length)
+        elif not self.dow_any:
+            day_bits = 0
+            for day in range(1, length + 1):
+                weekday = (first_weekday + day) % 7 + 1
+                if self.dow_bits >> weekday & 1 \
+                        or (weekday in self.dow_last and day + 7 > length) \
+                        or (weekday, (day - 1) // 7 + 1) in self.dow_nth:
+                    day_bits |= 1 << day
+        else:
+            day_bits = (1 << (length + 1)) - 2
+
+        self._month_days[key] = day_bits
+        return day_bits
+
+    @staticmethod
+    def _nearest_weekday(day, first_weekday, length):
+        """The weekday closest to `day` without leaving the month (the W form)."""
+        weekday = (first_weekday + day) % 7 + 1
+        if weekday == 7:  # Saturday
+            return day - 1 if day > 1 else day + 2
+        if weekday == 1:  # Sunday
+            return day + 1 if day < length else day - 2
+        return day
+
+    def iter_after(self, after, anchor=None):
+        if not self.times:
+            return
+        year, month, day = after.year, after.month, after.day
+        minute_of_day = after.hour * 60 + after.minute
+        while year <= MAX_YEAR:
+            if not self.year_bits >> year & 1:
+                year, month, day, minute_of_day = year + 1, 1, 1, -1
+                continue
+            if self.month_bits >> month & 1:
+                day_bits = self.month_days(year, month) >> day << day
+                while day_bits:
+                    fire_day = (day_bits & -day_bits).bit_length() - 1
+                    day_bits &= day_bits - 1
+                    first_time = bisect_right(self.times, minute_of_day) if fire_day == day else 0
+                    for time_of_day in self.times[first_time:]:
+                        yield datetime(year, month, fire_day, time_of_day // 60, time_of_day % 60)
+            day, minute_of_day = 1, -1
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+
+
+class RateSchedule(CompiledSchedule):
+    """rate(value unit): fires every interval counted from an anchor (the start time by default)."""
+
+    __slots__ = ("interval",)
+
+    def __init__(self, expression):
+        match = RATE_PATTERN.match(expression)
+        if not match:
+            raise ValueError("Invalid rate expression format")
+        self.expression = expression
+        self.interval = int(match.group(1)) * RATE_UNITS[match.group(2)]
+        if not self.interval:
+            raise ValueError("rate() needs a positive value")
+
+    def iter_after(self, after, anchor=None):
+        anchor = anchor or after
+        # Integer arithmetic on the gap finds the first fire after `after` without stepping to it
+        steps = max(1, (after - anchor) // self.interval + 1)
+        fire = anchor + steps * self.interval
+        while True:
+            yield fire
+            fire += self.interval
+
+
+class AtSchedule(CompiledSchedule):
+    """at(yyyy-mm-ddThh:mm:ss): a single fire, in the Scheduler's timezone."""
+
+    __slots__ = ("fire_at",)
+
+    def __init__(self, expression):
+        match = AT_PATTERN.match(expression)
+        if not match:
+            raise ValueError("Invalid at expression format")
+        self.expression = expression
+        self.fire_at = datetime.strptime(f"{match.group(1)}T{match.group(2)}", "%Y-%m-%dT%H:%M:%S")
+
+    def iter_after(self, after, anchor=None):
+        if self.fire_at > after:
+            yield self.fire_at
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression):
+    """
+    Compiles an EventBridge schedule expression, caching the result by expression string.
+
+    Raises:
+        ValueError: If the expression is not a valid cron(), rate() or at() expression.
+    """
+    if expression.startswith("cron("):
+        return CronSchedule(expression)
+    elif expression.startswith("rate("):
+        return RateSchedule(expression)
+    elif expression.startswith("at("):
+        return AtSchedule(expression)
+    raise ValueError("Unsupported EventBridge expression format")
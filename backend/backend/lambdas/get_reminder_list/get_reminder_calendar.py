@@ -0,0 +1,136 @@
+import os
+import boto3
+import numpy as np
+from datetime import datetime, timedelta
+from schedule_expressions import AT_EXPRESSION_TIMEZONE
+from responses import json_response
+from get_reminder_list import REMINDERS_TABLE_NAME, get_stored_schedule_fields, query_reminder_pages
+from occurrence_expansion import expand_occurrences, format_occurrences
+
+# Initialize AWS resources
+dynamodb = boto3.resource("dynamodb")
+# Longest from/to range a client can ask for, in days
+CALENDAR_MAX_DAYS = int(os.getenv("CALENDAR_MAX_DAYS", "62"))
+# Most occurrences in one response, which keeps it far below Lambda's 6 MB payload limit;
+# the rest of the range is fetched with ?offset=
+CALENDAR_MAX_OCCURRENCES = int(os.getenv("CALENDAR_MAX_OCCURRENCES", "2000"))
+
+
+def parse_calendar_range(from_str, to_str, timezone_name=AT_EXPRESSION_TIMEZONE):
+    """
+    Turns the from/to query parameters (YYYY-MM-DD, both inclusive, in the reminders' timezone)
+    into an epoch range.
+
+    Returns:
+        tuple: (from_epoch, to_epoch) covering the first second of from to the last second of to.
+    """
+    import pytz
+    if not from_str or not to_str:
+        raise ValueError("from and to are required (YYYY-MM-DD)")
+    try:
+        from_date = datetime.strptime(from_str, "%Y-%m-%d")
+        to_date = datetime.strptime(to_str, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError("from and to must be dates in YYYY-MM-DD format")
+    if to_date < from_date:
+        raise ValueError("to must not be before from")
+    if (to_date - from_date).days >= CALENDAR_MAX_DAYS:
+        raise ValueError(f"The range can span at most {CALENDAR_MAX_DAYS} days")
+
+    local_timezone = pytz.timezone(timezone_name)
+    from_epoch = int(local_timezone.localize(from_date).timestamp())
+    to_epoch = int(local_timezone.localize(to_date + timedelta(days=1)).timestamp()) - 1
+    return from_epoch, to_epoch
+
+
+def parse_offset(offset_str):
+    """Validates the optional offset query parameter: occurrences of the range already returned."""
+    if offset_str is None or offset_str == "":
+        return 0
+    if not offset_str.isdigit():
+        raise ValueError("offset must be a non-negative integer")
+    return int(offset_str)
+
+
+def expand_reminders(items, from_epoch, to_epoch, offset=0, limit=None):
+    """
+    The occurrences of the given reminders in the range, in chronological order, skipping the
+    first offset and returning at most limit of them.
+
+    Each reminder is expanded to an array of epochs; the arrays are merged and only the
+    requested slice is rendered, so the per-occurrence work stays inside NumPy.
+    """
+    reminders = []
+    fires = []
+    for reminder_data in items:
+        expression = reminder_data.get("eventbridge_expression")
+        if not expression:
+            continue
+        schedule_fields = get_stored_schedule_fields(reminder_data)
+        try:
+            reminder_fires = expand_occurrences(
+                expression, from_epoch, to_epoch,
+                start_at=schedule_fields.get("start_at"),
+                end_at=schedule_fields.get("end_at"),
+                timezone_name=schedule_fields.get("timezone", AT_EXPRESSION_TIMEZONE)
+            )
+        except ValueError as e:
+            print(f"Error expanding EventBridge expression for reminder {reminder_data['SK']}: {e}")
+            continue
+        if len(reminder_fires):
+            fires.append(reminder_fires)
+            reminders.append(reminder_data)
+
+    if not fires:
+        return []
+    all_fires = np.concatenate(fires)
+    reminder_index = np.repeat(np.arange(len(reminders)), [len(reminder_fires) for reminder_fires in fires])
+    order = np.argsort(all_fires, kind="stable")[offset:None if limit is None else offset + limit]
+    # Every reminder is shown in the timezone reminders are scheduled in
+    occurs_at = format_occurrences(all_fires[order])
+
+    return [
+        {
+            "reminder_id": reminders[index]["SK"].split("#", 1)[1],
+            "task": reminders[index].get("task"),
+            "occurs_at": occurrence,
+        }
+        for index, occurrence in zip(reminder_index[order].tolist(), occurs_at)
+    ]
+
+
+def handler(event, context):
+    try:
+        query_params = event.get("queryStringParameters") or {}
+        device_id = query_params.get("device_id")
+
+        if not device_id:
+            return json_response(400, {"error": "device_id is required"})
+
+        try:
+            from_epoch, to_epoch = parse_calendar_range(query_params.get("from"), query_params.get("to"))
+            offset = parse_offset(query_params.get("offset"))
+        except ValueError as e:
+            return json_response(400, {"error": str(e)})
+
+        reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
+        items = [
+            item
+            for page_items, _ in query_reminder_pages(reminders_table, device_id, active_only=True)
+            for item in page_items
+        ]
+
+        # One extra occurrence tells whether the range continues past this page
+        occurrences = expand_reminders(items, from_epoch, to_epoch, offset, CALENDAR_MAX_OCCURRENCES + 1)
+        has_more = len(occurrences) > CALENDAR_MAX_OCCURRENCES
+
+        return json_response(200, {
+            "from": query_params["from"],
+            "to": query_params["to"],
+            "occurrences": occurrences[:CALENDAR_MAX_OCCURRENCES],
+            "next_offset": offset + CALENDAR_MAX_OCCURRENCES if has_more else None
+        }, event=event)
+
+    except Exception as e:
+        print(f"Error fetching reminder calendar: {e}")
+        return json_response(500, {"error": "Failed to fetch reminder calendar"})
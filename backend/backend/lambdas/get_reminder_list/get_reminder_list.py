@@ -1,247 +1,461 @@
 import os
-import pytz
+import re
 import json
+import base64
+import hashlib
 import boto3
-import re
-import dateparser
-from datetime import datetime, timedelta
-from croniter import croniter
-from decimal import Decimal
+from datetime import datetime, timezone
+from responses import get_gzip_etag, get_header, json_response, to_json
+from schedule_expressions import AT_EXPRESSION_TIMEZONE, get_occurrence_fields, get_schedule_fields
 
 # Initialize AWS resources
 dynamodb = boto3.resource("dynamodb")
 REMINDERS_TABLE_NAME = os.environ["REMINDERS_TABLE_NAME"]
+# Largest page a client can ask for with ?limit=
+LIST_MAX_LIMIT = int(os.getenv("LIST_MAX_LIMIT", "200"))
+# Page size of table queries made without ?limit=; the rest of the list follows next_cursor
+LIST_DEFAULT_LIMIT = int(os.getenv("LIST_DEFAULT_LIMIT", "100"))
+# Sparse index holding only reminders that are not completed, by device and next fire time
+ACTIVE_REMINDERS_INDEX_NAME = "ActiveRemindersIndex"
+# Precomputed list documents per device, rebuilt by rebuild_reminder_list_views; unset disables them
+REMINDER_LIST_VIEWS_TABLE_NAME = os.getenv("REMINDER_LIST_VIEWS_TABLE_NAME")
+# A view is rebuilt at least this often, and when an is_past or next_occurrences value it holds expires
+LIST_VIEW_MAX_AGE_SECONDS = int(os.getenv("LIST_VIEW_MAX_AGE_SECONDS", "3600"))
+# Stays well under DynamoDB's 400 KB item limit; larger lists are served without a view
+LIST_VIEW_MAX_BYTES = int(os.getenv("LIST_VIEW_MAX_BYTES", "350000"))
+
+# Most attributes a client can ask for with ?fields=
+LIST_MAX_FIELDS = 20
+FIELD_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,63}$")
+# Always read with ?fields=: the keys, and what enrich_reminders needs to sort and schedule reminders
+ENRICH_ATTRIBUTES = (
+    "PK", "SK", "is_completed", "start_date", "time", "end_date", "timezone", "start_at", "end_at",
+    "eventbridge_expression", "next_occurrences", "next_occurrences_expire_at"
+)
+
+def parse_limit(limit_str):
+    """Validates the optional limit query parameter; without one a page holds LIST_DEFAULT_LIMIT reminders."""
+    if limit_str is None or limit_str == "":
+        return LIST_DEFAULT_LIMIT
+    if not limit_str.isdigit() or not 1 <= int(limit_str) <= LIST_MAX_LIMIT:
+        raise ValueError(f"limit must be an integer between 1 and {LIST_MAX_LIMIT}")
+    return int(limit_str)
+
+def parse_fields(fields_str):
+    """Validates the optional fields query parameter (comma-separated attributes); None means all of them."""
+    if fields_str is None or fields_str == "":
+        return None
+    fields = list(dict.fromkeys(field.strip() for field in fields_str.split(",") if field.strip()))
+    if not fields or len(fields) > LIST_MAX_FIELDS or not all(FIELD_NAME_PATTERN.match(field) for field in fields):
+        raise ValueError(f"fields must be a comma-separated list of at most {LIST_MAX_FIELDS} attribute names")
+    return fields
 
-# AWS Day-of-week to croniter mapping
-aws_day_map = {
-    '1': '0', '2': '1', '3': '2', '4': '3', '5': '4', '6': '5', '7': '6',
-    'SUN': '0', 'MON': '1', 'TUE': '2', 'WED': '3', 'THU': '4', 'FRI': '5', 'SAT': '6'
-}
-
-def parse_eventbridge_expression(expression, occurrences=3, start_time=None):
-    """Parses EventBridge expressions to generate the next run times."""
-    if expression.startswith("rate("):
-        return get_next_rate_occurrences(expression, occurrences, start_time)
-    elif expression.startswith("cron("):
-        return get_next_cron_occurrences(expression, occurrences, start_time)
-    elif expression.startswith("at("):
-        return [parse_at_expression(expression)]
+def get_projection(fields):
+    """
+    Query/GetItem arguments reading only the requested fields plus ENRICH_ATTRIBUTES. Every name
+    goes through a placeholder, since attributes such as time are DynamoDB reserved words.
+    """
+    names = list(dict.fromkeys([*ENRICH_ATTRIBUTES, *fields]))
+    return {
+        "ProjectionExpression": ", ".join(f"#f{index}" for index in range(len(names))),
+        "ExpressionAttributeNames": {f"#f{index}": name for index, name in enumerate(names)},
+    }
+
+def project_reminder(reminder_data, fields):
+    """Drops, in place, the attributes read only for enrich_reminders; SK stays as the reminder's id."""
+    keep = {"SK", "next_occurrences", *fields}
+    for name in [name for name in reminder_data if name not in keep]:
+        del reminder_data[name]
+    return reminder_data
+
+def encode_cursor(last_evaluated_key):
+    """Opaque continuation token for a DynamoDB LastEvaluatedKey."""
+    return base64.urlsafe_b64encode(to_json(last_evaluated_key).encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor, device_id):
+    """Turns a continuation token back into an ExclusiveStartKey for the device's partition."""
+    if not cursor:
+        return None
+    try:
+        exclusive_start_key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeEncodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(exclusive_start_key, dict) or exclusive_start_key.get("PK") != f"CUSTOMER#{device_id}" \
+            or not isinstance(exclusive_start_key.get("SK"), str):
+        raise ValueError("Invalid cursor")
+    if "active_device" not in exclusive_start_key:
+        return {"PK": exclusive_start_key["PK"], "SK": exclusive_start_key["SK"]}
+    # Cursors from the ActiveRemindersIndex also carry its keys
+    if exclusive_start_key["active_device"] != device_id or not isinstance(exclusive_start_key.get("active_fire_at"), int):
+        raise ValueError("Invalid cursor")
+    return {key: exclusive_start_key[key] for key in ("PK", "SK", "active_device", "active_fire_at")}
+
+def query_reminder_pages(reminders_table, device_id, filter_expression=None, limit=None, exclusive_start_key=None,
+                         active_only=False, projection=None):
+    """
+    Yields (items, last_evaluated_key) one DynamoDB page at a time, newest first.
+
+    With active_only, the ActiveRemindersIndex is queried instead and only reminders that are
+    not completed are read, soonest next fire first. A projection (from get_projection) limits
+    the attributes read.
+
+    With a limit, each query asks only for the items still missing, so the last yielded
+    last_evaluated_key is exactly where the next page has to start.
+    """
+    if active_only:
+        query_kwargs = {
+            "IndexName": ACTIVE_REMINDERS_INDEX_NAME,
+            "KeyConditionExpression": boto3.dynamodb.conditions.Key("active_device").eq(device_id),
+            "ScanIndexForward": True
+        }
     else:
-        raise ValueError("Unsupported EventBridge expression format")
-
-def convert_day_of_week(cron_expr):
-    cron_parts = cron_expr.split()
-    day_of_week_part = cron_parts[4]
-    converted_days = [aws_day_map.get(day.strip(), day.strip()) for day in day_of_week_part.split(',')]
-    cron_parts[4] = ','.join(converted_days)
-    return " ".join(cron_parts)
-
-def get_next_rate_occurrences(expression, occurrences, start_time=None):
-    rate_pattern = re.compile(r"rate\((\d+)\s(day|hour|minute|week)s?\)")
-    match = rate_pattern.match(expression)
-    
-    if not match:
-        raise ValueError("Invalid rate expression format")
-
-    interval_value = int(match.group(1))
-    interval_unit = match.group(2)
-    delta = timedelta(days=interval_value) if interval_unit == "day" else \
-            timedelta(hours=interval_value) if interval_unit == "hour" else \
-            timedelta(minutes=interval_value) if interval_unit == "minute" else \
-            timedelta(weeks=interval_value)
-
-    occurrences_list = []
-    next_run_time = start_time if start_time else datetime.now()  # Start from specified start_time or current time
-    
-    for _ in range(occurrences):
-        next_run_time += delta
-        occurrences_list.append(next_run_time)
-    
-    return occurrences_list
-
-def get_next_cron_occurrences(expression, occurrences, start_time=None):
-    cron_expr = expression.replace("cron(", "").replace(")", "")
-    cron_parts = cron_expr.split()
-    if len(cron_parts) == 6:
-        cron_expr = " ".join(cron_parts[:5])
-    cron_expr = convert_day_of_week(cron_expr)
-    
-    # Use provided start_time or default to the current time
-    cron_iter = croniter(cron_expr, start_time or datetime.now())
-    return [cron_iter.get_next(datetime) for _ in range(occurrences)]
-
-
-def parse_at_expression(expression):
-    at_pattern = re.compile(r"at\(([\d-]+)T([\d:]+)\)")
-    match = at_pattern.match(expression)
-    
-    if not match:
-        raise ValueError("Invalid at expression format")
-    
-    date_part = match.group(1)
-    time_part = match.group(2)
-    return datetime.strptime(f"{date_part}T{time_part}", "%Y-%m-%dT%H:%M:%S")
-
-def convert_decimal(obj):
-    """Convert DynamoDB Decimal types to int or float for JSON serialization."""
-    if isinstance(obj, list):
-        return [convert_decimal(i) for i in obj]
-    elif isinstance(obj, dict):
-        return {k: convert_decimal(v) for k, v in obj.items()}
-    elif isinstance(obj, Decimal):
-        return int(obj) if obj % 1 == 0 else float(obj)
-    return obj
+        query_kwargs = {
+            "KeyConditionExpression": boto3.dynamodb.conditions.Key("PK").eq(f"CUSTOMER#{device_id}"),
+            "ScanIndexForward": False
+        }
+    if filter_expression:
+        query_kwargs["FilterExpression"] = filter_expression
+    if projection:
+        query_kwargs.update(projection)
+    remaining = limit
+
+    while True:
+        if remaining is not None:
+            query_kwargs["Limit"] = remaining
+        if exclusive_start_key:
+            query_kwargs["ExclusiveStartKey"] = exclusive_start_key
+        response = reminders_table.query(**query_kwargs)
+        items = response.get("Items", [])
+        exclusive_start_key = response.get("LastEvaluatedKey")
+        yield items, exclusive_start_key
+
+        if remaining is not None:
+            remaining -= len(items)
+        if not exclusive_start_key or remaining == 0:
+            return
+
+def get_stored_schedule_fields(reminder_data):
+    """
+    The canonical start_at/end_at/minutes_of_day/timezone fields written with the reminder.
+
+    Items written before these fields existed (and not yet backfilled) get them derived from
+    start_date, time and end_date with fixed formats only.
+    """
+    if "timezone" in reminder_data:
+        return reminder_data
+    return get_schedule_fields(reminder_data.get("start_date"), reminder_data.get("time"), reminder_data.get("end_date"))
+
+def get_past_filter(now_epoch):
+    """
+    A FilterExpression for the reminders enrich_reminders may count as past: completed, ended
+    before now_epoch, or with an end_date but no stored end_at, which it has to work out itself.
+    enrich_reminders makes the final call, so table queries and list views agree.
+    """
+    attr = boto3.dynamodb.conditions.Attr
+    return (
+        attr("is_completed").eq(True)
+        | attr("end_at").lt(now_epoch)
+        | (attr("end_at").not_exists() & attr("end_date").exists() & attr("end_date").ne("None"))
+    )
+
+def enrich_reminders(items, include_schedule, now):
+    """
+    Yields (is_past, reminder_data) for each item, skipping items whose dates cannot be parsed.
+
+    Items are enriched in place and keep their Decimals; responses.DynamoDBEncoder converts
+    those while the response is serialized.
+    """
+    now_epoch = int(now.timestamp())
+    for reminder_data in items:
+        is_completed = reminder_data.get("is_completed", False)
+        end_date_str = reminder_data.get("end_date", None)
+        schedule_fields = get_stored_schedule_fields(reminder_data)
+        # Only returned with include_schedule, and only once checked for staleness
+        stored_occurrences = reminder_data.pop("next_occurrences", None)
+        occurrences_expire_at = reminder_data.pop("next_occurrences_expire_at", None)
+
+        # Past means completed or expired, on every path (see get_past_filter)
+        if end_date_str and end_date_str != "None":
+            if "end_at" not in schedule_fields:
+                print(f"Error parsing end_date: {end_date_str}")
+                continue
+            is_past = is_completed or schedule_fields["end_at"] < now_epoch
+        else:
+            is_past = is_completed
+
+        # Include schedule occurrences if required and reminder is not past
+        if include_schedule and not is_past:
+            eventbridge_expression = reminder_data.get("eventbridge_expression", None)
+
+            if eventbridge_expression and reminder_data.get("start_date") and reminder_data.get("time"):
+                if "start_at" not in schedule_fields:
+                    print(f"Error parsing start_date/time: {reminder_data['start_date']} {reminder_data['time']}")
+                    continue
+
+                # Served from the item unless it fired since next_occurrences was last advanced
+                if stored_occurrences and (occurrences_expire_at is None or occurrences_expire_at > now_epoch):
+                    reminder_data["next_occurrences"] = stored_occurrences
+                else:
+                    occurrence_fields = get_occurrence_fields(
+                        eventbridge_expression,
+                        schedule_fields["start_at"],
+                        now_epoch,
+                        schedule_fields.get("timezone", AT_EXPRESSION_TIMEZONE)
+                    )
+                    reminder_data["next_occurrences"] = occurrence_fields.get("next_occurrences", "Error parsing schedule")
+
+        yield is_past, reminder_data
+
+def build_list_view(reminders_table, device_id, now):
+    """
+    Builds a device's full reminder list, as returned without filter or paging and with
+    include_schedule=true, plus the epoch second until which it stays correct.
+
+    Returns:
+        tuple: ({'past': [...], 'upcoming': [...], 'next_cursor': None}, valid_until)
+    """
+    now_epoch = int(now.timestamp())
+    document = {"past": [], "upcoming": [], "next_cursor": None}
+    valid_until = now_epoch + LIST_VIEW_MAX_AGE_SECONDS
+    for items, _ in query_reminder_pages(reminders_table, device_id):
+        for item in items:
+            # An upcoming reminder turns past at end_at, and stored occurrences go stale
+            for expires_at in (item.get("end_at"), item.get("next_occurrences_expire_at")):
+                if expires_at is not None and expires_at >= now_epoch:
+                    valid_until = min(valid_until, int(expires_at))
+        for is_past, reminder_data in enrich_reminders(items, True, now):
+            document["past" if is_past else "upcoming"].append(reminder_data)
+    return document, valid_until
+
+def mark_list_view_changed(device_id):
+    """
+    Bumps the device's view change counter, before the stream consumer rebuilds the view for a
+    change to its reminders. Rebuilds that read the counter before the bump can no longer store.
+
+    Returns:
+        int: The new source_version, to pass to store_list_view.
+    """
+    response = dynamodb.Table(REMINDER_LIST_VIEWS_TABLE_NAME).update_item(
+        Key={"device_id": device_id},
+        UpdateExpression="ADD source_version :one",
+        ExpressionAttributeValues={":one": 1},
+        ReturnValues="UPDATED_NEW",
+    )
+    return int(response["Attributes"]["source_version"])
+
+def get_source_condition(source_version):
+    """Condition that no change was marked since the view's source_version was read (None: no view yet)."""
+    if source_version is None:
+        return "attribute_not_exists(source_version)", {}
+    return "source_version = :source_version", {":source_version": source_version}
+
+def store_list_view(device_id, document, valid_until, source_version=None):
+    """
+    Saves a device's list document. The version only moves when the content changes, so
+    clients holding its ETag keep getting 304s across rebuilds that changed nothing.
+
+    source_version is the view's change counter as read before the reminders were (see
+    mark_list_view_changed). Every write is conditional on it, so a rebuild that read the
+    reminders before a change never overwrites one made after it.
+
+    A list too large for a view is stored as a too_large marker until valid_until, so requests
+    page through the table instead of rebuilding the whole list every time.
+
+    Returns:
+        dict: The stored view (body, version, valid_until), the too_large marker, or None if a
+        newer rebuild has been marked since.
+    """
+    views_table = dynamodb.Table(REMINDER_LIST_VIEWS_TABLE_NAME)
+    source_condition, source_values = get_source_condition(source_version)
+    conditional_check_failed = dynamodb.meta.client.exceptions.ConditionalCheckFailedException
+    body = to_json(document)
+    if len(body) > LIST_VIEW_MAX_BYTES:
+        # The counter is kept, so rebuilds that read it earlier still cannot store
+        try:
+            response = views_table.update_item(
+                Key={"device_id": device_id},
+                UpdateExpression="SET too_large = :too_large, valid_until = :valid_until "
+                                 "REMOVE body, content_hash, built_at",
+                ConditionExpression=source_condition,
+                ExpressionAttributeValues={":too_large": True, ":valid_until": valid_until, **source_values},
+                ReturnValues="ALL_NEW",
+            )
+        except conditional_check_failed:
+            return None
+        return response["Attributes"]
+
+    content_hash = hashlib.sha1(body.encode("utf-8")).hexdigest()
+    built_at = datetime.now(timezone.utc).isoformat()
+    try:
+        response = views_table.update_item(
+            Key={"device_id": device_id},
+            UpdateExpression="SET body = :body, content_hash = :content_hash, valid_until = :valid_until, "
+                             "built_at = :built_at REMOVE too_large ADD version :one",
+            ConditionExpression=f"(attribute_not_exists(content_hash) OR content_hash <> :content_hash) "
+                                f"AND {source_condition}",
+            ExpressionAttributeValues={
+                ":body": body,
+                ":content_hash": content_hash,
+                ":valid_until": valid_until,
+                ":built_at": built_at,
+                ":one": 1,
+                **source_values,
+            },
+            ReturnValues="ALL_NEW",
+        )
+    except conditional_check_failed:
+        try:
+            # Unchanged content only has its expiry moved on
+            response = views_table.update_item(
+                Key={"device_id": device_id},
+                UpdateExpression="SET valid_until = :valid_until, built_at = :built_at",
+                ConditionExpression=f"content_hash = :content_hash AND {source_condition}",
+                ExpressionAttributeValues={
+                    ":valid_until": valid_until,
+                    ":built_at": built_at,
+                    ":content_hash": content_hash,
+                    **source_values,
+                },
+                ReturnValues="ALL_NEW",
+            )
+        except conditional_check_failed:
+            print(f"Reminder list view of device {device_id} changed while it was rebuilt, not storing it")
+            return None
+    return response["Attributes"]
+
+def load_list_view(device_id):
+    """Returns the device's stored view item, or None; it may hold only the change counter, or have expired."""
+    return dynamodb.Table(REMINDER_LIST_VIEWS_TABLE_NAME).get_item(Key={"device_id": device_id}).get("Item")
+
+def is_current_view(view, now_epoch):
+    """True for a stored list, or too_large marker, that has not expired."""
+    return view is not None and ("body" in view or view.get("too_large")) and view.get("valid_until", 0) > now_epoch
+
+def get_view_etag(view, filter_type, include_schedule):
+    """
+    ETag of one representation of a view: every filter and include_schedule combination is a
+    different body, so each gets its own tag (and json_response marks gzip-compressed ones).
+    """
+    representation = filter_type if filter_type in ("past", "upcoming") else "all"
+    return f'"{int(view["version"])}-{representation}-{"schedule" if include_schedule else "plain"}"'
+
+def serve_list_view(event, reminders_table, device_id, filter_type, include_schedule):
+    """
+    Answers a full-list request from the device's materialized view: one GetItem while the view
+    is current, a rebuild (written through to the view) when it is missing or has expired, and
+    304 Not Modified when the client already holds this version.
+
+    Returns:
+        dict: The response, or None if the list is too large for a view and has to be paged.
+    """
+    now = datetime.now(timezone.utc)
+    headers = {}
+    view = load_list_view(device_id)
+    if not is_current_view(view, int(now.timestamp())):
+        # The counter read with the expired view makes the write-through lose to any newer rebuild
+        source_version = int(view["source_version"]) if view and "source_version" in view else None
+        document, valid_until = build_list_view(reminders_table, device_id, now)
+        view = store_list_view(device_id, document, valid_until, source_version)
+        if view is None:
+            view = {"body": to_json(document)}
+    if view.get("too_large"):
+        return None
+
+    if "version" in view:
+        headers["ETag"] = get_view_etag(view, filter_type, include_schedule)
+        if_none_match = get_header(event, "If-None-Match")
+        if if_none_match in (headers["ETag"], get_gzip_etag(headers["ETag"])):
+            return json_response(304, headers={"ETag": if_none_match})
+
+    if filter_type not in ("past", "upcoming") and include_schedule:
+        return json_response(200, event=event, headers=headers, body=view["body"])  # Stored exactly as this response
+
+    document = json.loads(view["body"])
+    if not include_schedule:
+        for reminder_data in document["past"] + document["upcoming"]:
+            reminder_data.pop("next_occurrences", None)
+    if filter_type in ("past", "upcoming"):
+        document = {filter_type: document[filter_type], "next_cursor": None}
+    return json_response(200, document, event=event, headers=headers)
 
 def handler(event, context):
     try:
         # Parse device_id, filter, and schedule inclusion flag from the request
-        query_params = event.get("queryStringParameters", {})
+        query_params = event.get("queryStringParameters") or {}
         device_id = query_params.get("device_id")
         filter_type = query_params.get("filter", "all")
         include_schedule = query_params.get("include_schedule", "false").lower() == "true"
 
         if not device_id:
-            return {
-                "statusCode": 400,
-                "body": json.dumps({"error": "device_id is required"}),
-                "headers": {
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "Content-Type",
-                    "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-                },
-            }
+            return json_response(400, {"error": "device_id is required"})
+
+        try:
+            fields = parse_fields(query_params.get("fields"))
+        except ValueError as e:
+            return json_response(400, {"error": str(e)})
+        projection = get_projection(fields) if fields else None
 
         reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
+
+        # Single reminder lookup, used to poll the status of reminders accepted asynchronously
+        reminder_id = query_params.get("reminder_id")
+        if reminder_id:
+            item = reminders_table.get_item(
+                Key={"PK": f"CUSTOMER#{device_id}", "SK": f"REMINDER#{reminder_id}"}, **(projection or {})
+            ).get("Item")
+            if not item:
+                return json_response(404, {"error": "Reminder not found"})
+            return json_response(200, {"reminder": project_reminder(item, fields) if fields else item}, event=event)
+
+        # Whole lists come from the device's materialized view; paged and projected requests, and
+        # lists too large for a view, query the table a page at a time
+        if REMINDER_LIST_VIEWS_TABLE_NAME and not query_params.get("limit") and not query_params.get("cursor") \
+                and not fields:
+            response = serve_list_view(event, reminders_table, device_id, filter_type, include_schedule)
+            if response is not None:
+                return response
+
         filter_expression = None
+        # Upcoming reminders are read from the sparse index, so completed ones are never read
+        active_only = filter_type == "upcoming"
+        now = datetime.now(timezone.utc)
 
         if filter_type == "past":
-            filter_expression = boto3.dynamodb.conditions.Attr("is_completed").eq(True)
-        elif filter_type == "upcoming":
-            filter_expression = boto3.dynamodb.conditions.Attr("is_completed").not_exists() | boto3.dynamodb.conditions.Attr("is_completed").eq(False)
+            filter_expression = get_past_filter(int(now.timestamp()))
 
-        if filter_expression:
-            response = reminders_table.query(
-                KeyConditionExpression=boto3.dynamodb.conditions.Key("PK").eq(f"CUSTOMER#{device_id}"),
-                FilterExpression=filter_expression,
-                ScanIndexForward=False
-            )
-        else:
-            response = reminders_table.query(
-                KeyConditionExpression=boto3.dynamodb.conditions.Key("PK").eq(f"CUSTOMER#{device_id}"),
-                ScanIndexForward=False
-            )
+        try:
+            limit = parse_limit(query_params.get("limit"))
+            exclusive_start_key = decode_cursor(query_params.get("cursor"), device_id)
+            if exclusive_start_key and ("active_device" in exclusive_start_key) != active_only:
+                raise ValueError("Invalid cursor")
+        except ValueError as e:
+            return json_response(400, {"error": str(e)})
 
-        reminders = response.get("Items", [])
         response_data = {"past": [], "upcoming": []}
-        current_date = datetime.now().date()
-
-        for reminder in reminders:
-            reminder = convert_decimal(reminder)
-            is_completed = reminder.get("is_completed", False)
-            end_date_str = reminder.get("end_date", None)
-            reminder_data = reminder.copy()
-
-            # **Handle both YMD and DMY formats dynamically**
-            if end_date_str and end_date_str != "None":
-                end_date_parsed = dateparser.parse(end_date_str, settings={'DATE_ORDER': 'YMD'}) or dateparser.parse(end_date_str, settings={'DATE_ORDER': 'DMY'})
-                if not end_date_parsed:
-                    print(f"Error parsing end_date: {end_date_str}")
-                    continue
-                end_date = end_date_parsed.date()
-                is_past = end_date < current_date
-            else:
-                is_past = is_completed
-
-            # Include schedule occurrences if required and reminder is not past
-            if include_schedule and not is_past:
-                eventbridge_expression = reminder.get("eventbridge_expression", None)
-                start_date_str = reminder.get("start_date")
-                time_str = reminder.get("time")
-
-                if eventbridge_expression and start_date_str and time_str:
-                    # Parse time dynamically
-                    time_parsed = dateparser.parse(time_str)
-                    if not time_parsed:
-                        print(f"Error parsing time: {time_str}")
-                        continue
-                    
-                    time_str_formatted = time_parsed.strftime('%I:%M %p')
-
-                    # Handle both YMD and DMY formats dynamically
-                    start_date_parsed = dateparser.parse(start_date_str, settings={'DATE_ORDER': 'YMD'}) or dateparser.parse(start_date_str, settings={'DATE_ORDER': 'DMY'})
-                    if not start_date_parsed:
-                        print(f"Error parsing start_date: {start_date_str}")
-                        continue
-
-                    start_time = datetime.strptime(f"{start_date_parsed.strftime('%Y-%m-%d')} {time_str_formatted}", "%Y-%m-%d %I:%M %p")
-                    
-                    # Ensure start_time is not in the past
-                    now = datetime.now()
-                    start_time = max(start_time, now)
-
-                    try:
-                        next_occurrences = parse_eventbridge_expression(
-                            eventbridge_expression, occurrences=3, start_time=start_time
-                        )
-
-                        if not eventbridge_expression.startswith("at("):
-                            # Convert to IST for recurring schedules
-                            ist = pytz.timezone("Asia/Kolkata")
-                            utc = pytz.utc
-                            next_occurrences = [
-                                utc.localize(occ).astimezone(ist) for occ in next_occurrences
-                            ]
-
-                        reminder_data["next_occurrences"] = [occ.isoformat() for occ in next_occurrences]
-                    except ValueError as e:
-                        print(f"Error parsing EventBridge expression for reminder {reminder['SK']}: {e}")
-                        reminder_data["next_occurrences"] = "Error parsing schedule"
-
-            # Categorize reminders into past or upcoming
-            if is_past:
-                response_data["past"].append(reminder_data)
-            else:
-                response_data["upcoming"].append(reminder_data)
+        last_evaluated_key = None
+
+        # Pages are enriched as they arrive, so only the reminders being returned are held in memory
+        for items, last_evaluated_key in query_reminder_pages(
+            reminders_table, device_id, filter_expression, limit, exclusive_start_key, active_only, projection
+        ):
+            for is_past, reminder_data in enrich_reminders(items, include_schedule, now):
+                if fields:
+                    project_reminder(reminder_data, fields)
+                # Categorize reminders into past or upcoming
+                if is_past:
+                    response_data["past"].append(reminder_data)
+                else:
+                    response_data["upcoming"].append(reminder_data)
+
+        next_cursor = encode_cursor(last_evaluated_key) if last_evaluated_key else None
 
         if filter_type == "past":
-            return {
-                "statusCode": 200,
-                "body": json.dumps({"past": response_data["past"]}),
-                "headers": {
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "Content-Type",
-                    "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-                },
-            }
+            return json_response(200, {"past": response_data["past"], "next_cursor": next_cursor}, event=event)
         elif filter_type == "upcoming":
-            return {
-                "statusCode": 200,
-                "body": json.dumps({"upcoming": response_data["upcoming"]}),
-                "headers": {
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "Content-Type",
-                    "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-                },
-            }
+            return json_response(200, {"upcoming": response_data["upcoming"], "next_cursor": next_cursor}, event=event)
         else:
-            return {
-                "statusCode": 200,
-                "body": json.dumps(response_data),
-                "headers": {
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "Content-Type",
-                    "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-                },
-            }
+            return json_response(200, {**response_data, "next_cursor": next_cursor}, event=event)
 
     except Exception as e:
         print(f"Error fetching reminders: {e}")
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Failed to fetch reminders"}),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-        }
\ No newline at end of file
+        return json_response(500, {"error": "Failed to fetch reminders"})
@@ -0,0 +1,150 @@
+from datetime import datetime, timezone
+import numpy as np
+from eventbridge_schedule import DAY_NAMES, MONTH_NAMES, RATE_PATTERN, compile_expression
+from schedule_expressions import AT_EXPRESSION_TIMEZONE, parse_at_expression
+
+SECONDS_PER_DAY = 86400
+# The rate() units get_next_rate_occurrences understands, in seconds
+RATE_UNIT_SECONDS = {"minute": 60, "hour": 3600, "day": SECONDS_PER_DAY, "week": 7 * SECONDS_PER_DAY}
+MAX_CRON_YEAR = 2199
+
+
+def parse_cron_field(field, minimum, maximum, names=None):
+    """
+    Values allowed by one AWS cron field, as a boolean mask indexed by value.
+
+    Supports '*', '?', lists, ranges, names and '/' steps. Raises ValueError for anything else
+    (L, W, #, wrapping ranges), which callers expand with the compiled schedule instead.
+    """
+    names = names or {}
+    mask = np.zeros(maximum + 1, dtype=bool)
+    for part in field.upper().split(","):
+        part, has_step, step = part.partition("/")
+        step = int(step) if has_step else 1
+        if part in ("*", "?"):
+            low, high = minimum, maximum
+        elif "-" in part:
+            low, high = (names[value] if value in names else int(value) for value in part.split("-", 1))
+        else:
+            low = names[part] if part in names else int(part)
+            high = maximum if has_step else low
+        if step < 1 or not minimum <= low <= high <= maximum:
+            raise ValueError(f"Unsupported cron field: {field}")
+        mask[low:high + 1:step] = True
+    return mask
+
+
+def expand_cron(expression, from_epoch, to_epoch):
+    """
+    Every fire of a UTC cron() expression in [from_epoch, to_epoch], as sorted epoch seconds.
+
+    Each date field becomes a boolean mask that is looked up for every day of the range at
+    once; the matching days are then combined with every allowed time of day.
+    """
+    fields = expression[len("cron("):-1].split()
+    if len(fields) != 6:
+        raise ValueError(f"Invalid cron expression: {expression}")
+    minutes = np.flatnonzero(parse_cron_field(fields[0], 0, 59))
+    hours = np.flatnonzero(parse_cron_field(fields[1], 0, 23))
+    days_of_month = parse_cron_field(fields[2], 1, 31)
+    months = parse_cron_field(fields[3], 1, 12, MONTH_NAMES)
+    days_of_week = parse_cron_field(fields[4], 1, 7, DAY_NAMES)
+    years = parse_cron_field(fields[5], 1970, MAX_CRON_YEAR)
+
+    days = np.arange(from_epoch // SECONDS_PER_DAY, to_epoch // SECONDS_PER_DAY + 1, dtype=np.int64)
+    dates = days.astype("datetime64[D]")
+    month_starts = dates.astype("datetime64[M]")
+    matching = (
+        months[month_starts.astype(np.int64) % 12 + 1]
+        & days_of_month[(dates - month_starts).astype(np.int64) + 1]
+        & days_of_week[(days + 4) % 7 + 1]  # 1970-01-01 was a Thursday
+        & years[np.minimum(dates.astype("datetime64[Y]").astype(np.int64) + 1970, MAX_CRON_YEAR)]
+    )
+
+    times_of_day = (hours[:, None] * 3600 + minutes[None, :] * 60).ravel()
+    fires = (days[matching][:, None] * SECONDS_PER_DAY + times_of_day[None, :]).ravel()
+    return fires[(fires >= from_epoch) & (fires <= to_epoch)]
+
+
+def expand_cron_with_schedule(expression, from_epoch, to_epoch):
+    """Path for cron features parse_cron_field does not handle, walking the compiled schedule."""
+    fires = compile_expression(expression).between(
+        datetime.fromtimestamp(from_epoch, timezone.utc).replace(tzinfo=None),
+        datetime.fromtimestamp(to_epoch, timezone.utc).replace(tzinfo=None)
+    )
+    return np.array([int(fire.replace(tzinfo=timezone.utc).timestamp()) for fire in fires], dtype=np.int64)
+
+
+def expand_rate(expression, anchor_epoch, from_epoch, to_epoch):
+    """Fires of a rate() expression in [from_epoch, to_epoch], one interval apart from anchor_epoch."""
+    match = RATE_PATTERN.match(expression)
+    if not match:
+        raise ValueError("Invalid rate expression format")
+    interval = int(match.group(1)) * RATE_UNIT_SECONDS[match.group(2)]
+    # Matches get_next_rate_occurrences: the first fire is one interval after the anchor
+    first = max(1, -(-(from_epoch - anchor_epoch) // interval))
+    return np.arange(anchor_epoch + first * interval, to_epoch + 1, interval, dtype=np.int64)
+
+
+def expand_occurrences(expression, from_epoch, to_epoch, start_at=None, end_at=None,
+                       timezone_name=AT_EXPRESSION_TIMEZONE):
+    """
+    Every fire of an EventBridge expression between two epochs, as a sorted int64 array.
+
+    Args:
+        expression (str): EventBridge expression (cron/rate in UTC, at() in timezone_name).
+        from_epoch (int): Start of the range, inclusive.
+        to_epoch (int): End of the range, inclusive.
+        start_at (int): Reminder start; nothing fires before it. Also anchors rate().
+        end_at (int): Reminder end; nothing fires after it.
+        timezone_name (str): Timezone at() expressions are written in.
+    """
+    if start_at is not None:
+        from_epoch = max(from_epoch, int(start_at))
+    if end_at is not None:
+        to_epoch = min(to_epoch, int(end_at))
+    if from_epoch > to_epoch:
+        return np.empty(0, dtype=np.int64)
+
+    if expression.startswith("cron("):
+        try:
+            return expand_cron(expression, from_epoch, to_epoch)
+        except (ValueError, IndexError):
+            return expand_cron_with_schedule(expression, from_epoch, to_epoch)
+    elif expression.startswith("rate("):
+        anchor_epoch = int(start_at) if start_at is not None else from_epoch
+        return expand_rate(expression, anchor_epoch, from_epoch, to_epoch)
+    elif expression.startswith("at("):
+        import pytz
+        fire = int(pytz.timezone(timezone_name).localize(parse_at_expression(expression)).timestamp())
+        return np.array([fire] if from_epoch <= fire <= to_epoch else [], dtype=np.int64)
+    else:
+        raise ValueError("Unsupported EventBridge expression format")
+
+
+def format_occurrences(epochs, timezone_name=AT_EXPRESSION_TIMEZONE):
+    """
+    Renders epoch seconds as ISO 8601 strings in a timezone ('2026-10-20T09:00:00+05:30').
+
+    UTC offsets are looked up once per distinct hour, so DST changes are honoured without a
+    Python call per occurrence.
+    """
+    import pytz
+    local_timezone = pytz.timezone(timezone_name)
+    epochs = np.asarray(epochs, dtype=np.int64)
+    if not len(epochs):
+        return []
+
+    hours, hour_index = np.unique(epochs // 3600, return_inverse=True)
+    hour_offsets = np.array([
+        int(datetime.fromtimestamp(int(hour) * 3600, timezone.utc).astimezone(local_timezone).utcoffset().total_seconds())
+        for hour in hours
+    ], dtype=np.int64)
+    offsets = hour_offsets[hour_index]
+
+    local_times = np.datetime_as_string((epochs + offsets).astype("datetime64[s]"), unit="s")
+    offset_labels = np.array([
+        f"{'-' if offset < 0 else '+'}{abs(offset) // 3600:02d}:{abs(offset) % 3600 // 60:02d}"
+        for offset in hour_offsets
+    ])
+    return np.char.add(local_times, offset_labels[hour_index]).tolist()
@@ -0,0 +1,67 @@
+import os
+import boto3
+from datetime import datetime, timezone
+from get_reminder_list import build_list_view, mark_list_view_changed, store_list_view
+
+# Initialize AWS resources
+dynamodb = boto3.resource("dynamodb")
+REMINDERS_TABLE_NAME = os.environ["REMINDERS_TABLE_NAME"]
+
+# What process_events' advance_next_occurrences moves on after every fire. A view expires with
+# the next_occurrences it holds and computes them afresh then, so these alone do not rebuild it.
+FIRE_ADVANCE_ATTRIBUTES = {"next_occurrences", "next_occurrences_expire_at", "active_fire_at"}
+
+
+def is_fire_advance(record):
+    """True for a stream record of an update that only moved a reminder's next occurrences on."""
+    if record.get("eventName") != "MODIFY":
+        return False
+    old_image = record["dynamodb"].get("OldImage")
+    new_image = record["dynamodb"].get("NewImage")
+    if old_image is None or new_image is None:
+        return False
+    changed = {name for name in old_image.keys() | new_image.keys() if old_image.get(name) != new_image.get(name)}
+    return changed <= FIRE_ADVANCE_ATTRIBUTES
+
+
+def get_changed_devices(records):
+    """
+    Devices whose reminders changed in a batch of RemindersTable stream records, each with the
+    sequence number of its first record (where a retry has to resume from). Fires advancing a
+    reminder's next occurrences are not changes to its list view.
+    """
+    devices = {}
+    for record in records:
+        keys = record["dynamodb"]["Keys"]
+        if not keys["SK"]["S"].startswith("REMINDER#") or is_fire_advance(record):
+            continue
+        device_id = keys["PK"]["S"].split("#", 1)[1]
+        devices.setdefault(device_id, record["dynamodb"]["SequenceNumber"])
+    return devices
+
+
+def handler(event, context):
+    """
+    RemindersTable stream consumer: rebuilds the list view of every device with a changed
+    reminder, once per batch however many of its reminders changed.
+    """
+    reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
+    changed_devices = get_changed_devices(event.get("Records", []))
+    failed_sequence_numbers = []
+
+    for device_id, sequence_number in changed_devices.items():
+        try:
+            # Marked before the reminders are read, so rebuilds that read them earlier cannot store over this one
+            source_version = mark_list_view_changed(device_id)
+            document, valid_until = build_list_view(reminders_table, device_id, datetime.now(timezone.utc))
+            store_list_view(device_id, document, valid_until, source_version)
+        except Exception as e:
+            print(f"Error rebuilding reminder list view for device {device_id}: {e}")
+            failed_sequence_numbers.append(sequence_number)
+
+    print(f"Rebuilt reminder list views: {len(changed_devices)} devices, {len(failed_sequence_numbers)} failed")
+    # The stream resumes from the earliest failed record, so later devices are rebuilt again too
+    return {"batchItemFailures": [
+        {"itemIdentifier": sequence_number}
+        for sequence_number in sorted(failed_sequence_numbers, key=int)[:1]
+    ]}
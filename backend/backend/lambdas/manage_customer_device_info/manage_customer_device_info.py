@@ -1,8 +1,8 @@
 import os
-import json
 import uuid
 import boto3
 from datetime import datetime
+from responses import json_response, parse_body
 
 # Initialize AWS resources
 dynamodb = boto3.resource("dynamodb")
@@ -76,21 +76,13 @@ def update_device_info(customer_id, device_id, device_token_id, os_version=None,
 
 def handler(event, context):
     try:
-        body = json.loads(event.get("body", "{}"))
+        body = parse_body(event)
         device_id = body.get("device_id")
         device_token_id = body.get("device_token_id")
 
         # Validate required fields for device info
         if not device_id or not device_token_id:
-            return {
-                "statusCode": 400,
-                "body": json.dumps({"error": "device_id and device_token_id are required"}),
-                "headers": {
-                    "Access-Control-Allow-Origin": "*",  # or specify your domain
-                    "Access-Control-Allow-Headers": "Content-Type",
-                    "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-                },
-            }
+            return json_response(400, {"error": "device_id and device_token_id are required"})
 
         # Check if the device_id is unique
         existing_device = check_device_id_uniqueness(device_id)
@@ -137,24 +129,8 @@ def handler(event, context):
             "device_info": device_item
         }
 
-        return {
-            "statusCode": 200,
-            "body": json.dumps(response_data),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",  # or specify your domain
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-        }
+        return json_response(200, response_data)
 
     except Exception as e:
         print(f"Error registering customer and device data: {e}")
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Failed to register customer and device data"}),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",  # or specify your domain
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-        }
+        return json_response(500, {"error": "Failed to register customer and device data"})
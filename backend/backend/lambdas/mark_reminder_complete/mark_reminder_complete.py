@@ -1,31 +1,48 @@
 import os
-import json
 import boto3
 from datetime import datetime
+from responses import json_response, parse_body
 
 # Initialize AWS resources
 dynamodb = boto3.resource("dynamodb")
 events_client = boto3.client("events")
+scheduler = boto3.client("scheduler")
+scheduler = boto3.client("scheduler")
 REMINDERS_TABLE_NAME = os.environ["REMINDERS_TABLE_NAME"]
+# Attributes the completion sets, returned to the client
+UPDATED_ATTRIBUTES = ("is_completed", "updated_at", "reminder_version")
+
+def stop_reminder_schedule(reminder_id, expression):
+    """
+    Deletes the one-time Scheduler job, or disables the EventBridge rule, that fires a reminder.
+    A Scheduler job carries its delivery payload, so left in place it would still notify.
+    """
+    rule_name = f"reminder_{reminder_id}"
+    if expression.strip().startswith("at("):
+        try:
+            scheduler.delete_schedule(Name=rule_name)
+        except scheduler.exceptions.ResourceNotFoundException:
+            # Already fired and deleted, or never created (dispatcher mode)
+            print(f"No Scheduler job found for {rule_name}")
+        return
+    try:
+        # Check if the EventBridge rule exists and disable it
+        events_client.describe_rule(Name=rule_name)  # This checks if the rule exists
+        events_client.disable_rule(Name=rule_name)
+    except events_client.exceptions.ResourceNotFoundException:
+        # If the rule doesn't exist, log and continue
+        print(f"No EventBridge rule found for {rule_name}")
 
 def handler(event, context):
     try:
         # Parse the request body to get device_id and reminder_id
-        body = json.loads(event.get("body", "{}"))
+        body = parse_body(event)
         device_id = body.get("device_id")
         reminder_id = body.get("reminder_id")
 
         # Validate input
         if not device_id or not reminder_id:
-            return {
-                "statusCode": 400,
-                "body": json.dumps({"error": "device_id and reminder_id are required"}),
-                "headers": {
-                    "Access-Control-Allow-Origin": "*",  # or specify your domain
-                    "Access-Control-Allow-Headers": "Content-Type",
-                    "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-                },
-            }
+            return json_response(400, {"error": "device_id and reminder_id are required"})
 
         # Define the primary key and sort key for the reminder
         pk = f"CUSTOMER#{device_id}"
@@ -40,58 +57,36 @@ def handler(event, context):
                 "PK": pk,
                 "SK": sk
             },
-            UpdateExpression="SET is_completed = :completed, updated_at = :updated_at",
+            # Removing the dispatch attributes takes the reminder off the DueIndex (dispatcher mode),
+            # and removing the active ones takes it off the ActiveRemindersIndex. The new
+            # reminder_version marks delivery payloads already in its schedule as stale.
+            UpdateExpression="SET is_completed = :completed, updated_at = :updated_at, "
+                             "reminder_version = if_not_exists(reminder_version, :zero) + :one "
+                             "REMOVE next_fire_at, fire_bucket, active_device, active_fire_at",
             ExpressionAttributeValues={
                 ":completed": True,
-                ":updated_at": datetime.now().isoformat()
+                ":updated_at": datetime.now().isoformat(),
+                ":zero": 0,
+                ":one": 1
             },
             ConditionExpression="attribute_exists(PK) AND attribute_exists(SK)",
-            ReturnValues="UPDATED_NEW"
+            # The whole item, so the schedule type is known without another read
+            ReturnValues="ALL_NEW"
         )
+        reminder = response.get("Attributes", {})
 
-        # Disable the associated EventBridge rule
-        rule_name = f"reminder_{reminder_id}"
-        try:
-            # Check if the EventBridge rule exists and disable it
-            events_client.describe_rule(Name=rule_name)  # This checks if the rule exists
-            events_client.disable_rule(Name=rule_name)
-        except events_client.exceptions.ResourceNotFoundException:
-            # If the rule doesn't exist, log and continue
-            print(f"No EventBridge rule found for {rule_name}")
+        # Stop the associated Scheduler job or EventBridge rule
+        stop_reminder_schedule(reminder_id, reminder.get("eventbridge_expression", ""))
 
         # Return success response with updated attributes
-        return {
-            "statusCode": 200,
-            "body": json.dumps({
-                "message": "Reminder marked as complete and associated EventBridge rule disabled",
-                "updated_attributes": response.get("Attributes", {})
-            }),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",  # or specify your domain
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-        }
+        return json_response(200, {
+            "message": "Reminder marked as complete and associated EventBridge rule disabled",
+            "updated_attributes": {name: reminder[name] for name in UPDATED_ATTRIBUTES if name in reminder}
+        })
 
     except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
         # This exception occurs if the item does not exist
-        return {
-            "statusCode": 404,
-            "body": json.dumps({"error": "Reminder not found"}),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",  # or specify your domain
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-        }
+        return json_response(404, {"error": "Reminder not found"})
     except Exception as e:
         print(f"Error marking reminder as complete: {e}")
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Failed to mark reminder as complete"}),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",  # or specify your domain
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-        }
+        return json_response(500, {"error": "Failed to mark reminder as complete"})
@@ -0,0 +1,58 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+# Device tokens change rarely (app reinstall, token rotation); an UNREGISTERED send drops the entry sooner
+DEVICE_TOKEN_TTL_SECONDS = int(os.getenv("DEVICE_TOKEN_TTL_SECONDS", "600"))
+DEVICE_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("DEVICE_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+
+class DeviceTokenCache:
+    """
+    In-container LRU of device_id -> device_token_id whose entries expire after ttl_seconds.
+
+    Shared by every fire a warm container delivers, including the concurrent ones of a
+    delivery batch or dispatcher sweep, so all operations take a lock.
+    """
+
+    def __init__(self, ttl_seconds=DEVICE_TOKEN_TTL_SECONDS, max_entries=DEVICE_TOKEN_CACHE_MAX_ENTRIES,
+                 clock=time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"Hit": 0, "Miss": 0, "Invalidated": 0}
+
+    def get(self, device_id):
+        """Returns the cached token for the device, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(device_id)
+            if entry:
+                device_token_id, expires_at = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(device_id)
+                    self.stats["Hit"] += 1
+                    return device_token_id
+                del self._entries[device_id]
+            self.stats["Miss"] += 1
+            return None
+
+    def put(self, device_id, device_token_id):
+        with self._lock:
+            self._entries[device_id] = (device_token_id, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(device_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, device_id, device_token_id=None):
+        """
+        Drops the device's entry. With device_token_id, only if that is still the cached token,
+        so a token cached after the failed send was read is kept.
+        """
+        with self._lock:
+            entry = self._entries.get(device_id)
+            if entry and (device_token_id is None or entry[0] == device_token_id):
+                del self._entries[device_id]
+                self.stats["Invalidated"] += 1
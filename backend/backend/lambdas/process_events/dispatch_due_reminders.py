@@ -0,0 +1,205 @@
+import os
+import json
+import boto3
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from schedule_expressions import (
+    DISPATCH_BUCKET_SECONDS,
+    DISPATCH_SHARDS,
+    get_dispatch_fields
+)
+import process_events
+
+# Initialize AWS resources
+dynamodb = boto3.resource("dynamodb")
+REMINDERS_TABLE_NAME = os.environ["REMINDERS_TABLE_NAME"]
+DUE_INDEX_NAME = "DueIndex"
+
+# Buckets before the current one that are still swept, so a late or failed run catches up
+DISPATCH_LOOKBACK_BUCKETS = int(os.getenv("DISPATCH_LOOKBACK_BUCKETS", "1"))
+# Every DISPATCH_CATCHUP_INTERVAL_MINUTES a sweep also reaches back DISPATCH_CATCHUP_BUCKETS, for
+# reminders left overdue by a sweeper outage and fires released after a failed delivery
+DISPATCH_CATCHUP_BUCKETS = int(os.getenv("DISPATCH_CATCHUP_BUCKETS", "72"))
+DISPATCH_CATCHUP_INTERVAL_MINUTES = int(os.getenv("DISPATCH_CATCHUP_INTERVAL_MINUTES", "15"))
+# A fire whose delivery keeps failing is given up after this many sweeps
+DISPATCH_MAX_ATTEMPTS = int(os.getenv("DISPATCH_MAX_ATTEMPTS", "5"))
+DISPATCH_CONCURRENCY = int(os.getenv("DISPATCH_CONCURRENCY", "16"))
+
+
+def get_due_buckets(now):
+    """
+    DueIndex partitions that can hold reminders due at or before now: the current bucket and
+    DISPATCH_LOOKBACK_BUCKETS before it, or DISPATCH_CATCHUP_BUCKETS on a catch-up sweep.
+    """
+    current_bucket = int(now.replace(tzinfo=timezone.utc).timestamp()) // DISPATCH_BUCKET_SECONDS
+    is_catchup_sweep = now.minute % DISPATCH_CATCHUP_INTERVAL_MINUTES == 0
+    lookback = max(DISPATCH_LOOKBACK_BUCKETS, DISPATCH_CATCHUP_BUCKETS) if is_catchup_sweep else DISPATCH_LOOKBACK_BUCKETS
+    return [
+        f"{bucket}#{shard}"
+        for bucket in range(current_bucket - lookback, current_bucket + 1)
+        for shard in range(DISPATCH_SHARDS)
+    ]
+
+
+def query_due_reminders(fire_bucket, now_epoch):
+    """Returns every reminder in a bucket whose next_fire_at has passed, following LastEvaluatedKey."""
+    reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
+    query_kwargs = {
+        "IndexName": DUE_INDEX_NAME,
+        "KeyConditionExpression": (
+            boto3.dynamodb.conditions.Key("fire_bucket").eq(fire_bucket)
+            & boto3.dynamodb.conditions.Key("next_fire_at").lte(now_epoch)
+        ),
+    }
+    items = []
+    while True:
+        response = reminders_table.query(**query_kwargs)
+        items.extend(response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            return items
+        query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def claim_reminder(item, now):
+    """
+    Moves a due reminder to its next fire time, or off the index if it will not fire again.
+
+    The update is conditional on the next_fire_at we read, so overlapping sweeps deliver each
+    fire at most once.
+
+    Returns:
+        bool: True if this sweep claimed the fire and should deliver it.
+    """
+    reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
+    reminder_id = item["SK"].split("#", 1)[1]
+    # Fires missed while the sweeper was behind are delivered once, not replayed
+    dispatch_fields = get_dispatch_fields(item["eventbridge_expression"], reminder_id, now, item.get("end_date"))
+    if dispatch_fields:
+        update_expression = "SET next_fire_at = :next_fire_at, fire_bucket = :fire_bucket, last_fired_at = :fired_at"
+        expression_values = {
+            ":next_fire_at": dispatch_fields["next_fire_at"],
+            ":fire_bucket": dispatch_fields["fire_bucket"],
+        }
+    else:
+        update_expression = "SET last_fired_at = :fired_at REMOVE next_fire_at, fire_bucket"
+        expression_values = {}
+    expression_values[":fired_at"] = now.isoformat()
+    expression_values[":claimed_fire_at"] = item["next_fire_at"]
+
+    try:
+        reminders_table.update_item(
+            Key={"PK": item["PK"], "SK": item["SK"]},
+            UpdateExpression=update_expression,
+            ConditionExpression="next_fire_at = :claimed_fire_at",
+            ExpressionAttributeValues=expression_values,
+        )
+        return True
+    except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+        print(f"Reminder {reminder_id} was already claimed by another sweep")
+        return False
+
+
+def get_dispatch_attempts(item):
+    """Sweeps that have already failed to deliver the item's current fire."""
+    if item.get("retried_fire_at") != item["next_fire_at"]:
+        return 0
+    return int(item.get("dispatch_attempts", 0))
+
+
+def release_reminder(item, now):
+    """
+    Puts a claimed fire back on the DueIndex after its delivery failed, so a later sweep retries it.
+
+    The update is conditional on the claim this sweep made still being the latest write, so a
+    fire claimed by another sweep, or a reminder rewritten meanwhile, is left alone.
+
+    Returns:
+        bool: True if the fire was put back.
+    """
+    reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
+    try:
+        reminders_table.update_item(
+            Key={"PK": item["PK"], "SK": item["SK"]},
+            UpdateExpression=(
+                "SET next_fire_at = :claimed_fire_at, fire_bucket = :claimed_bucket, "
+                "retried_fire_at = :claimed_fire_at, dispatch_attempts = :attempts"
+            ),
+            ConditionExpression="last_fired_at = :fired_at",
+            ExpressionAttributeValues={
+                ":claimed_fire_at": item["next_fire_at"],
+                ":claimed_bucket": item["fire_bucket"],
+                ":attempts": get_dispatch_attempts(item) + 1,
+                ":fired_at": now.isoformat(),
+            },
+        )
+        return True
+    except dynamodb.meta.client.exceptions.ConditionalCheckFailedException:
+        print(f"Reminder {item['SK']} changed after it was claimed, not releasing it")
+        return False
+
+
+def deliver_reminder(item, context=None):
+    """
+    Delivers a claimed reminder with the same payload EventBridge rules send to process_events.
+    The sweep's Lambda context bounds the send's retries.
+
+    Returns:
+        int: process_events' status code, 500 if it raised.
+    """
+    event = {
+        "device_id": item["PK"].split("#", 1)[1],
+        "reminder_id": item["SK"].split("#", 1)[1],
+    }
+    try:
+        response = process_events.handler(event, context)
+    except Exception as e:
+        print(f"Error delivering reminder {item['SK']}: {e}")
+        return 500
+    return response["statusCode"]
+
+
+def dispatch_reminder(item, now, context=None):
+    """
+    Delivers a claimed reminder, releasing the claim when process_events fails (a 500) so the
+    fire is retried, up to DISPATCH_MAX_ATTEMPTS sweeps. A missing reminder or device (a 404) is
+    not retried, and failed sends are parked by process_events itself.
+
+    Returns:
+        bool: True if delivered.
+    """
+    status_code = deliver_reminder(item, context)
+    if status_code == 200:
+        return True
+    if status_code < 500:
+        return False
+    attempts = get_dispatch_attempts(item) + 1
+    if attempts >= DISPATCH_MAX_ATTEMPTS:
+        print(f"Giving up on reminder {item['SK']} fire {item['next_fire_at']} after {attempts} attempts")
+    else:
+        try:
+            release_reminder(item, now)
+        except Exception as e:
+            print(f"Error releasing reminder {item['SK']}: {e}")
+    return False
+
+
+def handler(event, context):
+    """Runs every minute: delivers all reminders on the DueIndex whose next_fire_at has passed."""
+    now = datetime.utcnow().replace(microsecond=0)
+    now_epoch = int(now.replace(tzinfo=timezone.utc).timestamp())
+
+    with ThreadPoolExecutor(max_workers=DISPATCH_CONCURRENCY) as executor:
+        due_items = [
+            item
+            for bucket_items in executor.map(lambda bucket: query_due_reminders(bucket, now_epoch), get_due_buckets(now))
+            for item in bucket_items
+        ]
+        claimed_items = [
+            item for item, claimed in zip(due_items, executor.map(lambda item: claim_reminder(item, now), due_items))
+            if claimed
+        ]
+        delivered = sum(executor.map(lambda item: dispatch_reminder(item, now, context), claimed_items))
+
+    summary = {"due": len(due_items), "claimed": len(claimed_items), "delivered": delivered}
+    print(f"Dispatch sweep at {now.isoformat()}: {json.dumps(summary)}")
+    return summary
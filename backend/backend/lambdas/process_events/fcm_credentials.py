@@ -0,0 +1,101 @@
+import os
+import json
+import time
+import threading
+from datetime import timezone
+
+FCM_SCOPES = ["https://www.googleapis.com/auth/firebase.messaging"]
+# A token this close to expiry is refreshed before it is handed out
+TOKEN_REFRESH_MARGIN_SECONDS = int(os.getenv("FCM_TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+# Inside this window (and outside the margin) the current token is still used while a background refresh runs
+TOKEN_BACKGROUND_REFRESH_SECONDS = int(os.getenv("FCM_TOKEN_BACKGROUND_REFRESH_SECONDS", "900"))
+
+
+def load_service_account_credentials():
+    """Service account credentials for FCM, built from SERVICE_ACCOUNT_JSON (not refreshed yet)."""
+    # google-auth is only needed once a notification is sent, so keep it out of container init
+    from google.oauth2 import service_account
+
+    service_account_json = os.environ["SERVICE_ACCOUNT_JSON"]
+    if not service_account_json:
+        raise ValueError("SERVICE_ACCOUNT_JSON not found.")
+    return service_account.Credentials.from_service_account_info(json.loads(service_account_json), scopes=FCM_SCOPES)
+
+
+def new_auth_request():
+    """A google-auth transport; its requests.Session is kept, so refreshes reuse the connection."""
+    import google.auth.transport.requests
+    return google.auth.transport.requests.Request()
+
+
+class FCMCredentialManager:
+    """
+    Hands out FCM OAuth access tokens, shared by every send in a warm container.
+
+    The service account is parsed once. Tokens are refreshed only when they come close to
+    expiry: within TOKEN_BACKGROUND_REFRESH_SECONDS a single background thread refreshes
+    while callers keep using the current token, and within TOKEN_REFRESH_MARGIN_SECONDS (or
+    when a frozen container never finished the background refresh) the caller refreshes
+    itself. Safe to call from concurrent threads.
+    """
+
+    def __init__(self, credentials_factory=load_service_account_credentials, request_factory=new_auth_request,
+                 clock=time.time):
+        self._credentials_factory = credentials_factory
+        self._request_factory = request_factory
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._background_lock = threading.Lock()
+        self._credentials = None
+        self._request = None
+        self._token = None
+        self._expires_at = 0
+        self._background_refresh = None
+
+    def get_token(self):
+        """A valid access token, refreshed first only if it is about to expire."""
+        token, remaining = self._token, self._expires_at - self._clock()
+        if token and remaining > TOKEN_BACKGROUND_REFRESH_SECONDS:
+            return token
+        if token and remaining > TOKEN_REFRESH_MARGIN_SECONDS:
+            self._start_background_refresh()
+            return token
+
+        with self._lock:
+            # Another thread may have refreshed while this one waited for the lock
+            if not self._token or self._expires_at - self._clock() <= TOKEN_REFRESH_MARGIN_SECONDS:
+                self._refresh()
+            return self._token
+
+    def invalidate(self):
+        """Forgets the current token, e.g. after FCM rejected it with 401."""
+        with self._lock:
+            self._token = None
+            self._expires_at = 0
+
+    def _refresh(self):
+        """Fetches a new token from Google. The caller holds the lock."""
+        if self._credentials is None:
+            self._credentials = self._credentials_factory()
+            self._request = self._request_factory()
+        self._credentials.refresh(self._request)
+        expiry = self._credentials.expiry  # Naive UTC, as google-auth stores it
+        self._token = self._credentials.token
+        self._expires_at = expiry.replace(tzinfo=timezone.utc).timestamp() if expiry else self._clock() + 3600
+
+    def _start_background_refresh(self):
+        # Not the refresh lock, which the background refresh holds for its whole request
+        with self._background_lock:
+            if self._background_refresh and self._background_refresh.is_alive():
+                return
+            self._background_refresh = threading.Thread(target=self._refresh_in_background, daemon=True)
+            self._background_refresh.start()
+
+    def _refresh_in_background(self):
+        try:
+            with self._lock:
+                if self._expires_at - self._clock() <= TOKEN_BACKGROUND_REFRESH_SECONDS:
+                    self._refresh()
+        except Exception as e:
+            # The current token is still valid; the next caller past the margin retries in the foreground
+            print(f"Error refreshing FCM access token in the background: {e}")
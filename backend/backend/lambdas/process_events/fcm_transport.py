@@ -0,0 +1,167 @@
+import os
+import json
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+
+# Overridable so the sender can be pointed at a local FCM stub
+FCM_BASE_URL = os.getenv("FCM_BASE_URL", "https://fcm.googleapis.com")
+# Connect fails fast; FCM normally answers within a second once connected
+FCM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("FCM_CONNECT_TIMEOUT_SECONDS", "3.05"))
+FCM_READ_TIMEOUT_SECONDS = float(os.getenv("FCM_READ_TIMEOUT_SECONDS", "10"))
+# Kept-alive connections; matches the dispatcher's DISPATCH_CONCURRENCY so no concurrent send waits for one
+FCM_POOL_SIZE = int(os.getenv("FCM_POOL_SIZE", "16"))
+METRICS_NAMESPACE = "RemindMe/Notifications"
+# Attempts per send, and the full-jitter exponential backoff between them. A wait longer than
+# FCM_BACKOFF_MAX_SECONDS (e.g. a long Retry-After) ends the retries instead of holding the Lambda.
+FCM_MAX_ATTEMPTS = int(os.getenv("FCM_MAX_ATTEMPTS", "3"))
+FCM_BACKOFF_BASE_SECONDS = float(os.getenv("FCM_BACKOFF_BASE_SECONDS", "0.5"))
+FCM_BACKOFF_MAX_SECONDS = float(os.getenv("FCM_BACKOFF_MAX_SECONDS", "5"))
+# Time kept back from the Lambda deadline for bookkeeping writes and the response
+FCM_DEADLINE_RESERVE_SECONDS = float(os.getenv("FCM_DEADLINE_RESERVE_SECONDS", "2"))
+# Attempts (or retries after a backoff) are not started with less time than this left
+FCM_MIN_ATTEMPT_SECONDS = float(os.getenv("FCM_MIN_ATTEMPT_SECONDS", "1"))
+# FCM asks for a backoff on quota (429) and server errors; every other error is permanent
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def emit_send_metric(latency_ms, status_code):
+    """Prints a CloudWatch Embedded Metric Format record for one FCM send."""
+    print(json.dumps({
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [[]],
+                "Metrics": [{"Name": "SendLatency", "Unit": "Milliseconds"}],
+            }],
+        },
+        "SendLatency": round(latency_ms, 1),
+        "StatusCode": status_code,
+    }))
+
+
+class FCMTransport:
+    """
+    Keep-alive HTTP transport for FCM v1 sends, shared by every send in a warm container.
+
+    One requests.Session with a connection pool of FCM_POOL_SIZE is created on first use, so
+    each send after the first few skips the TCP and TLS handshakes. Safe to call from
+    concurrent threads.
+    """
+
+    def __init__(self, base_url=None, pool_size=None, timeout=None):
+        self.base_url = (base_url or FCM_BASE_URL).rstrip("/")
+        self.pool_size = pool_size or FCM_POOL_SIZE
+        self.timeout = timeout or (FCM_CONNECT_TIMEOUT_SECONDS, FCM_READ_TIMEOUT_SECONDS)
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._new_session()
+        return self._session
+
+    def _new_session(self):
+        # requests is only needed once a notification is sent, so keep it out of container init
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        # Retrying a send could deliver a notification twice, so failures are left to the caller
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0, pool_block=False)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def send(self, project_id, message, access_token, timeout=None):
+        """
+        POSTs one message to FCM's messages:send.
+
+        Args:
+            timeout: (connect, read) seconds for this send, e.g. capped to the time the
+                invocation has left; defaults to the transport's timeout.
+
+        Returns:
+            tuple: (requests.Response, latency in milliseconds)
+        """
+        started_at = time.perf_counter()
+        response = self.session.post(
+            f"{self.base_url}/v1/projects/{project_id}/messages:send",
+            headers={"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"},
+            data=json.dumps(message),
+            timeout=timeout or self.timeout,
+        )
+        latency_ms = (time.perf_counter() - started_at) * 1000
+        emit_send_metric(latency_ms, response.status_code)
+        return response, latency_ms
+
+
+def get_send_deadline(context):
+    """
+    Monotonic time by which an invocation's sends must be finished: the Lambda deadline less
+    FCM_DEADLINE_RESERVE_SECONDS, or None outside Lambda.
+    """
+    if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+        return None
+    return time.monotonic() + context.get_remaining_time_in_millis() / 1000 - FCM_DEADLINE_RESERVE_SECONDS
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None if it has none."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - (now if now is not None else time.time()), 0.0)
+
+
+class FCMRetryPolicy:
+    """
+    Bounded exponential backoff with full jitter for FCM sends that fail with a retryable error.
+
+    A Retry-After sent by FCM replaces the backoff. No retry is scheduled that could not
+    start, with FCM_MIN_ATTEMPT_SECONDS to run, before the invocation's deadline. rng and
+    sleep are injectable so tests can run without waiting.
+    """
+
+    def __init__(self, max_attempts=None, base_delay=None, max_delay=None, rng=random.random, sleep=time.sleep):
+        self.max_attempts = max_attempts or FCM_MAX_ATTEMPTS
+        self.base_delay = FCM_BACKOFF_BASE_SECONDS if base_delay is None else base_delay
+        self.max_delay = FCM_BACKOFF_MAX_SECONDS if max_delay is None else max_delay
+        self._rng = rng
+        self.sleep = sleep
+
+    def is_retryable(self, status_code):
+        return status_code in RETRYABLE_STATUS_CODES
+
+    def get_delay(self, attempt, retry_after=None, remaining_seconds=None):
+        """
+        Seconds to wait after a failed attempt (1-based) before the next one.
+
+        Args:
+            remaining_seconds (float): Time left before the deadline, or None if there is none.
+
+        Returns:
+            float: The delay, or None if no further attempt should be made.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self._rng() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        if delay > self.max_delay:
+            return None
+        if remaining_seconds is not None and delay + FCM_MIN_ATTEMPT_SECONDS > remaining_seconds:
+            return None
+        return delay
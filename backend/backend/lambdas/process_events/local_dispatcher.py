@@ -0,0 +1,128 @@
+import time
+import calendar
+from datetime import datetime, timedelta
+from schedule_expressions import get_next_fire_time, parse_stored_date
+from timing_wheel import TimingWheel
+
+
+def to_epoch(moment):
+    """Naive UTC datetime to epoch seconds."""
+    return calendar.timegm(moment.timetuple())
+
+
+def from_epoch(seconds):
+    return datetime(1970, 1, 1) + timedelta(seconds=seconds)
+
+
+class SystemClock:
+    """Wall clock in naive UTC, matching how cron() and rate() expressions are evaluated."""
+
+    def now(self):
+        return datetime.utcnow()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class SimulatedClock:
+    """Clock that only moves when told to, for fast-forward tests."""
+
+    def __init__(self, start):
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def sleep(self, seconds):
+        self._now += timedelta(seconds=seconds)
+
+    def advance(self, seconds):
+        self.sleep(seconds)
+
+
+def deliver_with_process_events(event):
+    """Default delivery: the same handler and {device_id, reminder_id} payload EventBridge uses."""
+    import process_events
+    return process_events.handler(event, None)
+
+
+class LocalDispatcher:
+    """
+    Stand-in for EventBridge rules and Scheduler for local runs, integration tests and
+    self-hosted deployments.
+
+    Reminders are fed by their eventbridge_expression and fired from a timing wheel. Only the
+    next fire of each reminder is kept in the wheel; recurring reminders are rescheduled from
+    their own fire time when they fire, so a simulated clock can skip ahead days at a time.
+    """
+
+    def __init__(self, deliver=deliver_with_process_events, clock=None, tick_seconds=1):
+        self.deliver = deliver
+        self.clock = clock or SystemClock()
+        self.wheel = TimingWheel(to_epoch(self.clock.now()), tick_seconds=tick_seconds)
+        self.fired = 0
+
+    def __len__(self):
+        return len(self.wheel)
+
+    def add_reminder(self, device_id, reminder_id, expression, end_date=None):
+        """
+        Schedules a reminder's next fire after the current time (replacing any pending one).
+
+        Returns:
+            datetime: Next fire time in UTC, or None if the schedule will not fire again.
+        """
+        return self._schedule_next(
+            (device_id, reminder_id, expression, parse_stored_date(end_date)),
+            from_epoch(self.wheel.current_time)
+        )
+
+    def cancel_reminder(self, reminder_id):
+        return self.wheel.cancel(reminder_id)
+
+    def load_reminders(self, items):
+        """Adds RemindersTable items that are not completed. Returns how many were scheduled."""
+        scheduled = 0
+        for item in items:
+            if item.get("is_completed") or not item.get("eventbridge_expression"):
+                continue
+            fire_at = self.add_reminder(
+                item["PK"].split("#", 1)[1],
+                item["SK"].split("#", 1)[1],
+                item["eventbridge_expression"],
+                item.get("end_date")
+            )
+            scheduled += fire_at is not None
+        return scheduled
+
+    def run_pending(self):
+        """Delivers everything due by the clock's current time. Returns the number delivered."""
+        return self.wheel.advance_to(to_epoch(self.clock.now()), self._fire)
+
+    def run_for(self, seconds):
+        """Advances a simulated clock by seconds, delivering everything due on the way."""
+        self.clock.advance(seconds)
+        return self.run_pending()
+
+    def run_forever(self, poll_seconds=1.0):
+        while True:
+            self.run_pending()
+            self.clock.sleep(poll_seconds)
+
+    def _schedule_next(self, reminder, after):
+        device_id, reminder_id, expression, end_date = reminder
+        fire_at = get_next_fire_time(expression, after, end_date)
+        if fire_at is None:
+            self.wheel.cancel(reminder_id)
+            return None
+        self.wheel.schedule(reminder_id, to_epoch(fire_at), reminder)
+        return fire_at
+
+    def _fire(self, task):
+        device_id, reminder_id, _, _ = task.payload
+        try:
+            self.deliver({"device_id": device_id, "reminder_id": reminder_id})
+        except Exception as e:
+            print(f"Error delivering reminder {reminder_id}: {e}")
+        self.fired += 1
+        self._schedule_next(task.payload, from_epoch(task.expires_at))
@@ -1,95 +1,585 @@
 import os
 import json
-import requests
+import time
 import boto3
-from google.oauth2 import service_account
-import google.auth.transport.requests
+from datetime import datetime
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from schedule_expressions import (
+    AT_EXPRESSION_TIMEZONE,
+    DELIVERY_PAYLOAD_VERSION,
+    SCHEDULING_MODE,
+    get_occurrence_fields,
+    parse_stored_date,
+    render_reminder_message
+)
+from fcm_credentials import FCMCredentialManager
+from fcm_transport import (
+    FCM_CONNECT_TIMEOUT_SECONDS,
+    FCM_MIN_ATTEMPT_SECONDS,
+    FCM_READ_TIMEOUT_SECONDS,
+    METRICS_NAMESPACE,
+    FCMRetryPolicy,
+    FCMTransport,
+    get_send_deadline
+)
+from device_token_cache import DeviceTokenCache
 
 # Configuration
 FIREBASE_PROJECT_ID = os.environ["FIREBASE_PROJECT_ID"]
 
 # Initialize AWS resources
 dynamodb = boto3.resource("dynamodb")
+events = boto3.client("events")
+scheduler = boto3.client("scheduler")
+sqs = boto3.client("sqs")
 CUSTOMER_DEVICES_TABLE_NAME = os.environ["CUSTOMER_DEVICES_TABLE_NAME"]
 REMINDERS_TABLE_NAME = os.environ["REMINDERS_TABLE_NAME"]
+# Sends that failed for good are parked here for inspection and redrive; unset, they are only logged
+NOTIFICATION_DEAD_LETTER_QUEUE_URL = os.getenv("NOTIFICATION_DEAD_LETTER_QUEUE_URL")
+# Parallel device lookups and FCM sends per SQS batch (SCHEDULING_MODE=queue)
+DELIVERY_CONCURRENCY = int(os.getenv("DELIVERY_CONCURRENCY", "16"))
+# BatchGetItem reads at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+FIRE_CHECK_PROJECTION = "PK, SK, reminder_version, is_completed, end_date, eventbridge_expression, #timezone"
 
 
-def get_service_account():
-    """Fetch the service account JSON from environment variable."""
-    service_account_json = os.environ["SERVICE_ACCOUNT_JSON"]
-    if not service_account_json:
-        raise ValueError("SERVICE_ACCOUNT_JSON not found.")
-    return json.loads(service_account_json)
+# Shared by every send in this container, so a warm invocation rarely waits on Google's token endpoint
+fcm_credentials = FCMCredentialManager()
+# Likewise its connections to FCM are kept alive between sends
+fcm_transport = FCMTransport()
+fcm_retry_policy = FCMRetryPolicy()
+# device_id -> device_token_id, so a warm fire usually reads only its reminder
+device_token_cache = DeviceTokenCache()
+# Runs a direct fire's device lookup alongside its reminder read
+lookup_executor = ThreadPoolExecutor(max_workers=DELIVERY_CONCURRENCY)
 
 
 def get_access_token():
-    """Generate an OAuth 2.0 access token for FCM using a service account."""
-    service_account_info = get_service_account()
-    credentials = service_account.Credentials.from_service_account_info(
-        service_account_info, scopes=['https://www.googleapis.com/auth/firebase.messaging']
-    )
-    request = google.auth.transport.requests.Request()
-    credentials.refresh(request)
-    return credentials.token
+    """OAuth 2.0 access token for FCM, cached until it comes close to expiry."""
+    return fcm_credentials.get_token()
+
+class RetryableDeliveryError(Exception):
+    """A send still failing with a retryable error after every attempt; the fire should be redelivered."""
+
+
+def get_response_error(response):
+    """The error body of a failed FCM response; FCM answers JSON, proxies in front of it may not."""
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
 
-def send_push_notification(device_token_id, task, reminder_message):
+
+def send_push_notification(device_token_id, task, reminder_message, deadline=None, retry=True):
     """
     Sends a high-priority, vibrating, sticky FCM notification with a custom vibration pattern.
-    """
-    try:
-        # Get the access token for FCM
-        access_token = get_access_token()
 
-        # Prepare the notification content
-        notification_content = {
-            "title": "Reminder",
-            "body": f"Task: {task}\n{reminder_message}"
-        }
+    Quota (429) and server errors, a rejected access token (401, after refreshing it) and
+    exceptions such as timeouts are retried under fcm_retry_policy. A failed result says
+    whether the error was retryable, so callers can redeliver it or park it.
 
-        # FCM headers and URL
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json'
-        }
-        url = f'https://fcm.googleapis.com/v1/projects/{FIREBASE_PROJECT_ID}/messages:send'
-
-        # FCM message body with a custom vibration pattern
-        message = {
-            "message": {
-                "token": device_token_id,
-                "notification": notification_content,
-                "android": {
-                    "priority": "high",
-                    "notification": {
-                        "default_vibrate_timings": False,  # Disable default vibration timings
-                        "vibrate_timings": ["0s", "0.5s", "1s", "0.5s", "2s", "2s"],  # Custom vibration pattern
-                        "sound": "default",
-                        "sticky": True,  # Makes the notification sticky
-                        "channel_id": "reminder_channel",  # Use a dedicated channel
-                    }
+    Args:
+        deadline (float): Monotonic time by which sending must be over (see get_send_deadline);
+            each attempt's timeout is capped to it and no attempt is started too close to it.
+        retry (bool): False to make a single attempt, for callers that redeliver retryable failures.
+    """
+    # Prepare the notification content
+    notification_content = {
+        "title": "Reminder",
+        "body": f"Task: {task}\n{reminder_message}"
+    }
+
+    # FCM message body with a custom vibration pattern
+    message = {
+        "message": {
+            "token": device_token_id,
+            "notification": notification_content,
+            "android": {
+                "priority": "high",
+                "notification": {
+                    "default_vibrate_timings": False,  # Disable default vibration timings
+                    "vibrate_timings": ["0s", "0.5s", "1s", "0.5s", "2s", "2s"],  # Custom vibration pattern
+                    "sound": "default",
+                    "sticky": True,  # Makes the notification sticky
+                    "channel_id": "reminder_channel",  # Use a dedicated channel
                 }
             }
         }
+    }
+
+    attempt = 0
+    while True:
+        remaining_seconds = None if deadline is None else deadline - time.monotonic()
+        if remaining_seconds is not None and remaining_seconds < FCM_MIN_ATTEMPT_SECONDS:
+            result = {"status": "Failed", "error": "No time left to send before the deadline",
+                      "retryable": True, "attempts": attempt}
+            print("Failed to send notification:", result)
+            return result
+        timeout = None
+        if remaining_seconds is not None:
+            timeout = (min(FCM_CONNECT_TIMEOUT_SECONDS, remaining_seconds), min(FCM_READ_TIMEOUT_SECONDS, remaining_seconds))
+
+        attempt += 1
+        retry_after = None
+        try:
+            # Get the access token for FCM and send over the pooled connection
+            access_token = get_access_token()
+            response, latency_ms = fcm_transport.send(FIREBASE_PROJECT_ID, message, access_token, timeout=timeout)
+        except Exception as e:
+            print(f"Error sending push notification (attempt {attempt}):", e)
+            result = {"status": "Failed", "error": str(e), "retryable": True}
+        else:
+            print(f"FCM responded {response.status_code} in {latency_ms:.0f} ms: {response.text}")
+            if response.status_code == 200:
+                print("Notification sent successfully:", response.json())
+                return {"status": "Notification sent", "device_token_id": device_token_id, "content": notification_content}
+            if response.status_code == 401:
+                # Revoked or rotated key: the next attempt fetches a fresh token
+                fcm_credentials.invalidate()
+            result = {
+                "status": "Failed",
+                "status_code": response.status_code,
+                "error": get_response_error(response),
+                "retryable": response.status_code == 401 or fcm_retry_policy.is_retryable(response.status_code),
+            }
+            retry_after = response.headers.get("Retry-After")
+
+        result["attempts"] = attempt
+        delay = None
+        if retry and result["retryable"]:
+            remaining_seconds = None if deadline is None else deadline - time.monotonic()
+            delay = fcm_retry_policy.get_delay(attempt, retry_after, remaining_seconds)
+        if delay is None:
+            print("Failed to send notification:", result)
+            return result
+        print(f"Retrying FCM send in {delay:.2f} s")
+        fcm_retry_policy.sleep(delay)
 
-        # Send the notification request
-        response = requests.post(url, headers=headers, json=message)
 
-        print(response.text)
-        
-        # Check response and return result
-        if response.status_code == 200:
-            print("Notification sent successfully:", response.json())
-            return {"status": "Notification sent", "device_token_id": device_token_id, "content": notification_content}
+def advance_next_occurrences(reminders_table, reminder):
+    """
+    Moves a recurring reminder's stored next_occurrences, and its place on the
+    ActiveRemindersIndex, past the fire just delivered.
+
+    A reminder with a reminder_version (built from a delivery payload, or read from an item
+    that has one) is only updated while the item is still at that version.
+    """
+    expression = reminder.get("eventbridge_expression")
+    if not expression or expression.startswith("at("):
+        return
+    occurrence_fields = get_occurrence_fields(
+        expression, reminder.get("start_at"), timezone_name=reminder.get("timezone", AT_EXPRESSION_TIMEZONE)
+    )
+    if not occurrence_fields:
+        return
+
+    update_expression = "SET next_occurrences = :next_occurrences"
+    expression_values = {":next_occurrences": occurrence_fields["next_occurrences"]}
+    if "next_occurrences_expire_at" in occurrence_fields:
+        update_expression += ", next_occurrences_expire_at = :next_fire_at"
+        expression_values[":next_fire_at"] = occurrence_fields["next_occurrences_expire_at"]
+        if reminder.get("active_device"):
+            update_expression += ", active_fire_at = :next_fire_at"
+    condition_expression = "attribute_exists(PK)"
+    if "reminder_version" in reminder:
+        condition_expression += " AND reminder_version = :reminder_version"
+        expression_values[":reminder_version"] = reminder["reminder_version"]
+    reminders_table.update_item(
+        Key={"PK": reminder["PK"], "SK": reminder["SK"]},
+        UpdateExpression=update_expression,
+        ConditionExpression=condition_expression,
+        ExpressionAttributeValues=expression_values,
+    )
+
+
+def get_skip_reason(reminder, today=None):
+    """
+    Why a fire of this reminder should be dropped instead of delivered: "completed", "expired"
+    (past its end_date in the reminder's timezone), or None to deliver it.
+    """
+    if reminder.get("is_completed"):
+        return "completed"
+    end_date = parse_stored_date(reminder.get("end_date"))
+    if end_date is not None:
+        if today is None:
+            import pytz
+            today = datetime.now(pytz.timezone(reminder.get("timezone", AT_EXPRESSION_TIMEZONE))).date()
+        if today > end_date:
+            return "expired"
+    return None
+
+
+def stop_reminder_schedule(reminder):
+    """
+    Disables the EventBridge rule, or deletes the Scheduler job, that keeps firing a reminder
+    which will not be delivered again, as mark_reminder_complete does on completion.
+
+    Returns:
+        bool: True if a rule or schedule was stopped.
+    """
+    if SCHEDULING_MODE == "dispatcher":
+        # The sweeper drops reminders off the DueIndex itself; there is no rule to stop
+        return False
+    rule_name = f"reminder_{reminder['SK'].split('#', 1)[1]}"
+    try:
+        if reminder.get("eventbridge_expression", "").startswith("at("):
+            scheduler.delete_schedule(Name=rule_name)
         else:
-            print("Failed to send notification:", response.json())
-            return {"status": "Failed", "error": response.json()}
+            events.disable_rule(Name=rule_name)
+        return True
+    except ClientError as e:
+        # Already gone, or not ours to stop; the next fire tries again
+        print(f"Could not stop schedule {rule_name}: {e}")
+        return False
 
+
+def emit_skipped_fires_metric(reason, skipped, schedules_stopped):
+    """Prints a CloudWatch Embedded Metric Format record counting fires dropped for one reason."""
+    print(json.dumps({
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [["Reason"]],
+                "Metrics": [
+                    {"Name": "SkippedFires", "Unit": "Count"},
+                    {"Name": "SchedulesStopped", "Unit": "Count"},
+                ],
+            }],
+        },
+        "Reason": reason,
+        "SkippedFires": skipped,
+        "SchedulesStopped": schedules_stopped,
+    }))
+
+
+def skip_fire(reminder, reason):
+    """Drops a fire of a reminder that is over and stops its schedule. Returns True if the schedule was stopped."""
+    print(f"Skipping fire of {reason} reminder {reminder['SK']}")
+    return stop_reminder_schedule(reminder)
+
+
+def get_fcm_error_code(notification_response):
+    """The FcmError errorCode (e.g. UNREGISTERED) of a failed send, if FCM returned one."""
+    error = notification_response.get("error")
+    if not isinstance(error, dict):
+        return None
+    for detail in error.get("error", {}).get("details", []):
+        if detail.get("errorCode"):
+            return detail["errorCode"]
+    return None
+
+
+def prune_device_token(device_id, device_token_id):
+    """
+    Removes a token FCM reported as UNREGISTERED from the device's CustomerDevices item, unless
+    the app has registered a new one since, so later fires are not sent to it.
+    """
+    customer_devices_table = dynamodb.Table(CUSTOMER_DEVICES_TABLE_NAME)
+    response = customer_devices_table.query(
+        IndexName="DeviceIdIndex",
+        KeyConditionExpression=boto3.dynamodb.conditions.Key("device_id").eq(device_id)
+    )
+    for item in response.get("Items", []):
+        if item.get("device_token_id") != device_token_id:
+            continue
+        try:
+            customer_devices_table.update_item(
+                Key={"PK": item["PK"], "SK": item["SK"]},
+                UpdateExpression="SET token_pruned_at = :now REMOVE device_token_id",
+                ConditionExpression="device_token_id = :device_token_id",
+                ExpressionAttributeValues={":now": datetime.now().isoformat(), ":device_token_id": device_token_id},
+            )
+            print(f"Pruned unregistered token of device {device_id}")
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+
+def park_failed_delivery(reminder, device_token_id, notification_response):
+    """Sends a fire that could not be delivered to the notification dead-letter queue."""
+    if not NOTIFICATION_DEAD_LETTER_QUEUE_URL:
+        return
+    sqs.send_message(
+        QueueUrl=NOTIFICATION_DEAD_LETTER_QUEUE_URL,
+        MessageBody=json.dumps({
+            "device_id": reminder["PK"].split("#", 1)[1],
+            "reminder_id": reminder["SK"].split("#", 1)[1],
+            "device_token_id": device_token_id,
+            "status_code": notification_response.get("status_code"),
+            "error_code": get_fcm_error_code(notification_response),
+            "error": notification_response.get("error"),
+            "retryable": notification_response.get("retryable", False),
+            "attempts": notification_response.get("attempts"),
+            "failed_at": datetime.now().isoformat(),
+        }, default=str)
+    )
+
+
+def handle_failed_delivery(reminder, device_token_id, notification_response):
+    """Prunes a dead device token and parks the failed fire. Never raises."""
+    device_id = reminder["PK"].split("#", 1)[1]
+    if get_fcm_error_code(notification_response) == "UNREGISTERED":
+        # The app was uninstalled or the token rotated; later fires re-read the device
+        device_token_cache.invalidate(device_id, device_token_id)
+        try:
+            prune_device_token(device_id, device_token_id)
+        except Exception as e:
+            print(f"Error pruning token of device {device_id}: {e}")
+    try:
+        park_failed_delivery(reminder, device_token_id, notification_response)
     except Exception as e:
-        print("Error sending push notification:", e)
-        return {"status": "Failed", "error": str(e)}
+        print(f"Error parking failed delivery of reminder {reminder['SK']}: {e}")
+
+
+def deliver_notification(reminders_table, reminder, device_token_id, redeliver_retryable=False, deadline=None):
+    """
+    Sends a reminder's notification and moves its schedule on. Returns the send result.
+
+    A failure is parked in the notification dead-letter queue, unless it is retryable and
+    redeliver_retryable is set: then the send is not retried in process, and
+    RetryableDeliveryError is raised so the delivery queue redelivers the fire later.
+    deadline bounds the send as in send_push_notification.
+    """
+    task = reminder.get("task", "No task specified")
+    reminder_message = reminder.get("message") or render_reminder_message(task)
+
+    # Send push notification with task content
+    notification_response = send_push_notification(
+        device_token_id, task, reminder_message, deadline=deadline, retry=not redeliver_retryable
+    )
+
+    # Log the notification response
+    print(f"Push notification response: {notification_response}")
+
+    if notification_response.get("status") == "Failed":
+        if redeliver_retryable and notification_response.get("retryable"):
+            raise RetryableDeliveryError(notification_response.get("error"))
+        handle_failed_delivery(reminder, device_token_id, notification_response)
+
+    # The fire has happened whether or not FCM accepted it, so the listed schedule moves on
+    try:
+        advance_next_occurrences(reminders_table, reminder)
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            print(f"Error advancing next_occurrences for reminder {reminder['SK']}: {e}")
+        else:
+            # Changed, completed or deleted after its schedule was written; that update owns the listing
+            print(f"Reminder {reminder['SK']} is no longer at version {reminder.get('reminder_version')}; not advanced")
+            check_stale_reminder(reminders_table, reminder)
+    except Exception as e:
+        print(f"Error advancing next_occurrences for reminder {reminder['SK']}: {e}")
+    return notification_response
+
+
+def check_stale_reminder(reminders_table, reminder):
+    """
+    Reads a reminder whose delivery payload turned out to be stale, and stops its schedule if
+    the reminder has since been completed or has run past its end_date.
+    """
+    try:
+        item = reminders_table.get_item(Key={"PK": reminder["PK"], "SK": reminder["SK"]}).get("Item")
+        reason = get_skip_reason(item) if item else None
+        if reason:
+            emit_skipped_fires_metric(reason, 0, int(skip_fire(item, reason)))
+    except Exception as e:
+        print(f"Error checking stale reminder {reminder['SK']}: {e}")
+
+
+def read_fire_check(reminders_table, reminder):
+    """
+    Reads, consistently, what decides whether a fire built from a delivery payload may still be
+    sent: the item's reminder_version, completion and end_date. None if the reminder is gone.
+    """
+    return reminders_table.get_item(
+        Key={"PK": reminder["PK"], "SK": reminder["SK"]},
+        ConsistentRead=True,
+        ProjectionExpression=FIRE_CHECK_PROJECTION,
+        ExpressionAttributeNames={"#timezone": "timezone"},
+    ).get("Item")
+
+
+def check_payload_fire(payload_reminder, item):
+    """
+    Checks a fire built from a delivery payload against the reminder's current item.
+
+    Returns:
+        tuple: (skip reason, reminder whose schedule to stop), or (None, None) to send it.
+        A completed or expired reminder is stopped as any other; one deleted, or written at
+        another reminder_version ("stale"), was unscheduled or rescheduled by that write.
+    """
+    if item is None:
+        return "deleted", None
+    reason = get_skip_reason(item)
+    if reason:
+        return reason, item
+    if item.get("reminder_version") != payload_reminder["reminder_version"]:
+        return "stale", None
+    return None, None
+
+
+def get_payload_reminder(payload):
+    """
+    The reminder a schedule's delivery payload describes (see schedule_expressions.get_delivery_input),
+    or None if the reminder has to be read: the payload carries ids only, or was written in
+    another payload_version.
+    """
+    if payload.get("payload_version") != DELIVERY_PAYLOAD_VERSION:
+        return None
+    if not all(payload.get(key) is not None for key in ("task", "eventbridge_expression", "reminder_version")):
+        return None
+    reminder = {
+        "PK": f"CUSTOMER#{payload['device_id']}",
+        "SK": f"REMINDER#{payload['reminder_id']}",
+        "task": payload["task"],
+        "message": payload.get("message"),
+        "eventbridge_expression": payload["eventbridge_expression"],
+        "timezone": payload.get("timezone", AT_EXPRESSION_TIMEZONE),
+        "reminder_version": payload["reminder_version"],
+        # Schedules are only written for active reminders; check_payload_fire catches completion
+        "active_device": payload["device_id"],
+    }
+    for key in ("start_at", "end_date"):
+        if payload.get(key) is not None:
+            reminder[key] = payload[key]
+    return reminder
+
+
+def batch_get_reminders(keys):
+    """
+    Reads reminders by key with consistent BatchGetItem reads, 100 keys per request, retrying
+    unprocessed keys.
+
+    Returns:
+        dict: (PK, SK) -> item, for the reminders that exist.
+    """
+    reminders = {}
+    for start in range(0, len(keys), BATCH_GET_MAX_KEYS):
+        request_items = {REMINDERS_TABLE_NAME: {"Keys": keys[start:start + BATCH_GET_MAX_KEYS], "ConsistentRead": True}}
+        attempt = 0
+        while request_items:
+            if attempt:
+                time.sleep(min(0.05 * 2 ** attempt, 1))  # Unprocessed keys mean the table is throttling
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for item in response["Responses"].get(REMINDERS_TABLE_NAME, []):
+                reminders[(item["PK"], item["SK"])] = item
+            request_items = response.get("UnprocessedKeys") or None
+            attempt += 1
+    return reminders
+
+
+def query_device_token(device_id):
+    """The device's FCM token from the DeviceIdIndex, or None if the device is unknown."""
+    response = dynamodb.Table(CUSTOMER_DEVICES_TABLE_NAME).query(
+        IndexName="DeviceIdIndex",
+        KeyConditionExpression=boto3.dynamodb.conditions.Key("device_id").eq(device_id)
+    )
+    items = response.get("Items")
+    return items[0].get("device_token_id") if items else None
+
+
+def get_device_token(device_id):
+    """The device's FCM token from the cache, or the DeviceIdIndex on a miss; None if the device is unknown."""
+    device_token_id = device_token_cache.get(device_id)
+    if device_token_id is None:
+        device_token_id = query_device_token(device_id)
+        if device_token_id:
+            device_token_cache.put(device_id, device_token_id)
+    return device_token_id
+
+
+def process_delivery_batch(records, deadline=None):
+    """
+    Delivers a batch of reminder fires from the delivery queue (SCHEDULING_MODE=queue).
+
+    Each message body is the Input a schedule sends: a delivery payload, or just
+    {"device_id": ..., "reminder_id": ...} for schedules written before payloads. Every fire's
+    reminder is read, with one consistent BatchGetItem, so payload fires of reminders edited,
+    completed or deleted since their schedule was written are dropped unsent; devices are
+    looked up and notifications sent concurrently. Fires whose reminder or device no longer
+    exists are dropped, as the direct invocation path does; messages that hit an error, including sends still failing with a
+    retryable error, are reported back for redelivery. Sends are not retried in process, and
+    none is started too close to deadline (see get_send_deadline): those fires are reported
+    back unsent, so an invocation timeout never makes SQS redeliver fires already sent.
+
+    Returns:
+        dict: The SQS partial batch response, {"batchItemFailures": [...]}.
+    """
+    fires = []
+    for record in records:
+        try:
+            body = json.loads(record["body"])
+            fires.append((record["messageId"], body["device_id"], body["reminder_id"], get_payload_reminder(body)))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            print(f"Dropping malformed delivery message {record.get('messageId')}: {record.get('body')}")
+
+    keys = list(dict.fromkeys(
+        (f"CUSTOMER#{device_id}", f"REMINDER#{reminder_id}")
+        for _, device_id, reminder_id, _ in fires
+    ))
+    try:
+        reminders = batch_get_reminders([{"PK": pk, "SK": sk} for pk, sk in keys])
+    except Exception as e:
+        print(f"Error reading reminders for delivery batch: {e}")
+        return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id, _, _, _ in fires]}
+    reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
+
+    failed_message_ids = set()
+    with ThreadPoolExecutor(max_workers=DELIVERY_CONCURRENCY) as executor:
+        device_tokens = {
+            device_id: executor.submit(get_device_token, device_id)
+            for device_id in dict.fromkeys(device_id for _, device_id, _, _ in fires)
+        }
+
+        def deliver(device_id, reminder_id, payload_reminder):
+            """Delivers one fire; returns (skip reason, schedule stopped) for a fire dropped as over."""
+            reminder = reminders.get((f"CUSTOMER#{device_id}", f"REMINDER#{reminder_id}"))
+            if payload_reminder is not None:
+                reason, finished_reminder = check_payload_fire(payload_reminder, reminder)
+                reminder = payload_reminder
+            else:
+                reason, finished_reminder = (get_skip_reason(reminder), reminder) if reminder is not None else (None, None)
+            if reason:
+                if finished_reminder is None:
+                    print(f"Dropping {reason} fire of reminder {reminder_id}")
+                    return reason, False
+                return reason, skip_fire(finished_reminder, reason)
+            device_token_id = device_tokens[device_id].result()
+            if reminder is None or device_token_id is None:
+                print(f"Dropping fire of reminder {reminder_id}: {'reminder' if reminder is None else 'device'} not found")
+                return None
+            deliver_notification(reminders_table, reminder, device_token_id, redeliver_retryable=True, deadline=deadline)
+            return None
+
+        deliveries = {
+            message_id: executor.submit(deliver, device_id, reminder_id, payload_reminder)
+            for message_id, device_id, reminder_id, payload_reminder in fires
+        }
+        skipped = {}
+        for message_id, future in deliveries.items():
+            try:
+                outcome = future.result()
+                if outcome:
+                    reason, stopped = outcome
+                    skipped_count, stopped_count = skipped.get(reason, (0, 0))
+                    skipped[reason] = (skipped_count + 1, stopped_count + int(stopped))
+            except Exception as e:
+                print(f"Error delivering message {message_id}: {e}")
+                failed_message_ids.add(message_id)
+
+    for reason, (skipped_count, stopped_count) in skipped.items():
+        emit_skipped_fires_metric(reason, skipped_count, stopped_count)
+    print(f"Delivery batch: {len(records)} messages, {len(fires)} fires, "
+          f"{sum(count for count, _ in skipped.values())} skipped, {len(failed_message_ids)} failed")
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in sorted(failed_message_ids)]}
 
 
 def handler(event, context):
+    # Fires buffered in the delivery queue arrive in batches; schedules invoking directly send one fire
+    if "Records" in event:
+        return process_delivery_batch(event["Records"], get_send_deadline(context))
+
     try:
         # Parse event data to get the device_id and reminder_id
         device_id = event.get("device_id")
@@ -110,18 +600,30 @@ def handler(event, context):
                 },
             }
 
-        # Query CustomerDevices to get device info
-        customer_devices_table = dynamodb.Table(CUSTOMER_DEVICES_TABLE_NAME)
-        response = customer_devices_table.query(
-            IndexName="DeviceIdIndex",
-            KeyConditionExpression=boto3.dynamodb.conditions.Key("device_id").eq(device_id)
-        )
+        reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
+        # Instant on a cached token; otherwise the DeviceIdIndex query runs alongside the reminder read
+        device_lookup = lookup_executor.submit(get_device_token, device_id)
+        # A current delivery payload carries everything the notification needs, but is only sent
+        # while the item is still at its reminder_version
+        reminder = get_payload_reminder(event)
+        if reminder is not None:
+            skip_reason, finished_reminder = check_payload_fire(reminder, read_fire_check(reminders_table, reminder))
+        else:
+            # Query RemindersTable to get the task content and message
+            reminder_response = reminders_table.get_item(
+                Key={
+                    "PK": f"CUSTOMER#{device_id}",
+                    "SK": f"REMINDER#{reminder_id}"
+                }
+            )
+            reminder = reminder_response.get("Item")
+            skip_reason, finished_reminder = (get_skip_reason(reminder), reminder) if reminder is not None else (None, None)
 
-        if not response.get("Items"):
-            print("device id not found")
+        if reminder is None:
+            print("no reminder found.")
             return {
                 "statusCode": 404,
-                "body": json.dumps({"error": "Device not found"}),
+                "body": json.dumps({"error": "Reminder not found"}),
                 "headers": {
                     "Access-Control-Allow-Origin": "*",  # or specify your domain
                     "Access-Control-Allow-Headers": "Content-Type",
@@ -129,23 +631,35 @@ def handler(event, context):
                 },
             }
 
-        device_info = response["Items"][0]
-        device_token_id = device_info.get("device_token_id")
-
-        # Query RemindersTable to get the task content and message
-        reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
-        reminder_response = reminders_table.get_item(
-            Key={
-                "PK": f"CUSTOMER#{device_id}",
-                "SK": f"REMINDER#{reminder_id}"
+        # Completed and expired reminders are not sent, and their rule or schedule is stopped;
+        # fires of deleted or since-edited reminders are only dropped
+        if skip_reason:
+            if finished_reminder:
+                schedule_stopped = skip_fire(finished_reminder, skip_reason)
+            else:
+                print(f"Dropping {skip_reason} fire of reminder {reminder_id}")
+                schedule_stopped = False
+            emit_skipped_fires_metric(skip_reason, 1, int(schedule_stopped))
+            return {
+                "statusCode": 200,
+                "body": json.dumps({
+                    "message": "Reminder fire skipped",
+                    "reason": skip_reason,
+                    "schedule_stopped": schedule_stopped
+                }),
+                "headers": {
+                    "Access-Control-Allow-Origin": "*",  # or specify your domain
+                    "Access-Control-Allow-Headers": "Content-Type",
+                    "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
+                },
             }
-        )
 
-        if "Item" not in reminder_response:
-            print("no reminder found.")
+        device_token_id = device_lookup.result()
+        if not device_token_id:
+            print("device id not found")
             return {
                 "statusCode": 404,
-                "body": json.dumps({"error": "Reminder not found"}),
+                "body": json.dumps({"error": "Device not found"}),
                 "headers": {
                     "Access-Control-Allow-Origin": "*",  # or specify your domain
                     "Access-Control-Allow-Headers": "Content-Type",
@@ -153,15 +667,10 @@ def handler(event, context):
                 },
             }
 
-        reminder = reminder_response["Item"]
-        task = reminder.get("task", "No task specified")
-        reminder_message = f"This is a reminder to - {task}"
-
-        # Send push notification with task content
-        notification_response = send_push_notification(device_token_id, task, reminder_message)
-
-        # Log the notification response
-        print(f"Push notification response: {notification_response}")
+        # Retries stop in time for the response, well inside the Lambda timeout
+        notification_response = deliver_notification(
+            reminders_table, reminder, device_token_id, deadline=get_send_deadline(context)
+        )
 
         return {
             "statusCode": 200,
@@ -0,0 +1,257 @@
+# Shared by several Lambda assets, which are packaged separately: keep every copy of this file
+# identical (tests/unit/test_schedule_expressions.py checks this).
+import os
+import json
+import zlib
+from datetime import datetime, timezone
+from eventbridge_schedule import compile_expression
+
+# EventBridge Scheduler evaluates at() expressions in this timezone; cron() and rate() run in UTC
+AT_EXPRESSION_TIMEZONE = "Asia/Kolkata"
+
+# "eventbridge" creates one rule/schedule per reminder; "queue" does too, but they send to the
+# delivery queue that process_events drains in batches; "dispatcher" stores next_fire_at on the
+# item and leaves delivery to the dispatch_due_reminders sweeper
+SCHEDULING_MODE = os.getenv("SCHEDULING_MODE", "eventbridge").lower()
+# Width of a DueIndex time bucket and the number of shards each bucket is split over.
+# Writers and the sweeper must agree on both.
+DISPATCH_BUCKET_SECONDS = int(os.getenv("DISPATCH_BUCKET_SECONDS", "3600"))
+DISPATCH_SHARDS = int(os.getenv("DISPATCH_SHARDS", "8"))
+# Layout of the delivery payload schedules send to process_events (see get_delivery_input).
+# Bump it when the layout changes: process_events reads the reminder for any other version.
+DELIVERY_PAYLOAD_VERSION = 1
+# Scheduler and EventBridge targets take at most 8192 characters of Input
+DELIVERY_INPUT_MAX_CHARS = 8192
+
+
+def parse_eventbridge_expression(expression, occurrences=3, start_time=None):
+    """Parses EventBridge expressions to generate the next run times."""
+    schedule = compile_expression(expression)
+    if expression.startswith("at("):
+        return [schedule.fire_at]
+    return schedule.next_n(start_time or datetime.now(), occurrences)
+
+def get_next_rate_occurrences(expression, occurrences, start_time=None):
+    if not expression.startswith("rate("):
+        raise ValueError("Invalid rate expression format")
+    # Start from specified start_time or current time
+    return compile_expression(expression).next_n(start_time or datetime.now(), occurrences)
+
+def get_next_cron_occurrences(expression, occurrences, start_time=None):
+    if not expression.startswith("cron("):
+        raise ValueError("Invalid cron expression format")
+    # Use provided start_time or default to the current time
+    return compile_expression(expression).next_n(start_time or datetime.now(), occurrences)
+
+
+def parse_at_expression(expression):
+    if not expression.startswith("at("):
+        raise ValueError("Invalid at expression format")
+    return compile_expression(expression).fire_at
+
+
+def parse_stored_date(date_str):
+    """Parses a stored start_date/end_date (dd-mm-yyyy or yyyy-mm-dd); returns None if there is none."""
+    if not date_str or date_str == "None":
+        return None
+    for date_format in ("%d-%m-%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(date_str, date_format).date()
+        except ValueError:
+            pass
+    return None
+
+
+def parse_time_of_day(time_str):
+    """Parses a stored time ('06:00 PM', '6 p.m.', '18:00'); returns None if it cannot."""
+    if not time_str:
+        return None
+    sanitized_time = time_str.strip().replace(".", "").upper()
+    for time_format in ("%I:%M %p", "%I %p", "%H:%M"):
+        try:
+            return datetime.strptime(sanitized_time, time_format).time()
+        except ValueError:
+            pass
+    return None
+
+
+def get_schedule_fields(start_date, time_str, end_date=None, timezone_name=AT_EXPRESSION_TIMEZONE):
+    """
+    Machine-readable schedule attributes written on reminder items, so readers never parse dates.
+
+    Args:
+        start_date (str): Local start date (dd-mm-yyyy or yyyy-mm-dd).
+        time_str (str): Local time of day (e.g., '06:00 PM').
+        end_date (str): Last local day of the reminder, if any.
+        timezone_name (str): Timezone the date and time are expressed in.
+
+    Returns:
+        dict: 'timezone', plus 'minutes_of_day', 'start_at' (epoch seconds) and 'end_at' (epoch
+            seconds at the end of the last day) for the inputs that could be parsed.
+    """
+    import pytz
+    local_timezone = pytz.timezone(timezone_name)
+    fields = {"timezone": timezone_name}
+
+    time_of_day = parse_time_of_day(time_str)
+    if time_of_day is not None:
+        fields["minutes_of_day"] = time_of_day.hour * 60 + time_of_day.minute
+        start = parse_stored_date(start_date)
+        if start is not None:
+            fields["start_at"] = int(local_timezone.localize(datetime.combine(start, time_of_day)).timestamp())
+
+    end = parse_stored_date(end_date)
+    if end is not None:
+        fields["end_at"] = int(local_timezone.localize(datetime.combine(end, datetime.max.time())).timestamp())
+    return fields
+
+
+def get_occurrence_fields(expression, start_at=None, now_epoch=None, timezone_name=AT_EXPRESSION_TIMEZONE, occurrences=3):
+    """
+    The next_occurrences shown by get-reminder-list, materialized so listing does not evaluate
+    schedules.
+
+    Args:
+        expression (str): EventBridge expression (cron/rate in UTC, at() in local time).
+        start_at (int): Epoch seconds of the reminder's first fire; occurrences start after it.
+        now_epoch (int): Current epoch seconds; defaults to the system clock.
+        timezone_name (str): Timezone recurring occurrences are rendered in.
+
+    Returns:
+        dict: 'next_occurrences' as ISO strings and, for recurring schedules,
+            'next_occurrences_expire_at': the epoch second of the first one, after which the
+            list is stale. {} if the expression cannot be parsed.
+    """
+    if now_epoch is None:
+        now_epoch = int(datetime.now(timezone.utc).timestamp())
+    start_time = datetime.fromtimestamp(int(max(start_at or 0, now_epoch)), timezone.utc).replace(tzinfo=None)
+    try:
+        next_occurrences = parse_eventbridge_expression(expression, occurrences=occurrences, start_time=start_time)
+    except ValueError as e:
+        print(f"Error parsing EventBridge expression {expression}: {e}")
+        return {}
+
+    if expression.startswith("at(") or not next_occurrences:
+        # A one-time reminder's only occurrence never changes, so it never goes stale; nor does
+        # the empty list of a cron() whose year range has passed
+        return {"next_occurrences": [occ.isoformat() for occ in next_occurrences]}
+
+    import pytz
+    local_timezone = pytz.timezone(timezone_name)
+    return {
+        "next_occurrences": [pytz.utc.localize(occ).astimezone(local_timezone).isoformat() for occ in next_occurrences],
+        "next_occurrences_expire_at": int(next_occurrences[0].replace(tzinfo=timezone.utc).timestamp()),
+    }
+
+
+def get_next_fire_time(expression, after, end_date=None):
+    """
+    Returns the next time a schedule fires strictly after `after`.
+
+    Args:
+        expression (str): EventBridge expression (cron/rate in UTC, at() in Asia/Kolkata).
+        after (datetime): Naive UTC datetime.
+        end_date (date): Last local day on which the reminder may fire.
+
+    Returns:
+        datetime: Naive UTC datetime, or None if the schedule will not fire again.
+    """
+    import pytz
+    local_timezone = pytz.timezone(AT_EXPRESSION_TIMEZONE)
+    if expression.startswith("at("):
+        fire_at = local_timezone.localize(parse_at_expression(expression)).astimezone(pytz.utc).replace(tzinfo=None)
+        if fire_at <= after:
+            return None
+    else:
+        fire_at = compile_expression(expression).next_after(after)
+        if fire_at is None:
+            return None
+
+    if end_date and pytz.utc.localize(fire_at).astimezone(local_timezone).date() > end_date:
+        return None
+    return fire_at
+
+
+def get_active_fields(device_id, expression, start_at=None, end_date=None, after=None):
+    """
+    Item attributes that put a reminder on the sparse ActiveRemindersIndex.
+
+    The index is keyed by active_device and ordered by active_fire_at: the next fire after
+    `after` (naive UTC, default now), or the last one once the schedule is over, so active
+    reminders stay listed until they are completed. Completing a reminder removes both.
+
+    Returns:
+        dict: {'active_device': str, 'active_fire_at': epoch seconds}.
+    """
+    after = after or datetime.now(timezone.utc).replace(tzinfo=None)
+    fire_at = get_next_fire_time(expression, after, parse_stored_date(end_date)) if expression else None
+    if fire_at is not None:
+        active_fire_at = int(fire_at.replace(tzinfo=timezone.utc).timestamp())
+    elif expression and expression.startswith("at("):
+        active_fire_at = int(get_next_fire_time(expression, datetime(1970, 1, 1)).replace(tzinfo=timezone.utc).timestamp())
+    else:
+        active_fire_at = int(start_at) if start_at is not None else int(after.replace(tzinfo=timezone.utc).timestamp())
+    return {"active_device": device_id, "active_fire_at": active_fire_at}
+
+
+def get_fire_bucket(fire_at, reminder_id):
+    """DueIndex partition for a fire time: '<bucket number>#<shard>'."""
+    bucket = int(fire_at.replace(tzinfo=timezone.utc).timestamp()) // DISPATCH_BUCKET_SECONDS
+    shard = zlib.crc32(reminder_id.encode("utf-8")) % DISPATCH_SHARDS
+    return f"{bucket}#{shard}"
+
+
+def get_dispatch_fields(expression, reminder_id, after, end_date=None):
+    """
+    Item attributes that put a reminder on the DueIndex for its next fire after `after`.
+
+    Returns:
+        dict: {'next_fire_at': epoch seconds, 'fire_bucket': str}, or {} if it will not fire again.
+    """
+    fire_at = get_next_fire_time(expression, after, parse_stored_date(end_date))
+    if fire_at is None:
+        return {}
+    return {
+        "next_fire_at": int(fire_at.replace(tzinfo=timezone.utc).timestamp()),
+        "fire_bucket": get_fire_bucket(fire_at, reminder_id),
+    }
+
+
+def render_reminder_message(task):
+    """The notification text for a reminder's task."""
+    return f"This is a reminder to - {task}"
+
+
+def get_delivery_input(reminder_item):
+    """
+    Target Input for a reminder's schedule: its ids plus the payload process_events needs to
+    notify and move the schedule on without reading the reminder or its device.
+
+    payload_version is the layout of this payload and reminder_version the revision of the
+    item it was built from. An Input that would not fit the target limit carries the ids only,
+    and process_events reads the reminder as it does for schedules created before payloads.
+
+    Returns:
+        str: JSON Input for the schedule target.
+    """
+    device_id = reminder_item["PK"].split("#", 1)[1]
+    reminder_id = reminder_item["SK"].split("#", 1)[1]
+    task = reminder_item.get("task", "No task specified")
+    payload = {
+        "device_id": device_id,
+        "reminder_id": reminder_id,
+        "payload_version": DELIVERY_PAYLOAD_VERSION,
+        "reminder_version": int(reminder_item.get("reminder_version", 1)),
+        "task": task,
+        "message": render_reminder_message(task),
+        "eventbridge_expression": reminder_item["eventbridge_expression"],
+        "timezone": reminder_item.get("timezone", AT_EXPRESSION_TIMEZONE),
+    }
+    if reminder_item.get("start_at") is not None:
+        payload["start_at"] = int(reminder_item["start_at"])
+    if reminder_item.get("end_date"):
+        payload["end_date"] = reminder_item["end_date"]
+    target_input = json.dumps(payload)
+    if len(target_input) > DELIVERY_INPUT_MAX_CHARS:
+        return json.dumps({"device_id": device_id, "reminder_id": reminder_id})
+    return target_input
@@ -0,0 +1,158 @@
+import heapq
+import itertools
+
+
+class TimerTask:
+    """A pending expiry. key identifies it for cancellation; payload is handed back when it expires."""
+
+    __slots__ = ("key", "expires_at", "payload", "bucket")
+
+    def __init__(self, key, expires_at, payload):
+        self.key = key
+        self.expires_at = expires_at
+        self.payload = payload
+        self.bucket = None
+
+
+class _Bucket:
+    __slots__ = ("expiration", "tasks")
+
+    def __init__(self):
+        self.expiration = -1
+        self.tasks = {}
+
+
+class _Wheel:
+    """One level of the hierarchy: `size` buckets of `tick` seconds each."""
+
+    __slots__ = ("tick", "size", "interval", "current_time", "buckets", "overflow", "queue", "sequence")
+
+    def __init__(self, tick, size, start_time, queue, sequence):
+        self.tick = tick
+        self.size = size
+        self.interval = tick * size
+        self.current_time = start_time - start_time % tick
+        self.buckets = [_Bucket() for _ in range(size)]
+        self.overflow = None
+        self.queue = queue
+        self.sequence = sequence
+
+    def add(self, task):
+        """Places the task in this wheel or a coarser one; returns False if it has already expired."""
+        if task.expires_at < self.current_time + self.tick:
+            return False
+        if task.expires_at < self.current_time + self.interval:
+            virtual_id = task.expires_at // self.tick
+            bucket = self.buckets[virtual_id % self.size]
+            bucket.tasks[task.key] = task
+            task.bucket = bucket
+            bucket_expiration = virtual_id * self.tick
+            # Only a bucket that just became active is queued, so the heap holds at most one
+            # entry per bucket no matter how many tasks are pending
+            if bucket.expiration != bucket_expiration:
+                bucket.expiration = bucket_expiration
+                heapq.heappush(self.queue, (bucket_expiration, next(self.sequence), bucket))
+            return True
+        if self.overflow is None:
+            self.overflow = _Wheel(self.interval, self.size, self.current_time, self.queue, self.sequence)
+        return self.overflow.add(task)
+
+    def advance_clock(self, time):
+        if time >= self.current_time + self.tick:
+            self.current_time = time - time % self.tick
+            if self.overflow is not None:
+                self.overflow.advance_clock(self.current_time)
+
+
+class TimingWheel:
+    """
+    Hierarchical timing wheel (as in Varghese & Lauck, and Kafka's purgatory).
+
+    Insert and cancel are O(1). Coarser wheels are created only when a task lands beyond the
+    range of the finer ones, and each tick-aligned bucket is queued once, so memory is bounded
+    by the number of pending tasks plus wheel_size buckets per level. Time is in integer
+    seconds (e.g. epoch seconds) and only moves when advance_to() is called, which lets callers
+    drive it from a real or a simulated clock and fast-forward through empty stretches.
+    """
+
+    def __init__(self, start_time, tick_seconds=1, wheel_size=64):
+        self._queue = []
+        self._tasks = {}
+        self._expired = []
+        self._wheel = _Wheel(tick_seconds, wheel_size, int(start_time), self._queue, itertools.count())
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, key):
+        return key in self._tasks
+
+    @property
+    def current_time(self):
+        return self._wheel.current_time
+
+    def schedule(self, key, expires_at, payload=None):
+        """Schedules (or reschedules) the task for key to expire at expires_at."""
+        self.cancel(key)
+        task = TimerTask(key, int(expires_at), payload)
+        self._tasks[key] = task
+        if not self._wheel.add(task):
+            self._expired.append(task)
+
+    def cancel(self, key):
+        """Cancels the pending task for key; returns False if there was none."""
+        task = self._tasks.pop(key, None)
+        if task is None:
+            return False
+        if task.bucket is not None:
+            task.bucket.tasks.pop(key, None)
+            task.bucket = None
+        return True
+
+    def next_expiration(self):
+        """Earliest bucket expiration still queued, or None when nothing is pending."""
+        if self._expired:
+            return self.current_time
+        while self._queue and self._queue[0][2].expiration != self._queue[0][0]:
+            heapq.heappop(self._queue)
+        return self._queue[0][0] if self._queue else None
+
+    def advance_to(self, time, on_expire):
+        """
+        Moves the wheel to `time`, calling on_expire(task) for every task due by then in expiry
+        order (to tick resolution). on_expire may schedule new tasks.
+
+        Returns:
+            int: Number of tasks that expired.
+        """
+        time = int(time)
+        expired_count = self._fire_expired(on_expire)
+        while self._queue and self._queue[0][0] <= time:
+            bucket_expiration, _, bucket = heapq.heappop(self._queue)
+            if bucket.expiration != bucket_expiration:
+                continue  # Stale entry: the bucket was flushed and reused since
+            self._wheel.advance_clock(bucket_expiration)
+            tasks = bucket.tasks
+            bucket.tasks = {}
+            bucket.expiration = -1
+            # Tasks from coarser wheels cascade into finer ones; the rest have expired
+            for task in tasks.values():
+                task.bucket = None
+                if not self._wheel.add(task):
+                    self._expired.append(task)
+            expired_count += self._fire_expired(on_expire)
+        self._wheel.advance_clock(time)
+        return expired_count + self._fire_expired(on_expire)
+
+    def _fire_expired(self, on_expire):
+        fired = 0
+        while self._expired:
+            expired, self._expired = self._expired, []
+            for task in sorted(expired, key=lambda expired_task: expired_task.expires_at):
+                # Skip tasks cancelled or rescheduled by an earlier callback in this batch
+                if self._tasks.get(task.key) is not task:
+                    continue
+                del self._tasks[task.key]
+                on_expire(task)
+                fired += 1
+        return fired
@@ -0,0 +1,190 @@
+import re
+import calendar
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+weekday_indexes = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6,
+    "mon": 0, "tue": 1, "tues": 1, "wed": 2, "thu": 3, "thur": 3, "thurs": 3,
+    "fri": 4, "sat": 5, "sun": 6,
+}
+
+number_words = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+
+# Same mapping the LLM prompt uses for vague times of day
+time_of_day_map = {
+    "morning": "08:00 AM",
+    "afternoon": "02:00 PM",
+    "evening": "06:00 PM",
+    "night": "09:00 PM",
+    "tonight": "09:00 PM",
+    "noon": "12:00 PM",
+    "midday": "12:00 PM",
+    "midnight": "12:00 AM",
+}
+
+# Phrases that resolve to today plus a fixed number of days
+fixed_day_offsets = {
+    "today": 0, "now": 0, "tonight": 0, "this morning": 0, "this afternoon": 0, "this evening": 0,
+    "tomorrow": 1, "tomorrow morning": 1, "tomorrow evening": 1, "tomorrow night": 1,
+    "day after tomorrow": 2, "the day after tomorrow": 2,
+    "next week": 7,
+}
+
+_weekday = "|".join(weekday_indexes)
+_number = r"\d+|" + "|".join(number_words)
+
+_weekday_pattern = re.compile(r"^(?:(?P<modifier>on|this|next|coming|upcoming)\s+)?(?P<day>" + _weekday + r")$")
+_relative_pattern = re.compile(
+    r"^(?:in\s+(?P<n>" + _number + r")\s+(?P<unit>day|week|month)s?(?:\s+time)?"
+    r"|(?P<n_later>" + _number + r")\s+(?P<unit_later>day|week|month)s?\s+(?:later|from\s+now)"
+    r"|after\s+(?P<n_after>" + _number + r")\s+(?P<unit_after>day|week|month)s?)$"
+)
+_next_month_pattern = re.compile(r"^next\s+month$")
+_dmy_pattern = re.compile(r"^(?P<day>\d{1,2})[-/.](?P<month>\d{1,2})[-/.](?P<year>\d{4})$")
+_ymd_pattern = re.compile(r"^(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})$")
+
+_time_12h_pattern = re.compile(r"^(?:at\s+)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridiem>am|pm)$")
+_time_24h_pattern = re.compile(r"^(?:at\s+)?(?P<hour>[01]?\d|2[0-3]):(?P<minute>[0-5]\d)(?::[0-5]\d)?$")
+_time_of_day_pattern = re.compile(r"^(?:(?:in|at)\s+(?:the\s+)?)?(?P<period>" + "|".join(time_of_day_map) + r")$")
+
+
+def _normalize(phrase):
+    phrase = phrase.strip().lower().replace(".", "")
+    return " ".join(phrase.replace(",", " ").split())
+
+
+def _to_int(value):
+    return int(value) if value.isdigit() else number_words[value]
+
+
+def _add_months(day, months):
+    month_index = day.month - 1 + months
+    year = day.year + month_index // 12
+    month = month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def _resolve_weekday(modifier, weekday, today):
+    if modifier == "next":
+        # The named day in the following Monday-based week (same as parsedatetime)
+        return today - timedelta(days=today.weekday()) + timedelta(days=7 + weekday)
+    days_ahead = (weekday - today.weekday()) % 7
+    if modifier == "this" and days_ahead == 0:
+        return today
+    # Bare weekday names refer to the next occurrence after today (dateparser with PREFER_DATES_FROM=future)
+    return today + timedelta(days=days_ahead or 7)
+
+
+@lru_cache(maxsize=1024)
+def _resolve_known_date(phrase, today):
+    if phrase in fixed_day_offsets:
+        return today + timedelta(days=fixed_day_offsets[phrase])
+
+    match = _weekday_pattern.match(phrase)
+    if match:
+        return _resolve_weekday(match.group("modifier"), weekday_indexes[match.group("day")], today)
+
+    match = _relative_pattern.match(phrase)
+    if match:
+        n = _to_int(match.group("n") or match.group("n_later") or match.group("n_after"))
+        unit = match.group("unit") or match.group("unit_later") or match.group("unit_after")
+        if unit == "day":
+            return today + timedelta(days=n)
+        if unit == "week":
+            return today + timedelta(weeks=n)
+        return _add_months(today, n)
+
+    if _next_month_pattern.match(phrase):
+        return _add_months(today, 1)
+
+    match = _dmy_pattern.match(phrase) or _ymd_pattern.match(phrase)
+    if match:
+        try:
+            return date(int(match.group("year")), int(match.group("month")), int(match.group("day")))
+        except ValueError:
+            return None
+    return None
+
+
+def resolve_date_phrase(phrase, now=None):
+    """
+    Resolves a relative date phrase (e.g., 'tomorrow', 'next friday', 'in 3 days') to a date.
+
+    The phrases the LLM and rule-based parser actually produce are answered from compiled
+    patterns; anything else falls through to dateparser and then parsedatetime, exactly as
+    before. If nothing understands the phrase, today's date is returned.
+
+    Args:
+        phrase (str): Relative or absolute date phrase.
+        now (datetime): Reference point (defaults to datetime.now()).
+
+    Returns:
+        date: The resolved date.
+    """
+    now = now or datetime.now()
+    normalized = _normalize(phrase or "today")
+    resolved = _resolve_known_date(normalized, now.date())
+    if resolved is not None:
+        return resolved
+
+    import dateparser
+    start_date = dateparser.parse(
+        phrase,
+        settings={'PREFER_DATES_FROM': 'future', 'RELATIVE_BASE': now}
+    )
+    if start_date:
+        return start_date.date()
+
+    import parsedatetime
+    # Fallback to parsedatetime if dateparser fails
+    cal = parsedatetime.Calendar()
+    time_struct, parse_status = cal.parse(phrase, now)
+    return datetime(*time_struct[:6]).date() if parse_status == 1 else now.date()
+
+
+@lru_cache(maxsize=1024)
+def _resolve_known_time(phrase):
+    match = _time_12h_pattern.match(phrase)
+    if match:
+        hour = int(match.group("hour"))
+        minute = int(match.group("minute") or 0)
+        if 1 <= hour <= 12 and minute <= 59:
+            return f"{hour:02d}:{minute:02d} {match.group('meridiem').upper()}"
+        return None
+
+    match = _time_24h_pattern.match(phrase)
+    if match:
+        hour = int(match.group("hour"))
+        meridiem = "AM" if hour < 12 else "PM"
+        return f"{hour % 12 or 12:02d}:{int(match.group('minute')):02d} {meridiem}"
+
+    match = _time_of_day_pattern.match(phrase)
+    if match:
+        return time_of_day_map[match.group("period")]
+    return None
+
+
+def resolve_time_phrase(time_str):
+    """
+    Normalizes a clock time to 'hh:mm AM/PM' (e.g., '5:38 p.m.' -> '05:38 PM', '18:00' -> '06:00 PM').
+
+    Unknown formats fall through to dateparser.
+
+    Args:
+        time_str (str): Time of day as written by the user or the LLM.
+
+    Returns:
+        str: Time in '%I:%M %p' format, or None if it cannot be understood.
+    """
+    resolved = _resolve_known_time(_normalize(time_str))
+    if resolved is not None:
+        return resolved
+
+    import dateparser
+    parsed_time = dateparser.parse(time_str)
+    return parsed_time.strftime('%I:%M %p') if parsed_time else None
@@ -1,17 +1,20 @@
 import os
+import json
+import time
 import pytz
-import dateparser
-import parsedatetime
 from datetime import datetime
-from dotenv import load_dotenv
-from pydantic import BaseModel, Field
-from typing import Optional, List
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+import rule_based_parser
+from parse_cache import ParseCache
+from date_resolver import resolve_date_phrase
+import llm_invoker
 
-# Load environment variables from .env
-load_dotenv()
+# "on" to skip the LLM for recognised phrasings, "shadow" to only compare, "off" to always use the LLM
+FAST_PARSER_MODE = os.getenv("FAST_PARSER_MODE", "on").lower()
+FAST_PARSER_MIN_CONFIDENCE = float(os.getenv("FAST_PARSER_MIN_CONFIDENCE", "0.9"))
+
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-3.5-turbo")
+# Cheaper, faster model used when the primary model cannot answer within the request budget
+LLM_FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "gpt-4o-mini")
 
 def sanitize_time_format(time_str):
     """
@@ -38,25 +41,6 @@ def get_ordinal_suffix(day):
     else:
         return f"{day}th"
 
-# Define the data structure for repeat frequency
-class RepeatFrequency(BaseModel):
-    daily: Optional[int] = None
-    weekly: Optional[int] = None
-    monthly: Optional[int] = None
-    yearly: Optional[int] = None
-    hourly: Optional[int] = None
-    selected_days_of_week: Optional[List[int]] = None
-    selected_days_of_month: Optional[List[int]] = None
-
-class Reminder(BaseModel):
-    task: str = Field(description="The action or task to be reminded of.")
-    start_date_phrase: str = Field(description="The relative date phrase indicating when the reminder should start (e.g., today, tomorrow, next week).")
-    end_date: Optional[str] = Field(description="The end date of the reminder in dd-mm-yyyy format.")
-    time: Optional[str] = Field(default="11:00 AM", description="The specific time of day for the reminder.")
-    repeat_frequency: RepeatFrequency = Field(default_factory=RepeatFrequency, description="Repeat frequency settings.")
-    tags: List[str] = Field(default_factory=list, description="Tags associated with the reminder for easy categorization.")
-
-
 day_of_week_map = {
     1: "Sunday",
     2: "Monday",
@@ -70,58 +54,130 @@ day_of_week_map = {
 day_of_week_mapping_string = ", ".join([f"{key}: {value}" for key, value in day_of_week_map.items()])
 
 
-def get_reminder_schedule_json(reminder_text: str):
-    """ Returns the reminder json with schedule details
+REMINDER_PARSING_INSTRUCTIONS = (
+    "You are a highly intelligent assistant that parses reminder requests with dates, times, and repeat frequencies "
+    "in various formats. Follow these instructions carefully to extract details without introducing additional fields.\n\n"
+    
+    "Instructions:\n"
+    "1. **Interpretation of Dates and Times**:\n"
+    "   - Provide a relative date phrase for 'start_date_phrase' "
+    "     that describes when the reminder should start (e.g., 'tomorrow,' 'next week').\n"
+    "   - Understand whether the reminder is for a specific day/week or it repeats recurringly.\n"
+    "   - Extract the time at which the reminder is needed; if no specific time is provided, default to 11:00 AM.\n"
+    "   - For ambiguous or relative time-of-day phrases like:\n"
+    "     - 'morning,' map to 8:00 AM.\n"
+    "     - 'afternoon,' map to 2:00 PM.\n"
+    "     - 'evening,' map to 6:00 PM.\n"
+    "     - 'night,' map to 9:00 PM.\n"
+    "   - Translate phrases like 'alternate days,' 'weekdays,' or 'weekends' into structured formats.\n\n"
+    
+    "2. **Day of the Week Mapping**:\n"
+    "   - Use the following mapping for days of the week when interpreting selected days:\n"
+    "     {day_of_week_mapping_string}\n"
+    "   - For example, 'Sunday' maps to 1, 'Wednesday' maps to 4, and so on.\n\n"
+    
+    "3. Populate 'repeat_frequency' directly with integer values if provided, for fields like 'daily', 'weekly', etc.\n"
+    "   - Do not introduce new keys such as 'interval'. Instead, set 'daily': 2 for 'every 2 days'.\n\n"
+    
+    "4. For specific days, use 'selected_days_of_week' as a list of integers (e.g., [1, 4] for Sunday and Wednesday), "
+    "   and 'selected_days_of_month' as a list of integers for days of the month (e.g., [1, 15]).\n\n"
+    
+    "5. **Tags Extraction**:\n"
+    "   - Identify single or double-word tags from the reminder that represent the main topics or categories.\n\n"
+    
+    "Output the information in structured JSON with fields: task, start_date, end_date, time, repeat_frequency, and tags.\n\n"
+)
+
+REMINDER_PROMPT_TEMPLATE = (
+    REMINDER_PARSING_INSTRUCTIONS +
+    "{format_instructions}\n\n"
+    
+    "Reminder Text: {query}"
+)
+
+BATCH_REMINDER_PROMPT_TEMPLATE = (
+    REMINDER_PARSING_INSTRUCTIONS +
+    "You will be given {count} numbered reminder texts. Parse each one independently and return them in the "
+    "'reminders' list in the same order, with exactly one entry per numbered text.\n\n"
+    
+    "{format_instructions}\n\n"
+    
+    "Reminder Texts:\n{queries}"
+)
+
+# Shared HTTP client so warm invocations reuse the pooled keep-alive connection
+# to the OpenAI API instead of paying a fresh TCP + TLS handshake per request.
+# Created on first LLM use, like the chains, so rule and cache hits never import httpx.
+_openai_http_client = None
+
+_reminder_chains = {}
+_batch_reminder_chains = {}
+
+# Lives for the lifetime of the container so warm invocations share the LRU tier
+parse_cache = ParseCache()
+
+
+class ReminderNeedsConfirmation(Exception):
+    """
+    Raised instead of returning a best-effort rule-based parse ("rules_fallback"), which must
+    not be scheduled without the user confirming it.
+
+    Attributes:
+        parsed_data (dict): The resolved best-effort parse, for the client to show and confirm.
+    """
+
+    def __init__(self, parsed_data):
+        super().__init__("The reminder text could only be parsed on a best-effort basis")
+        self.parsed_data = parsed_data
+
+
+def _get_openai_http_client():
+    global _openai_http_client
+    if _openai_http_client is None:
+        import httpx
+        _openai_http_client = httpx.Client(
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10, keepalive_expiry=300),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+    return _openai_http_client
+
+
+def _build_model(model_name):
+    from langchain_openai import ChatOpenAI
+
+    # Retries are driven by llm_invoker so they can never run past the request deadline
+    return ChatOpenAI(
+        temperature=0,
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        model=model_name,
+        http_client=_get_openai_http_client(),
+        timeout=llm_invoker.LLM_ATTEMPT_TIMEOUT_SECONDS,
+        max_retries=0,
+    )
+
+
+def build_reminder_chain(model_name=LLM_MODEL):
+    """
+    Builds the prompt | model | parser chain used to parse reminder text.
 
     Args:
-        reminder_text (str): Natural language text from which reminder details need to be extracted.
+        model_name (str): OpenAI chat model to use.
 
     Returns:
-        dict: Details of the processed reminder which contains reminder frequency and other reminder details.
+        RunnableSequence: Chain that takes {"query": text} and returns the parsed reminder dict.
     """
+    # langchain is only imported on the first LLM call, not during container init
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_core.prompts import PromptTemplate
+    from reminder_models import Reminder
+
     # Set up the OpenAI model
-    model = ChatOpenAI(temperature=0, openai_api_key=os.getenv("OPENAI_API_KEY"), model="gpt-3.5-turbo")
+    model = _build_model(model_name)
     # Set up the JSON output parser with the Reminder model
     parser = JsonOutputParser(pydantic_object=Reminder)
     # Define the prompt template with enhanced instructions
     prompt = PromptTemplate(
-        template=(
-            "You are a highly intelligent assistant that parses reminder requests with dates, times, and repeat frequencies "
-            "in various formats. Follow these instructions carefully to extract details without introducing additional fields.\n\n"
-            
-            "Instructions:\n"
-            "1. **Interpretation of Dates and Times**:\n"
-            "   - Provide a relative date phrase for 'start_date_phrase' "
-            "     that describes when the reminder should start (e.g., 'tomorrow,' 'next week').\n"
-            "   - Understand whether the reminder is for a specific day/week or it repeats recurringly.\n"
-            "   - Extract the time at which the reminder is needed; if no specific time is provided, default to 11:00 AM.\n"
-            "   - For ambiguous or relative time-of-day phrases like:\n"
-            "     - 'morning,' map to 8:00 AM.\n"
-            "     - 'afternoon,' map to 2:00 PM.\n"
-            "     - 'evening,' map to 6:00 PM.\n"
-            "     - 'night,' map to 9:00 PM.\n"
-            "   - Translate phrases like 'alternate days,' 'weekdays,' or 'weekends' into structured formats.\n\n"
-            
-            "2. **Day of the Week Mapping**:\n"
-            "   - Use the following mapping for days of the week when interpreting selected days:\n"
-            "     {day_of_week_mapping_string}\n"
-            "   - For example, 'Sunday' maps to 1, 'Wednesday' maps to 4, and so on.\n\n"
-            
-            "3. Populate 'repeat_frequency' directly with integer values if provided, for fields like 'daily', 'weekly', etc.\n"
-            "   - Do not introduce new keys such as 'interval'. Instead, set 'daily': 2 for 'every 2 days'.\n\n"
-            
-            "4. For specific days, use 'selected_days_of_week' as a list of integers (e.g., [1, 4] for Sunday and Wednesday), "
-            "   and 'selected_days_of_month' as a list of integers for days of the month (e.g., [1, 15]).\n\n"
-            
-            "5. **Tags Extraction**:\n"
-            "   - Identify single or double-word tags from the reminder that represent the main topics or categories.\n\n"
-            
-            "Output the information in structured JSON with fields: task, start_date, end_date, time, repeat_frequency, and tags.\n\n"
-            
-            "{format_instructions}\n\n"
-            
-            "Reminder Text: {query}"
-        ),
+        template=REMINDER_PROMPT_TEMPLATE,
         input_variables=["query"],
         partial_variables={
             "format_instructions": parser.get_format_instructions(),
@@ -129,23 +185,296 @@ def get_reminder_schedule_json(reminder_text: str):
         },
     )
     # Create a chain that combines the prompt, model, and parser
-    chain = prompt | model | parser
+    return prompt | model | parser
+
+
+def get_reminder_chain(model_name=LLM_MODEL):
+    """Returns the reminder parsing chain for a model, building it once per container."""
+    if model_name not in _reminder_chains:
+        _reminder_chains[model_name] = build_reminder_chain(model_name)
+    return _reminder_chains[model_name]
+
+
+def build_batch_reminder_chain(model_name=LLM_MODEL):
+    """
+    Builds the chain that parses several reminder texts in a single LLM round-trip.
+
+    Args:
+        model_name (str): OpenAI chat model to use.
+
+    Returns:
+        RunnableSequence: Chain that takes {"queries": numbered_texts, "count": n} and returns {"reminders": [...]}.
+    """
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_core.prompts import PromptTemplate
+    from reminder_models import ReminderBatch
+
+    model = _build_model(model_name)
+    parser = JsonOutputParser(pydantic_object=ReminderBatch)
+    prompt = PromptTemplate(
+        template=BATCH_REMINDER_PROMPT_TEMPLATE,
+        input_variables=["queries", "count"],
+        partial_variables={
+            "format_instructions": parser.get_format_instructions(),
+            "day_of_week_mapping_string": day_of_week_mapping_string,
+        },
+    )
+    return prompt | model | parser
+
+
+def get_batch_reminder_chain(model_name=LLM_MODEL):
+    """Returns the batch parsing chain for a model, building it once per container."""
+    if model_name not in _batch_reminder_chains:
+        _batch_reminder_chains[model_name] = build_batch_reminder_chain(model_name)
+    return _batch_reminder_chains[model_name]
+
+
+def invoke_reminder_chain(reminder_text: str, deadline=None):
+    """
+    Parses reminder text with the LLM chain within a time budget.
+
+    The primary model is called with a per-attempt timeout and a hedged duplicate request;
+    if it cannot answer in time the cheaper LLM_FALLBACK_MODEL gets the remaining budget.
+
+    Args:
+        reminder_text (str): Natural language text from which reminder details need to be extracted.
+        deadline (llm_invoker.Deadline): Time by which an answer is needed.
+
+    Returns:
+        dict: Raw chain output (task, start_date_phrase, end_date, time, repeat_frequency, tags).
+
+    Raises:
+        llm_invoker.LLMDeadlineExceeded: If no model answered before the deadline.
+    """
+    deadline = deadline or llm_invoker.Deadline(llm_invoker.LLM_DEFAULT_BUDGET_SECONDS)
+    setup_started_at = time.perf_counter()
+    chain = get_reminder_chain()
+    fallback_chain = get_reminder_chain(LLM_FALLBACK_MODEL) if LLM_FALLBACK_MODEL else None
+    llm_started_at = time.perf_counter()
     # Pass the reminder text to the chain for processing
-    parsed_data = chain.invoke({"query": reminder_text})
-    # Extract the start date phrase and time from parsed data
-    start_date_phrase = parsed_data.get('start_date_phrase') or "today"
-    # Process start_date using dateparser
-    start_date = dateparser.parse(
-        start_date_phrase,
-        settings={'PREFER_DATES_FROM': 'future', 'RELATIVE_BASE': datetime.now()}
+    inputs = {"query": reminder_text}
+    parsed_data, model_used = llm_invoker.invoke_within_deadline(
+        lambda: chain.invoke(inputs),
+        (lambda: fallback_chain.invoke(inputs)) if fallback_chain else None,
+        deadline
+    )
+    finished_at = time.perf_counter()
+    print(
+        f"Reminder chain timings (ms): model={model_used} "
+        f"setup={(llm_started_at - setup_started_at) * 1000:.1f} "
+        f"llm={(finished_at - llm_started_at) * 1000:.1f}"
+    )
+    return parsed_data
+
+
+def invoke_batch_reminder_chain(reminder_texts, deadline=None):
+    """
+    Parses several reminder texts with one LLM call, within a time budget.
+
+    Args:
+        reminder_texts (list): Natural language reminder texts.
+        deadline (llm_invoker.Deadline): Time by which an answer is needed.
+
+    Returns:
+        list: Raw chain output for each text, in input order.
+
+    Raises:
+        llm_invoker.LLMDeadlineExceeded: If no model returned exactly one reminder per text in time.
+    """
+    deadline = deadline or llm_invoker.Deadline(llm_invoker.LLM_DEFAULT_BUDGET_SECONDS)
+    setup_started_at = time.perf_counter()
+    chain = get_batch_reminder_chain()
+    fallback_chain = get_batch_reminder_chain(LLM_FALLBACK_MODEL) if LLM_FALLBACK_MODEL else None
+    llm_started_at = time.perf_counter()
+    queries = "\n".join(f"{index}. {text}" for index, text in enumerate(reminder_texts, start=1))
+    inputs = {"queries": queries, "count": len(reminder_texts)}
+
+    def invoke(batch_chain):
+        parsed_batch = batch_chain.invoke(inputs)
+        reminders = parsed_batch.get("reminders") if isinstance(parsed_batch, dict) else None
+        if not isinstance(reminders, list) or len(reminders) != len(reminder_texts):
+            raise ValueError(
+                f"Expected {len(reminder_texts)} parsed reminders, got {len(reminders) if isinstance(reminders, list) else 0}"
+            )
+        return reminders
+
+    reminders, model_used = llm_invoker.invoke_within_deadline(
+        lambda: invoke(chain),
+        (lambda: invoke(fallback_chain)) if fallback_chain else None,
+        deadline
+    )
+    finished_at = time.perf_counter()
+    print(
+        f"Batch reminder chain timings (ms): size={len(reminder_texts)} model={model_used} "
+        f"setup={(llm_started_at - setup_started_at) * 1000:.1f} "
+        f"llm={(finished_at - llm_started_at) * 1000:.1f}"
     )
-    if not start_date:
-        # Fallback to parsedatetime if dateparser fails
-        cal = parsedatetime.Calendar()
-        time_struct, parse_status = cal.parse(start_date_phrase, datetime.now())
-        start_date = datetime(*time_struct[:6]) if parse_status == 1 else datetime.now().date()
+    return reminders
+
+
+def _normalize_for_comparison(parsed_data):
+    repeat_frequency = parsed_data.get('repeat_frequency') or {}
+    time_str = parsed_data.get('time') or "11:00 AM"
+    return {
+        'task': " ".join((parsed_data.get('task') or "").lower().split()),
+        'start_date_phrase': (parsed_data.get('start_date_phrase') or "today").strip().lower(),
+        'time': sanitize_time_format(time_str).lstrip('0'),
+        'repeat_frequency': {k: v for k, v in repeat_frequency.items() if v},
+    }
+
+
+def compare_parsed_reminders(fast_parsed_data, llm_parsed_data):
+    """
+    Compares the rule-based and LLM parses of the same text.
+
+    Returns:
+        list: Names of the fields that differ (tags are ignored since the rule-based parser does not extract them).
+    """
+    fast = _normalize_for_comparison(fast_parsed_data)
+    llm = _normalize_for_comparison(llm_parsed_data)
+    return [field for field in fast if fast[field] != llm[field]]
+
+
+def parse_with_llm(reminder_text: str, deadline=None):
+    """
+    Parses reminder text with the LLM, serving repeated texts from the parse cache.
+
+    If no model answers before the deadline, a best-effort rule-based parse is returned instead,
+    marked "rules_fallback" so callers can ask for confirmation rather than schedule it. Other
+    LLM errors (a bad API key, a rejected request) are raised.
+
+    Returns:
+        tuple: (parsed_data, source) where source is "cache", "llm" or "rules_fallback".
+
+    Raises:
+        llm_invoker.LLMDeadlineExceeded: If the LLM timed out and the rules cannot parse the text either.
+    """
+    cached_parsed_data = parse_cache.get(reminder_text)
+    if cached_parsed_data is not None:
+        return cached_parsed_data, "cache"
+    try:
+        parsed_data = invoke_reminder_chain(reminder_text, deadline)
+    except llm_invoker.LLMDeadlineExceeded:
+        fallback_parsed_data, _ = rule_based_parser.parse_reminder_text(reminder_text, strict=False)
+        if fallback_parsed_data is None:
+            raise
+        print("LLM unavailable within the deadline, using best-effort rule-based parse")
+        return fallback_parsed_data, "rules_fallback"
+    parse_cache.put(reminder_text, parsed_data)
+    return parsed_data, "llm"
+
+
+def parse_reminder_text(reminder_text: str, deadline=None):
+    """
+    Parses reminder text, preferring the rule-based parser over the LLM.
+
+    FAST_PARSER_MODE controls the behaviour:
+    - "on": use the rule-based result when its confidence is at least FAST_PARSER_MIN_CONFIDENCE, else call the LLM.
+    - "shadow": always return the LLM result, but log how the rule-based result compares to it.
+    - "off": always call the LLM.
 
-    parsed_data['start_date'] = start_date.strftime('%d-%m-%Y') if start_date else datetime.now().strftime('%d-%m-%Y')
+    Args:
+        reminder_text (str): Natural language reminder text.
+        deadline (llm_invoker.Deadline): Time by which an LLM answer is needed.
+
+    Returns:
+        tuple: (parsed_data, source) where source is "rules", "cache", "llm" or "rules_fallback".
+    """
+    if FAST_PARSER_MODE == "off":
+        return parse_with_llm(reminder_text, deadline)
+
+    fast_started_at = time.perf_counter()
+    fast_parsed_data, confidence = rule_based_parser.parse_reminder_text(reminder_text)
+    fast_elapsed_ms = (time.perf_counter() - fast_started_at) * 1000
+
+    if FAST_PARSER_MODE == "shadow":
+        llm_parsed_data, source = parse_with_llm(reminder_text, deadline)
+        mismatched_fields = compare_parsed_reminders(fast_parsed_data, llm_parsed_data) if fast_parsed_data else None
+        print(json.dumps({
+            "fast_parser_shadow": {
+                "confidence": confidence,
+                "recognised": fast_parsed_data is not None,
+                "matched": mismatched_fields == [],
+                "mismatched_fields": mismatched_fields,
+                "fast_parser_ms": round(fast_elapsed_ms, 3),
+            }
+        }))
+        return llm_parsed_data, source
+
+    if fast_parsed_data is not None and confidence >= FAST_PARSER_MIN_CONFIDENCE:
+        print(f"Reminder parsed by rules in {fast_elapsed_ms:.2f} ms (confidence={confidence})")
+        return fast_parsed_data, "rules"
+
+    return parse_with_llm(reminder_text, deadline)
+
+
+def parse_reminder_texts(reminder_texts, deadline=None, raise_llm_errors=True):
+    """
+    Parses many reminder texts, sending only the ones the rules and cache cannot answer to the LLM,
+    all in one batch request.
+
+    Returns:
+        list: (parsed_data, source) tuples in input order; source is "rules", "cache", "llm" or
+            "rules_fallback" (a best-effort parse after the LLM timed out, to be confirmed rather
+            than scheduled). parsed_data is None for texts nothing could parse before the deadline,
+            and, with raise_llm_errors off, for the texts sent to the LLM when it failed, with
+            source "llm_error"; the rules' and cache's parses are still returned.
+
+    Raises:
+        Exception: LLM errors other than running out of time, unless raise_llm_errors is off.
+    """
+    results = [None] * len(reminder_texts)
+    pending_indexes = []
+    for index, reminder_text in enumerate(reminder_texts):
+        if FAST_PARSER_MODE == "on":
+            fast_parsed_data, confidence = rule_based_parser.parse_reminder_text(reminder_text)
+            if fast_parsed_data is not None and confidence >= FAST_PARSER_MIN_CONFIDENCE:
+                results[index] = (fast_parsed_data, "rules")
+                continue
+        cached_parsed_data = parse_cache.get(reminder_text)
+        if cached_parsed_data is not None:
+            results[index] = (cached_parsed_data, "cache")
+            continue
+        pending_indexes.append(index)
+
+    if pending_indexes:
+        try:
+            parsed_batch = invoke_batch_reminder_chain([reminder_texts[index] for index in pending_indexes], deadline)
+        except llm_invoker.LLMDeadlineExceeded as e:
+            print(f"Batch LLM call did not finish in time, using best-effort rule-based parses: {e}")
+            for index in pending_indexes:
+                fallback_parsed_data, _ = rule_based_parser.parse_reminder_text(reminder_texts[index], strict=False)
+                results[index] = (fallback_parsed_data, "rules_fallback")
+            return results
+        except Exception as e:
+            if raise_llm_errors:
+                raise
+            print(f"Batch LLM call failed for {len(pending_indexes)} texts: {e}")
+            for index in pending_indexes:
+                results[index] = (None, "llm_error")
+            return results
+        for index, parsed_data in zip(pending_indexes, parsed_batch):
+            parse_cache.put(reminder_texts[index], parsed_data)
+            results[index] = (parsed_data, "llm")
+    return results
+
+
+def resolve_reminder_schedule(parsed_data):
+    """
+    Resolves the relative start date phrase against today and drops empty fields.
+
+    Args:
+        parsed_data (dict): Raw parser output containing 'start_date_phrase'.
+
+    Returns:
+        dict: Reminder details with an absolute 'start_date' in dd-mm-yyyy format.
+    """
+    parsed_data = dict(parsed_data)
+    # Extract the start date phrase and time from parsed data
+    start_date_phrase = parsed_data.get('start_date_phrase') or "today"
+    # Common phrases are resolved from compiled patterns; dateparser/parsedatetime only see the rest
+    start_date = resolve_date_phrase(start_date_phrase)
+    parsed_data['start_date'] = start_date.strftime('%d-%m-%Y')
     # Filter out None values at the top level
     parsed_data = {key: value for key, value in parsed_data.items() if value is not None}
     # Remove None values specifically from within repeat_frequency
@@ -156,6 +485,34 @@ def get_reminder_schedule_json(reminder_text: str):
     return parsed_data
 
 
+def get_reminder_schedule_json(reminder_text: str, deadline=None):
+    """ Returns the reminder json with schedule details
+
+    Args:
+        reminder_text (str): Natural language text from which reminder details need to be extracted.
+        deadline (llm_invoker.Deadline): Time by which the LLM must have answered.
+
+    Returns:
+        dict: Details of the processed reminder which contains reminder frequency and other reminder details.
+
+    Raises:
+        ReminderNeedsConfirmation: If only a best-effort rule-based parse could be made in time.
+    """
+    parsing_started_at = time.perf_counter()
+    parsed_data, source = parse_reminder_text(reminder_text, deadline)
+    post_processing_started_at = time.perf_counter()
+    parsed_data = resolve_reminder_schedule(parsed_data)
+    finished_at = time.perf_counter()
+    print(
+        f"Reminder parsing timings (ms): source={source} "
+        f"parse={(post_processing_started_at - parsing_started_at) * 1000:.1f} "
+        f"post_processing={(finished_at - post_processing_started_at) * 1000:.1f}"
+    )
+    if source == "rules_fallback":
+        raise ReminderNeedsConfirmation(parsed_data)
+    return parsed_data
+
+
 def generate_eventbridge_expression(start_date, time_str, repeat_frequency, timezone="Asia/Kolkata"):
     """
     Generates EventBridge schedule expression in UTC by converting input datetime to UTC.
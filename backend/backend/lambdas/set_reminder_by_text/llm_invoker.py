@@ -0,0 +1,188 @@
+import os
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Upper bound for a single model call; also used as the HTTP timeout of the chain
+LLM_ATTEMPT_TIMEOUT_SECONDS = float(os.getenv("LLM_ATTEMPT_TIMEOUT_SECONDS", "8"))
+# Hedge threshold used until enough latencies have been observed to estimate the p95
+LLM_HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "4"))
+# Budget held back from the primary model so the cheaper fallback model still has time to answer
+LLM_FALLBACK_RESERVE_SECONDS = float(os.getenv("LLM_FALLBACK_RESERVE_SECONDS", "4"))
+# Attempts that cannot get at least this long are not started
+LLM_MIN_ATTEMPT_SECONDS = float(os.getenv("LLM_MIN_ATTEMPT_SECONDS", "1.5"))
+# Budget used when the caller does not pass a deadline
+LLM_DEFAULT_BUDGET_SECONDS = float(os.getenv("LLM_DEFAULT_BUDGET_SECONDS", "20"))
+
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+# Threads are reused across warm invocations. Calls that lose a hedge race keep running in
+# the background until the HTTP timeout ends them, so the pool is sized for that overlap.
+_executor = ThreadPoolExecutor(max_workers=8)
+
+
+class LLMDeadlineExceeded(Exception):
+    """Raised when no model answered within the request's time budget."""
+
+
+def is_timeout_error(error):
+    """
+    True for errors that mean a call ran out of time (the chain's HTTP timeout is the attempt
+    budget) rather than failed: builtin TimeoutError, or the SDKs' *Timeout* exception types.
+    """
+    return isinstance(error, TimeoutError) or any("Timeout" in cls.__name__ for cls in type(error).__mro__)
+
+
+class Deadline:
+    """Absolute point in time (monotonic clock) by which an answer is needed."""
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def from_context(cls, context, reserve_seconds=0.0, default_seconds=LLM_DEFAULT_BUDGET_SECONDS):
+        """
+        Derives a deadline from the Lambda context, keeping reserve_seconds for work after the LLM call.
+
+        Args:
+            context: Lambda context object (or None outside Lambda).
+            reserve_seconds (float): Time to keep for scheduling and DynamoDB writes.
+            default_seconds (float): Budget used when there is no context.
+        """
+        if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+            seconds = context.get_remaining_time_in_millis() / 1000 - reserve_seconds
+        else:
+            seconds = default_seconds
+        return cls(max(seconds, 0.0))
+
+    def remaining(self):
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies used to pick the hedge threshold."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.latencies = deque(maxlen=window)
+
+    def record(self, seconds):
+        self.latencies.append(seconds)
+
+    def p95(self):
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+    def hedge_after(self):
+        p95 = self.p95()
+        return LLM_HEDGE_AFTER_SECONDS if p95 is None else p95
+
+
+latency_tracker = LatencyTracker()
+
+
+def run_hedged(call, deadline, attempt_timeout, hedge_after):
+    """
+    Runs call() and, if it has not answered after hedge_after seconds (or fails early), one duplicate.
+
+    The first successful result wins. Nothing is started or waited on past the deadline.
+    Only running out of time is reported as LLMDeadlineExceeded: when every attempt failed
+    otherwise (e.g. 401 for a bad API key, 400, output that does not parse), the last error
+    is raised as is.
+
+    Args:
+        call (callable): Zero-argument function performing one model request.
+        deadline (Deadline): Overall request deadline.
+        attempt_timeout (float): Maximum time to wait for this hedged pair.
+        hedge_after (float): Seconds after which the duplicate request is sent.
+
+    Returns:
+        Any: Result of the first attempt that succeeds.
+
+    Raises:
+        LLMDeadlineExceeded: If no attempt succeeds in time.
+        Exception: The last attempt's error, if every attempt failed before the deadline.
+    """
+    budget = min(attempt_timeout, deadline.remaining())
+    if budget < LLM_MIN_ATTEMPT_SECONDS:
+        raise LLMDeadlineExceeded(f"Only {budget:.2f}s left, not starting a model call")
+
+    started_at = time.monotonic()
+    ends_at = started_at + budget
+    hedge_at = started_at + hedge_after
+    attempt_started_at = {_executor.submit(call): started_at}
+    hedged = False
+    last_error = None
+
+    while attempt_started_at:
+        now = time.monotonic()
+        if now >= ends_at:
+            break
+        wait_until = ends_at if hedged else min(ends_at, hedge_at)
+        done, _ = wait(list(attempt_started_at), timeout=max(wait_until - now, 0), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            future_started_at = attempt_started_at.pop(future)
+            error = future.exception()
+            if error is None:
+                latency_tracker.record(time.monotonic() - future_started_at)
+                if hedged:
+                    print(f"Hedged LLM request answered after {time.monotonic() - started_at:.2f}s")
+                return future.result()
+            print(f"LLM attempt failed: {error}")
+            last_error = error
+
+        now = time.monotonic()
+        should_hedge = now >= hedge_at or not attempt_started_at
+        if not hedged and should_hedge and ends_at - now >= LLM_MIN_ATTEMPT_SECONDS:
+            attempt_started_at[_executor.submit(call)] = now
+            hedged = True
+
+    if not attempt_started_at and last_error is not None and not is_timeout_error(last_error):
+        raise last_error
+    raise LLMDeadlineExceeded(
+        f"No model answer within {budget:.2f}s"
+    ) from last_error
+
+
+def invoke_within_deadline(primary_call, fallback_call, deadline):
+    """
+    Calls the primary model with hedging, then the fallback model with whatever budget is left.
+
+    Args:
+        primary_call (callable): Zero-argument function calling the primary model.
+        fallback_call (callable): Zero-argument function calling the cheaper fallback model, or None.
+        deadline (Deadline): Overall request deadline.
+
+    Returns:
+        tuple: (result, "primary" | "fallback")
+
+    Raises:
+        LLMDeadlineExceeded: If neither model answered before the deadline.
+        Exception: Any other error of a model call (authentication, bad request, bad output).
+    """
+    primary_budget = deadline.remaining() - (LLM_FALLBACK_RESERVE_SECONDS if fallback_call else 0)
+    if primary_budget >= LLM_MIN_ATTEMPT_SECONDS:
+        try:
+            return run_hedged(
+                primary_call,
+                deadline,
+                attempt_timeout=min(LLM_ATTEMPT_TIMEOUT_SECONDS, primary_budget),
+                hedge_after=latency_tracker.hedge_after()
+            ), "primary"
+        except LLMDeadlineExceeded as e:
+            print(f"Primary model did not answer in time: {e}")
+
+    if fallback_call is None:
+        raise LLMDeadlineExceeded("Primary model did not answer and no fallback is configured")
+
+    # The fallback is not hedged for slowness (that would only add load), only retried if it fails fast
+    return run_hedged(
+        fallback_call,
+        deadline,
+        attempt_timeout=min(LLM_ATTEMPT_TIMEOUT_SECONDS, deadline.remaining()),
+        hedge_after=math.inf
+    ), "fallback"
@@ -0,0 +1,136 @@
+import os
+import re
+import json
+import time
+import hashlib
+import boto3
+from collections import OrderedDict
+from botocore.exceptions import ClientError
+
+# Bump when the prompt or Reminder model changes so stale parses are not served
+PARSE_CACHE_VERSION = "v1"
+
+PARSE_CACHE_TABLE_NAME = os.getenv("PARSE_CACHE_TABLE_NAME")
+PARSE_CACHE_TTL_SECONDS = int(os.getenv("PARSE_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "1024"))
+
+METRICS_NAMESPACE = "RemindMe/ParseCache"
+
+dynamodb = boto3.resource("dynamodb")
+
+
+def normalize_reminder_text(reminder_text):
+    """
+    Normalizes reminder text so trivially different phrasings share a cache entry.
+
+    Args:
+        reminder_text (str): Raw reminder text (e.g., '  Drink water every 2 Hours!! ')
+
+    Returns:
+        str: Normalized text (e.g., 'drink water every 2 hours')
+    """
+    text = reminder_text.lower()
+    text = re.sub(r"\b([ap])\.m\.?", r"\1m", text)
+    text = re.sub(r"[^\w\s:/-]", " ", text)
+    return " ".join(text.split())
+
+
+def get_cache_key(normalized_text):
+    digest = hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+    return f"{PARSE_CACHE_VERSION}#{digest}"
+
+
+def emit_cache_metric(result):
+    """Prints a CloudWatch Embedded Metric Format record for a cache lookup."""
+    metric_names = ["LocalHit", "RemoteHit", "Miss"]
+    record = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [[]],
+                "Metrics": [{"Name": name, "Unit": "Count"} for name in metric_names],
+            }],
+        },
+    }
+    for name in metric_names:
+        record[name] = 1 if name == result else 0
+    print(json.dumps(record))
+
+
+class ParseCache:
+    """
+    Two-tier cache of raw LLM parses keyed on normalized reminder text.
+
+    The first tier is an in-container LRU; the second is a DynamoDB table whose items
+    expire through the table's TTL attribute. Entries hold the raw parser output, so
+    relative phrases such as start_date_phrase are resolved against the current date
+    on every hit.
+    """
+
+    def __init__(self, table_name=PARSE_CACHE_TABLE_NAME, ttl_seconds=PARSE_CACHE_TTL_SECONDS,
+                 max_entries=PARSE_CACHE_MAX_ENTRIES, clock=time.time):
+        self.table = dynamodb.Table(table_name) if table_name else None
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries = OrderedDict()
+        self.stats = {"LocalHit": 0, "RemoteHit": 0, "Miss": 0}
+
+    def _record(self, result):
+        self.stats[result] += 1
+        emit_cache_metric(result)
+
+    def _remember(self, cache_key, parsed_json, expires_at):
+        self._entries[cache_key] = (parsed_json, expires_at)
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, reminder_text):
+        """Returns the cached raw parse for the text, or None on a miss."""
+        cache_key = get_cache_key(normalize_reminder_text(reminder_text))
+        now = int(self.clock())
+
+        entry = self._entries.get(cache_key)
+        if entry:
+            parsed_json, expires_at = entry
+            if expires_at > now:
+                self._entries.move_to_end(cache_key)
+                self._record("LocalHit")
+                return json.loads(parsed_json)
+            del self._entries[cache_key]
+
+        if self.table is not None:
+            try:
+                item = self.table.get_item(Key={"cache_key": cache_key}).get("Item")
+            except ClientError as e:
+                print(f"Error reading parse cache: {e}")
+                item = None
+            # DynamoDB TTL deletes lazily, so expired items can still be returned
+            if item and int(item["expires_at"]) > now:
+                self._remember(cache_key, item["parsed_data"], int(item["expires_at"]))
+                self._record("RemoteHit")
+                return json.loads(item["parsed_data"])
+
+        self._record("Miss")
+        return None
+
+    def put(self, reminder_text, parsed_data):
+        """Stores a raw parse in both cache tiers."""
+        normalized_text = normalize_reminder_text(reminder_text)
+        cache_key = get_cache_key(normalized_text)
+        parsed_json = json.dumps(parsed_data)
+        expires_at = int(self.clock()) + self.ttl_seconds
+
+        self._remember(cache_key, parsed_json, expires_at)
+        if self.table is not None:
+            try:
+                self.table.put_item(Item={
+                    "cache_key": cache_key,
+                    "normalized_text": normalized_text,
+                    "parsed_data": parsed_json,
+                    "expires_at": expires_at,
+                })
+            except ClientError as e:
+                print(f"Error writing parse cache: {e}")
@@ -0,0 +1,161 @@
+import json
+from datetime import datetime
+from botocore.exceptions import ClientError
+from helpers import (
+    parse_reminder_texts,
+    resolve_reminder_schedule,
+    generate_reminder_summary,
+    generate_eventbridge_expression
+)
+from llm_invoker import Deadline
+from set_reminder_by_text import (
+    dynamodb,
+    REMINDERS_TABLE_NAME,
+    RESPONSE_RESERVE_SECONDS,
+    REMINDER_STATUS_FAILED,
+    REMINDER_JOB_MESSAGE_TYPE,
+    create_reminder_schedule,
+    build_reminder_item
+)
+
+
+def load_job(record):
+    """
+    Reads a reminder job from an SQS record, or returns None if the message is not one: error
+    reports sent to RemindersQueue by send_to_reminders_queue are not jobs, and are never scheduled.
+    """
+    try:
+        job = json.loads(record["body"])
+    except (KeyError, ValueError):
+        return None
+    if not isinstance(job, dict) or job.get("type") != REMINDER_JOB_MESSAGE_TYPE:
+        return None
+    if not all(job.get(key) for key in ("device_id", "reminder_id", "reminder_text")):
+        return None
+    job["message_id"] = record["messageId"]
+    return job
+
+
+def is_already_scheduled(existing_item):
+    """Duplicate deliveries of jobs for reminders that already have a schedule are skipped."""
+    return existing_item is not None and "eventbridge_expression" in existing_item
+
+
+def mark_reminder_failed(reminders_table, job, error):
+    """Records that the reminder text could not be understood, so polling clients stop waiting."""
+    reminders_table.update_item(
+        Key={"PK": f"CUSTOMER#{job['device_id']}", "SK": f"REMINDER#{job['reminder_id']}"},
+        UpdateExpression="SET #status = :status, failure_reason = :error, reminder_text = :text, updated_at = :now, "
+                         "reminder_version = if_not_exists(reminder_version, :zero) + :one "
+                         "REMOVE active_device, active_fire_at",
+        ExpressionAttributeNames={"#status": "status"},
+        ExpressionAttributeValues={
+            ":status": REMINDER_STATUS_FAILED,
+            ":error": error,
+            ":text": job["reminder_text"],
+            ":now": datetime.now().isoformat(),
+            ":zero": 0,
+            ":one": 1,
+        },
+    )
+
+
+def schedule_job(reminders_table, job, parsed_data, existing_item):
+    """
+    Schedules one parsed job and replaces its PENDING item with the full reminder.
+
+    Returns:
+        bool: False if the job should be retried.
+    """
+    try:
+        reminder_schedule_json = resolve_reminder_schedule(parsed_data)
+        expression = generate_eventbridge_expression(
+            start_date=reminder_schedule_json["start_date"],
+            time_str=reminder_schedule_json["time"],
+            repeat_frequency=reminder_schedule_json.get("repeat_frequency")
+        )
+        reminder_scheduled_message = generate_reminder_summary(reminder_schedule_json)
+        # The PENDING item carries the version the new reminder must outrank
+        previous_version = int(existing_item.get("reminder_version", 0)) if existing_item else 0
+        reminder_item = build_reminder_item(
+            job["device_id"], job["reminder_id"], reminder_schedule_json, expression, reminder_scheduled_message,
+            previous_version
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        # Retrying will not make the text parse differently
+        print(f"Error preparing reminder {job['reminder_id']}: {e}")
+        mark_reminder_failed(reminders_table, job, "Could not understand reminder text")
+        return True
+
+    try:
+        # Overwrites the schedule a previous attempt created without getting to write the item
+        create_reminder_schedule(job["rule_name"], reminder_item)
+    except ClientError as e:
+        print(f"Error scheduling reminder {job['reminder_id']}: {e}")
+        return False
+
+    reminder_item["reminder_text"] = job["reminder_text"]
+    if existing_item and existing_item.get("created_at"):
+        reminder_item["created_at"] = existing_item["created_at"]
+    reminders_table.put_item(Item=reminder_item)
+    print(f"Reminder {job['reminder_id']} scheduled asynchronously: {reminder_scheduled_message}")
+    return True
+
+
+def handler(event, context):
+    """
+    Consumes the reminder jobs on RemindersQueue: reminder texts accepted with async=true. Error
+    reports of reminders the synchronous endpoints could not schedule share the queue and are
+    dropped. All texts in a batch share one LLM round-trip.
+
+    Failed messages are reported individually so only they are retried. That includes texts
+    only a best-effort rules guess could be made for because the LLM timed out: the job is
+    retried, and dead-lettered after RemindersQueue's receive limit, rather than scheduling a guess.
+    """
+    reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
+    batch_item_failures = []
+    jobs = []
+
+    for record in event.get("Records", []):
+        job = load_job(record)
+        if job is None:
+            print(f"Dropping message that is not a reminder job: {record.get('body')}")
+            continue
+        job.setdefault("rule_name", f"reminder_{job['reminder_id']}")
+        try:
+            existing_item = reminders_table.get_item(
+                Key={"PK": f"CUSTOMER#{job['device_id']}", "SK": f"REMINDER#{job['reminder_id']}"}
+            ).get("Item")
+        except ClientError as e:
+            print(f"Error reading reminder {job['reminder_id']}: {e}")
+            batch_item_failures.append({"itemIdentifier": job["message_id"]})
+            continue
+        if is_already_scheduled(existing_item):
+            print(f"Reminder {job['reminder_id']} is already scheduled, skipping")
+            continue
+        job["existing_item"] = existing_item
+        jobs.append(job)
+
+    if jobs:
+        deadline = Deadline.from_context(context, reserve_seconds=RESPONSE_RESERVE_SECONDS)
+        try:
+            parsed_results = parse_reminder_texts([job["reminder_text"] for job in jobs], deadline)
+        except Exception as e:
+            print(f"Error parsing reminder jobs: {e}")
+            return {"batchItemFailures": batch_item_failures + [{"itemIdentifier": job["message_id"]} for job in jobs]}
+
+        for job, (parsed_data, source) in zip(jobs, parsed_results):
+            if source == "rules_fallback":
+                print(f"Reminder {job['reminder_id']} could only be guessed by the rules, retrying the job")
+                batch_item_failures.append({"itemIdentifier": job["message_id"]})
+                continue
+            try:
+                if parsed_data is None or not schedule_job(reminders_table, job, parsed_data, job["existing_item"]):
+                    batch_item_failures.append({"itemIdentifier": job["message_id"]})
+                    continue
+                print(f"Reminder {job['reminder_id']} parsed by {source}")
+            except ClientError as e:
+                print(f"Error saving reminder {job['reminder_id']}: {e}")
+                batch_item_failures.append({"itemIdentifier": job["message_id"]})
+
+    return {"batchItemFailures": batch_item_failures}
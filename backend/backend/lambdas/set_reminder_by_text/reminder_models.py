@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+# Define the data structure for repeat frequency
+class RepeatFrequency(BaseModel):
+    daily: Optional[int] = None
+    weekly: Optional[int] = None
+    monthly: Optional[int] = None
+    yearly: Optional[int] = None
+    hourly: Optional[int] = None
+    selected_days_of_week: Optional[List[int]] = None
+    selected_days_of_month: Optional[List[int]] = None
+
+class Reminder(BaseModel):
+    task: str = Field(description="The action or task to be reminded of.")
+    start_date_phrase: str = Field(description="The relative date phrase indicating when the reminder should start (e.g., today, tomorrow, next week).")
+    end_date: Optional[str] = Field(description="The end date of the reminder in dd-mm-yyyy format.")
+    time: Optional[str] = Field(default="11:00 AM", description="The specific time of day for the reminder.")
+    repeat_frequency: RepeatFrequency = Field(default_factory=RepeatFrequency, description="Repeat frequency settings.")
+    tags: List[str] = Field(default_factory=list, description="Tags associated with the reminder for easy categorization.")
+
+class ReminderBatch(BaseModel):
+    reminders: List[Reminder] = Field(description="One parsed reminder per input text, in input order.")
@@ -0,0 +1,298 @@
+import re
+
+# Day of week numbering matches helpers.day_of_week_map (1=Sunday ... 7=Saturday)
+weekday_numbers = {
+    "sunday": 1,
+    "monday": 2,
+    "tuesday": 3,
+    "wednesday": 4,
+    "thursday": 5,
+    "friday": 6,
+    "saturday": 7,
+}
+
+# Same mapping the LLM prompt uses for vague times of day
+time_of_day_map = {
+    "morning": "08:00 AM",
+    "afternoon": "02:00 PM",
+    "evening": "06:00 PM",
+    "night": "09:00 PM",
+    "tonight": "09:00 PM",
+    "noon": "12:00 PM",
+    "midday": "12:00 PM",
+    "midnight": "12:00 AM",
+}
+
+number_words = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+}
+
+DEFAULT_TIME = "11:00 AM"
+
+_weekday = r"(?:" + "|".join(weekday_numbers) + r")s?"
+_number = r"(?:\d+|" + "|".join(number_words) + r")"
+_weekday_list = _weekday + r"(?:\s*(?:,|and|&)\s*" + _weekday + r")*"
+
+_lead_in_pattern = re.compile(r"^(?:please\s+)?(?:remind\s+me\s+(?:to\s+|about\s+)?|reminder\s+(?:to\s+)?|set\s+a\s+reminder\s+(?:to\s+)?)")
+
+_clock_time_pattern = re.compile(
+    r"\b(?:at\s+|@\s*)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridiem>a\.?m\.?|p\.?m\.?)(?=\s|$|[,.!])"
+    r"|\b(?:at\s+|@\s*)(?P<hour24>[01]?\d|2[0-3]):(?P<minute24>\d{2})\b"
+)
+_time_of_day_pattern = re.compile(
+    r"\b(?:(?:in|at)\s+(?:the\s+)?|(?P<every>every|each)\s+)?(?P<period>" + "|".join(time_of_day_map) + r")\b"
+)
+
+_recurrence_patterns = [
+    (re.compile(r"\b(?:every|each)\s+(?:week\s*day|weekday)s?\b|\bon\s+weekdays\b|\bweekdays\b"),
+     lambda m: {"selected_days_of_week": [2, 3, 4, 5, 6]}),
+    (re.compile(r"\b(?:every|each)\s+weekends?\b|\bon\s+weekends\b|\bweekends\b"),
+     lambda m: {"selected_days_of_week": [1, 7]}),
+    (re.compile(r"\b(?:every|each)\s+(?:other|alternate)\s+day\b|\b(?:on\s+)?alternate\s+days\b"),
+     lambda m: {"daily": 2}),
+    (re.compile(r"\b(?:every|each)\s+(?P<n>" + _number + r")\s+(?P<unit>hour|day|week|month|year)s\b"),
+     lambda m: {_unit_to_frequency[m.group("unit")]: _to_int(m.group("n"))}),
+    (re.compile(r"\b(?:every|each)\s+(?P<unit>hour|day|week|month|year)\b"),
+     lambda m: {_unit_to_frequency[m.group("unit")]: 1}),
+    (re.compile(r"\b(?P<adverb>hourly|daily|everyday|weekly|monthly|yearly|annually)\b"),
+     lambda m: {_adverb_to_frequency[m.group("adverb")]: 1}),
+    (re.compile(r"\b(?:every|each)\s+(?P<days>" + _weekday_list + r")\b|\bon\s+(?P<plural>" + _weekday + r"s(?:\s*(?:,|and|&)\s*" + _weekday + r"s)*)\b"),
+     lambda m: {"selected_days_of_week": _weekdays_from(m.group("days") or m.group("plural"))}),
+]
+
+_start_date_patterns = [
+    (re.compile(r"\b(?:the\s+)?day\s+after\s+tomorrow\b"), lambda m: "day after tomorrow"),
+    (re.compile(r"\btomorrow\b"), lambda m: "tomorrow"),
+    (re.compile(r"\btoday\b"), lambda m: "today"),
+    (re.compile(r"\bnext\s+week\b"), lambda m: "next week"),
+    (re.compile(r"\bin\s+(?P<n>" + _number + r")\s+(?P<unit>day|week)s?\b"),
+     lambda m: f"in {_to_int(m.group('n'))} {m.group('unit')}s"),
+    (re.compile(r"\b(?:on\s+|this\s+|next\s+|coming\s+)?(?P<day>" + _weekday + r")\b"),
+     lambda m: _weekday_phrase(m)),
+]
+
+# Words that signal constraints the rules above do not model (end dates,
+# exceptions, explicit calendar dates). Their presence forces the LLM path.
+_unsupported_pattern = re.compile(
+    r"\b(?:until|till|untill|except|excluding|between|before|after|starting|from|ending|for\s+the\s+next"
+    r"|january|february|march|april|june|july|august|september|october|november|december"
+    r"|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec"
+    r"|last|first|second|third|fourth|fifth|\d+(?:st|nd|rd|th)|times|twice|minutes?|mins?)\b"
+    r"|\d{1,4}[/-]\d{1,2}"
+)
+
+# Temporal words and prepositions that the rules above did not consume: a phrase they do not
+# model ('on christmas', 'at the end of the month', 'soon'), so the parse is left to the LLM
+_residual_temporal_pattern = re.compile(
+    r"\b(?:on|at|by|around|during|until|within|end|beginning|start|mid|soon|later|sometime|someday|eventually"
+    r"|asap|tonight|noon|hours?|days?|weeks?|months?|years?|weekends?|christmas|xmas|easter|diwali|holi|eid"
+    r"|thanksgiving|halloween|new\s+year'?s?|holidays?)\b"
+)
+
+_unit_to_frequency = {"hour": "hourly", "day": "daily", "week": "weekly", "month": "monthly", "year": "yearly"}
+_adverb_to_frequency = {
+    "hourly": "hourly", "daily": "daily", "everyday": "daily", "weekly": "weekly",
+    "monthly": "monthly", "yearly": "yearly", "annually": "yearly",
+}
+
+_filler_words = {"to", "at", "on", "in", "the", "every", "each", "and", "please", "me", "a", "an", "of", "by"}
+
+
+def _to_int(value):
+    return int(value) if value.isdigit() else number_words[value]
+
+
+def _weekday_name(token):
+    return token[:-1] if token.endswith("s") else token
+
+
+def _weekdays_from(text):
+    return sorted({weekday_numbers[_weekday_name(token)] for token in re.findall(_weekday, text)})
+
+
+def _weekday_phrase(match):
+    name = _weekday_name(match.group("day"))
+    if match.group(0).startswith("next"):
+        return f"next {name}"
+    return name
+
+
+def _format_clock_time(hour, minute, meridiem):
+    if meridiem is None:
+        meridiem = "AM" if hour < 12 else "PM"
+        hour = hour % 12 or 12
+    return f"{hour:02d}:{minute:02d} {meridiem}"
+
+
+def _extract_time(text):
+    """Returns (time_str, remaining_text, implied_repeat_frequency); time_str is None if invalid."""
+    match = _clock_time_pattern.search(text)
+    if match:
+        if match.group("hour") is not None:
+            hour = int(match.group("hour"))
+            minute = int(match.group("minute") or 0)
+            if not 1 <= hour <= 12 or minute > 59:
+                return None, text, {}
+            meridiem = match.group("meridiem").replace(".", "").upper()
+            time_str = _format_clock_time(hour, minute, meridiem)
+        else:
+            hour = int(match.group("hour24"))
+            minute = int(match.group("minute24"))
+            if minute > 59:
+                return None, text, {}
+            time_str = _format_clock_time(hour, minute, None)
+        return time_str, _remove_span(text, match), {}
+
+    match = _time_of_day_pattern.search(text)
+    if match:
+        # 'every morning' is a daily reminder, not a one-off
+        implied_frequency = {"daily": 1} if match.group("every") else {}
+        return time_of_day_map[match.group("period")], _remove_span(text, match), implied_frequency
+
+    return DEFAULT_TIME, text, {}
+
+
+def _remove_span(text, match):
+    return f"{text[:match.start()]} {text[match.end():]}"
+
+
+def _has_invalid_interval(repeat_frequency):
+    """'every 0 days' and the like cannot be scheduled."""
+    return any(isinstance(value, int) and value <= 0 for value in repeat_frequency.values())
+
+
+def _restore_case(task, original_text):
+    """Takes the task's words, found in order in the original text, with their original spelling."""
+    original_words = re.sub(r"[,.!?;:]+", " ", original_text).split()
+    restored = []
+    position = 0
+    for word in task.split():
+        while position < len(original_words) and original_words[position].lower() != word:
+            position += 1
+        if position == len(original_words):
+            return task
+        restored.append(original_words[position])
+        position += 1
+    return " ".join(restored)
+
+
+def _clean_task(text):
+    words = re.sub(r"[,.!?;:]+", " ", text).split()
+    # Drop dangling filler words left behind by removed spans
+    while words and words[0] in _filler_words:
+        words.pop(0)
+    while words and words[-1] in _filler_words:
+        words.pop()
+    return " ".join(words)
+
+
+def parse_reminder_text(reminder_text, strict=True):
+    """
+    Parses common reminder phrasings without calling the LLM.
+
+    Args:
+        reminder_text (str): Natural language reminder text (e.g., 'drink water every 2 hours').
+        strict (bool): When False, return a best-effort parse of whatever was recognised instead of
+            giving up on unsupported phrasing. Used when the LLM cannot answer in time.
+
+    Returns:
+        tuple: (parsed_data, confidence). parsed_data has the same keys as the LLM output
+            (task, start_date_phrase, end_date, time, repeat_frequency, tags) or is None when
+            the text is not recognised. confidence is 1.0 when every temporal phrase in the
+            text was understood, 0.5 for a best-effort parse and 0.0 otherwise. The task keeps
+            the casing of reminder_text.
+    """
+    original_text = " ".join(reminder_text.split())
+    text = _lead_in_pattern.sub("", original_text.lower())
+
+    if not strict:
+        return _parse_best_effort(text, original_text)
+
+    if _unsupported_pattern.search(text):
+        return None, 0.0
+
+    time_str, text, repeat_frequency = _extract_time(text)
+    if time_str is None:
+        return None, 0.0
+    if _clock_time_pattern.search(text) or _time_of_day_pattern.search(text):
+        # More than one time of day, e.g. 'at 9am and 6pm'
+        return None, 0.0
+
+    for pattern, build in _recurrence_patterns:
+        if repeat_frequency:
+            break
+        match = pattern.search(text)
+        if match:
+            repeat_frequency = build(match)
+            text = _remove_span(text, match)
+            break
+    for pattern, _ in _recurrence_patterns:
+        if pattern.search(text):
+            # Conflicting or compound recurrences are left to the LLM
+            return None, 0.0
+    if _has_invalid_interval(repeat_frequency):
+        return None, 0.0
+
+    start_date_phrase = "today"
+    for pattern, build in _start_date_patterns:
+        match = pattern.search(text)
+        if match:
+            start_date_phrase = build(match)
+            text = _remove_span(text, match)
+            break
+    for pattern, _ in _start_date_patterns:
+        if pattern.search(text):
+            return None, 0.0
+
+    task = _clean_task(text)
+    if not task or re.search(r"\d", task) or re.search(r"\b(?:every|each|next|this|in)\b", task):
+        return None, 0.0
+    if _residual_temporal_pattern.search(task):
+        return None, 0.0
+
+    parsed_data = {
+        "task": _restore_case(task, original_text),
+        "start_date_phrase": start_date_phrase,
+        "end_date": None,
+        "time": time_str,
+        "repeat_frequency": repeat_frequency,
+        "tags": [],
+    }
+    return parsed_data, 1.0
+
+
+def _parse_best_effort(text, original_text):
+    """Applies the first matching rule of each kind and keeps the rest of the text as the task."""
+    time_str, text, repeat_frequency = _extract_time(text)
+    if time_str is None:
+        time_str = DEFAULT_TIME
+    if not repeat_frequency:
+        for pattern, build in _recurrence_patterns:
+            match = pattern.search(text)
+            if match:
+                repeat_frequency = build(match)
+                text = _remove_span(text, match)
+                break
+    if _has_invalid_interval(repeat_frequency):
+        return None, 0.0
+    start_date_phrase = "today"
+    for pattern, build in _start_date_patterns:
+        match = pattern.search(text)
+        if match:
+            start_date_phrase = build(match)
+            text = _remove_span(text, match)
+            break
+
+    task = _clean_task(text)
+    if not task:
+        return None, 0.0
+    parsed_data = {
+        "task": _restore_case(task, original_text),
+        "start_date_phrase": start_date_phrase,
+        "end_date": None,
+        "time": time_str,
+        "repeat_frequency": repeat_frequency,
+        "tags": [],
+    }
+    return parsed_data, 0.5
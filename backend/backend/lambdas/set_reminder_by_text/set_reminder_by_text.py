@@ -1,15 +1,28 @@
 import os
-import dateparser
 import json
+import time
 import uuid
 import boto3
 from botocore.exceptions import ClientError
 from datetime import datetime
 from helpers import (
+    ReminderNeedsConfirmation,
+    get_reminder_chain,
     get_reminder_schedule_json,
     generate_reminder_summary,
     generate_eventbridge_expression
 )
+from llm_invoker import Deadline, LLMDeadlineExceeded
+from date_resolver import resolve_time_phrase
+from schedule_expressions import (
+    SCHEDULING_MODE,
+    get_active_fields,
+    get_delivery_input,
+    get_dispatch_fields,
+    get_occurrence_fields,
+    get_schedule_fields
+)
+from responses import json_response, parse_body
 
 
 # Initialize AWS resources
@@ -22,6 +35,33 @@ REMINDERS_TABLE_NAME = os.environ["REMINDERS_TABLE_NAME"]
 REMINDERS_QUEUE_URL = os.environ["REMINDERS_QUEUE_URL"]
 EVENTBRIDGE_TARGET = os.environ["EVENTBRIDGE_TARGET"]
 SCHEDULER_ROLE_ARN = os.environ["SCHEDULER_ROLE_ARN"]
+# In queue mode schedules put their Input on the delivery queue instead of invoking process_events
+SCHEDULE_TARGET_ARN = os.environ["DELIVERY_QUEUE_ARN"] if SCHEDULING_MODE == "queue" else EVENTBRIDGE_TARGET
+# Seconds of the Lambda timeout kept for scheduling and DynamoDB writes after parsing
+RESPONSE_RESERVE_SECONDS = float(os.getenv("RESPONSE_RESERVE_SECONDS", "4"))
+# When true, requests that do not say otherwise are parsed by the process_reminder_jobs worker
+ASYNC_PARSING_DEFAULT = os.getenv("ASYNC_PARSING_DEFAULT", "false").lower() == "true"
+
+# Lifecycle of a reminder item; clients poll for it while an async parse is in flight
+REMINDER_STATUS_PENDING = "PENDING"
+REMINDER_STATUS_SCHEDULED = "SCHEDULED"
+REMINDER_STATUS_FAILED = "FAILED"
+# RemindersQueue also receives error reports of reminders the synchronous endpoints could not
+# schedule; process_reminder_jobs only acts on messages of the job type
+REMINDER_JOB_MESSAGE_TYPE = "job"
+REMINDER_ERROR_MESSAGE_TYPE = "error"
+
+# The LLM chain (and langchain with it) is built on first use and then reused by warm invocations.
+# Set PRIME_LLM_CHAIN=true to build it during init instead, e.g. with provisioned concurrency.
+if os.getenv("PRIME_LLM_CHAIN", "false").lower() == "true":
+    get_reminder_chain()
+
+
+def parse_bool(value):
+    """Reads a JSON flag that clients may send as a boolean or a string ("false", "0", "no")."""
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes", "on")
+    return bool(value)
 
 
 def is_one_time_schedule(expression):
@@ -37,14 +77,243 @@ def is_one_time_schedule(expression):
     return expression.strip().startswith("at(")
 
 
+def create_reminder_schedule(rule_name, reminder_item):
+    """
+    Creates the Scheduler job (one-time) or EventBridge rule (recurring) that fires the reminder.
+    Nothing is created in dispatcher mode.
+
+    The target Input is the reminder's delivery payload (see get_delivery_input), so a fire is
+    delivered without reading the reminder back. An existing schedule or rule of the same name is
+    overwritten, so the Input always matches the item about to be written.
+
+    Parameters:
+        rule_name (str): Name of the schedule or rule (reminder_{reminder_id}).
+        reminder_item (dict): The reminder as built by build_reminder_item.
+    """
+    if SCHEDULING_MODE == "dispatcher":
+        # The sweeper finds the reminder through next_fire_at on its item (see build_reminder_item)
+        return
+
+    expression = reminder_item["eventbridge_expression"]
+    reminder_id = reminder_item["SK"].split("#", 1)[1]
+    reminder_scheduled_message = reminder_item["reminder_scheduled_message"]
+    target_input = get_delivery_input(reminder_item)
+
+    if is_one_time_schedule(expression):
+        schedule = {
+            "Name": rule_name,
+            "ScheduleExpression": expression,
+            "ScheduleExpressionTimezone": "Asia/Kolkata",
+            "FlexibleTimeWindow": {
+                'Mode': 'OFF'
+            },
+            "Target": {
+                'Arn': SCHEDULE_TARGET_ARN,
+                'RoleArn': SCHEDULER_ROLE_ARN ,
+                'Input': target_input
+            }
+        }
+        try:
+            scheduler.create_schedule(**schedule)
+            print("One-time EventBridge Scheduler job created successfully.")
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConflictException":
+                raise
+            # The reminder is being rewritten, or a retry follows a write that failed; fires must carry the new Input
+            scheduler.update_schedule(**schedule)
+            print("One-time EventBridge Scheduler job updated successfully.")
+    else:
+        # Create the EventBridge rule
+        rule_response = events.put_rule(
+            Name=rule_name,
+            ScheduleExpression=expression,
+            State="ENABLED",
+            Description=f"Reminder: {reminder_scheduled_message}",
+        )
+        # Attach target to the rule
+        target_response = events.put_targets(
+            Rule=rule_name,
+            Targets=[
+                {
+                    "Id": f"Target_{reminder_id}",
+                    "Arn": SCHEDULE_TARGET_ARN,  # process_events, or the delivery queue
+                    "Input": target_input,
+                }
+            ]
+        )
+        print("EventBridge rule and target created successfully.")
+        print("Rule Response:", rule_response)
+        print("Target Response:", target_response)
+
+
+def delete_reminder_schedule(rule_name, reminder_item):
+    """
+    Removes the Scheduler job or EventBridge rule made by create_reminder_schedule, for reminders
+    whose item could not be written. Nothing was created in dispatcher mode.
+
+    Parameters:
+        rule_name (str): Name of the schedule or rule (reminder_{reminder_id}).
+        reminder_item (dict): The reminder as built by build_reminder_item.
+    """
+    if SCHEDULING_MODE == "dispatcher":
+        return
+
+    if is_one_time_schedule(reminder_item["eventbridge_expression"]):
+        scheduler.delete_schedule(Name=rule_name)
+    else:
+        reminder_id = reminder_item["SK"].split("#", 1)[1]
+        # A rule cannot be deleted while it still has targets
+        events.remove_targets(Rule=rule_name, Ids=[f"Target_{reminder_id}"])
+        events.delete_rule(Name=rule_name)
+
+
+def get_reminder_versions(device_id, reminder_ids):
+    """
+    Reads the stored reminder_version of reminders about to be rewritten, with BatchGetItem.
+    At most 100 ids, which covers BATCH_MAX_SIZE.
+
+    Returns:
+        dict: reminder_id -> version, for the reminders that already exist.
+    """
+    versions = {}
+    keys = [{"PK": f"CUSTOMER#{device_id}", "SK": f"REMINDER#{reminder_id}"} for reminder_id in reminder_ids]
+    request_items = {REMINDERS_TABLE_NAME: {"Keys": keys, "ProjectionExpression": "SK, reminder_version"}} if keys else None
+    attempt = 0
+    while request_items:
+        if attempt:
+            time.sleep(min(0.05 * 2 ** attempt, 1))  # Unprocessed keys mean the table is throttling
+        response = dynamodb.batch_get_item(RequestItems=request_items)
+        for item in response["Responses"].get(REMINDERS_TABLE_NAME, []):
+            versions[item["SK"].split("#", 1)[1]] = int(item.get("reminder_version", 0))
+        request_items = response.get("UnprocessedKeys") or None
+        attempt += 1
+    return versions
+
+
+def build_reminder_item(device_id, reminder_id, reminder_schedule_json, expression, reminder_scheduled_message,
+                        previous_version=0):
+    """
+    Builds the RemindersTable item for a parsed and scheduled reminder.
+
+    previous_version is the reminder_version of the item being replaced, if any; the new item
+    always gets a higher one, so fires built from the old item are recognised as stale.
+
+    Raises:
+        ValueError: If the reminder's time cannot be understood.
+    """
+    reminder_item = dict(reminder_schedule_json)
+    reminder_item["PK"] = f"CUSTOMER#{device_id}"
+    reminder_item["SK"] = f"REMINDER#{reminder_id}"
+    reminder_item["reminder_scheduled_message"] = reminder_scheduled_message
+    reminder_item["eventbridge_expression"] = expression
+    reminder_item["is_completed"] = False
+    # Bumped by anything that changes what a fire delivers; schedules carry the version they were built from
+    reminder_item["reminder_version"] = previous_version + 1
+    reminder_item["status"] = REMINDER_STATUS_SCHEDULED
+    reminder_item["created_at"] = datetime.now().isoformat()
+    reminder_item["updated_at"] = datetime.now().isoformat()
+    resolved_time = resolve_time_phrase(reminder_item["time"])
+    if resolved_time is None:
+        # Nothing has been scheduled yet; storing None would break every later read of the reminder
+        raise ValueError(f"Could not understand reminder time: {reminder_item['time']}")
+    reminder_item["time"] = resolved_time
+    reminder_item.update(get_schedule_fields(
+        reminder_item.get("start_date"), reminder_item["time"], reminder_item.get("end_date")
+    ))
+    reminder_item.update(get_occurrence_fields(expression, reminder_item.get("start_at")))
+    reminder_item.update(get_active_fields(
+        device_id, expression, reminder_item.get("start_at"), reminder_item.get("end_date")
+    ))
+    if SCHEDULING_MODE == "dispatcher":
+        reminder_item.update(get_dispatch_fields(
+            expression, reminder_id, datetime.utcnow(), reminder_item.get("end_date")
+        ))
+    return reminder_item
+
+
+def send_to_reminders_queue(device_id, reminder_id, reminder_text, rule_name, error):
+    """Sends a reminder that could not be scheduled to SQS for error handling."""
+    sqs.send_message(
+        QueueUrl=REMINDERS_QUEUE_URL,
+        MessageBody=json.dumps({
+            "type": REMINDER_ERROR_MESSAGE_TYPE,
+            "device_id": device_id,
+            "reminder_id": reminder_id,
+            "reminder_text": reminder_text,
+            "rule_name": rule_name,
+            "error": str(error)
+        })
+    )
+
+
+def enqueue_reminder_job(device_id, reminder_id, reminder_text, previous_version=0):
+    """
+    Records a PENDING reminder and queues its text for the process_reminder_jobs worker.
+
+    Parameters:
+        device_id (str): Device the reminder belongs to.
+        reminder_id (str): Reminder identifier.
+        reminder_text (str): Natural language reminder text to parse.
+        previous_version (int): reminder_version of the reminder being replaced, or 0.
+    """
+    now = datetime.now().isoformat()
+    reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
+    # Listed as upcoming while it waits to be parsed, ahead of every scheduled reminder
+    reminders_table.put_item(Item={
+        "PK": f"CUSTOMER#{device_id}",
+        "SK": f"REMINDER#{reminder_id}",
+        "reminder_text": reminder_text,
+        "status": REMINDER_STATUS_PENDING,
+        "is_completed": False,
+        "reminder_version": previous_version + 1,
+        "active_device": device_id,
+        "active_fire_at": 0,
+        "created_at": now,
+        "updated_at": now,
+    })
+    sqs.send_message(
+        QueueUrl=REMINDERS_QUEUE_URL,
+        MessageBody=json.dumps({
+            "type": REMINDER_JOB_MESSAGE_TYPE,
+            "device_id": device_id,
+            "reminder_id": reminder_id,
+            "reminder_text": reminder_text,
+            "rule_name": f"reminder_{reminder_id}"
+        })
+    )
+
+
 def handler(event, context):
-    body = json.loads(event["body"])
+    body = parse_body(event)
     device_id = body["device_id"]
     reminder_text = body["reminder_data"]["text"]
     reminder_id = body.get("reminder_id", str(uuid.uuid4()))
+    rule_name = f"reminder_{reminder_id}"
 
     try:
-        reminder_schedule_json = get_reminder_schedule_json(reminder_text)
+        # Only a client-chosen id can belong to a reminder that already exists
+        previous_version = get_reminder_versions(device_id, [reminder_id]).get(reminder_id, 0) if "reminder_id" in body else 0
+    except ClientError as e:
+        print(f"Error reading reminder {reminder_id}: {e}")
+        return json_response(500, {"error": "Failed to schedule reminder"})
+
+    if parse_bool(body.get("async", ASYNC_PARSING_DEFAULT)):
+        try:
+            enqueue_reminder_job(device_id, reminder_id, reminder_text, previous_version)
+        except ClientError as e:
+            print(f"Error queueing reminder: {e}")
+            return json_response(500, {"error": "Failed to queue reminder"})
+        # Parsing and scheduling finish in the worker; poll get-reminder-list?reminder_id= for the status
+        return json_response(202, {
+            "message": "Reminder accepted",
+            "reminder_id": reminder_id,
+            "status": REMINDER_STATUS_PENDING
+        })
+
+    try:
+        # Keep part of the Lambda timeout for scheduling and the DynamoDB write
+        deadline = Deadline.from_context(context, reserve_seconds=RESPONSE_RESERVE_SECONDS)
+        reminder_schedule_json = get_reminder_schedule_json(reminder_text, deadline)
 
         # Generate EventBridge expression
         expression = generate_eventbridge_expression(
@@ -55,102 +324,53 @@ def handler(event, context):
 
         reminder_scheduled_message = generate_reminder_summary(reminder_schedule_json)
 
-        rule_name = f"reminder_{reminder_id}"
-
-        if is_one_time_schedule(expression):
-            scheduler.create_schedule(
-                Name=rule_name,
-                ScheduleExpression=expression,
-                ScheduleExpressionTimezone="Asia/Kolkata",
-                FlexibleTimeWindow={
-                    'Mode': 'OFF'
-                },
-                Target={
-                    'Arn': EVENTBRIDGE_TARGET,
-                    'RoleArn': SCHEDULER_ROLE_ARN ,
-                    'Input': json.dumps({
-                        "device_id": device_id,
-                        "reminder_id": reminder_id
-                    })  # Pass device_id and reminder_id as Input
-                }
-            )
-            print("One-time EventBridge Scheduler job created successfully.")
-        else:
-            # Create the EventBridge rule
-            rule_response = events.put_rule(
-                Name=rule_name,
-                ScheduleExpression=expression,
-                State="ENABLED",
-                Description=f"Reminder: {reminder_scheduled_message}",
-            )
-            # Attach target to the rule
-            target_response = events.put_targets(
-                Rule=rule_name,
-                Targets=[
-                    {
-                        "Id": f"Target_{reminder_id}",
-                        "Arn": EVENTBRIDGE_TARGET,  # Target Lambda or other service
-                        "Input": json.dumps({
-                            "device_id": device_id,
-                            "reminder_id": reminder_id
-                        }),
-                    }
-                ]
-            )
-            print("EventBridge rule and target created successfully.")
-            print("Rule Response:", rule_response)
-            print("Target Response:", target_response)
+        reminder_item = build_reminder_item(
+            device_id, reminder_id, reminder_schedule_json, expression, reminder_scheduled_message, previous_version
+        )
+        create_reminder_schedule(rule_name, reminder_item)
 
         # Add the reminder entry to DynamoDB directly
         reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
-        reminder_schedule_json["PK"] = f"CUSTOMER#{device_id}"
-        reminder_schedule_json["SK"] = f"REMINDER#{reminder_id}"
-        reminder_schedule_json["reminder_scheduled_message"] = reminder_scheduled_message
-        reminder_schedule_json["eventbridge_expression"] = expression
-        reminder_schedule_json["is_completed"] = False
-        reminder_schedule_json["created_at"] = datetime.now().isoformat()
-        reminder_schedule_json["updated_at"] = datetime.now().isoformat()
-        reminder_schedule_json["time"] = dateparser.parse(reminder_schedule_json["time"]).strftime('%I:%M %p')
         # Insert the reminder into DynamoDB
-        reminders_table.put_item(Item=reminder_schedule_json)
+        reminders_table.put_item(Item=reminder_item)
 
         # Send success response with reminder ID
-        return {
-            "statusCode": 200,
-            "body": json.dumps({
-                "message": "Reminder scheduled successfully",
-                "reminder_id": reminder_id,
-                "reminder_scheduled_message": reminder_scheduled_message
-            }),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",  # or specify your domain
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-        }
+        return json_response(200, {
+            "message": "Reminder scheduled successfully",
+            "reminder_id": reminder_id,
+            "reminder_scheduled_message": reminder_scheduled_message
+        })
+
+    except ReminderNeedsConfirmation as e:
+        # The LLM timed out; a rules guess is returned for the user to confirm, not scheduled
+        print(f"Reminder {reminder_id} needs confirmation: {e}")
+        return json_response(503, {
+            "error": "Reminder could not be parsed reliably, please confirm it",
+            "status": "needs_confirmation",
+            "reminder_id": reminder_id,
+            "reminder_data": e.parsed_data
+        })
+
+    except LLMDeadlineExceeded as e:
+        print(f"Timed out parsing reminder: {e}")
+        send_to_reminders_queue(device_id, reminder_id, reminder_text, rule_name, e)
+        return json_response(504, {"error": "Timed out parsing reminder"})
+
+    except ValueError as e:
+        # e.g. a time or date no resolver understands; retrying the same text will not help
+        print(f"Error understanding reminder: {e}")
+        return json_response(400, {"error": "Could not understand reminder text"})
 
     except ClientError as e:
         print(f"Error scheduling reminder: {e}")
         
         # On failure, send the reminder entry to SQS for error handling
-        sqs.send_message(
-            QueueUrl=REMINDERS_QUEUE_URL,
-            MessageBody=json.dumps({
-                "device_id": device_id,
-                "reminder_id": reminder_id,
-                "reminder_text": reminder_text,
-                "rule_name": rule_name,
-                "error": str(e)
-            })
-        )
+        send_to_reminders_queue(device_id, reminder_id, reminder_text, rule_name, e)
 
         # Return an error response
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Failed to schedule reminder"}),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",  # or specify your domain
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-        }
+        return json_response(500, {"error": "Failed to schedule reminder"})
+
+    except Exception as e:
+        # e.g. the model returned JSON that does not match the Reminder schema
+        print(f"Error processing reminder: {e}")
+        return json_response(500, {"error": "Failed to schedule reminder"})
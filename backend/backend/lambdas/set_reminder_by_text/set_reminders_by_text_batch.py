@@ -0,0 +1,177 @@
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from helpers import (
+    parse_reminder_texts,
+    resolve_reminder_schedule,
+    generate_reminder_summary,
+    generate_eventbridge_expression
+)
+from llm_invoker import Deadline
+from set_reminder_by_text import (
+    dynamodb,
+    REMINDERS_TABLE_NAME,
+    RESPONSE_RESERVE_SECONDS,
+    create_reminder_schedule,
+    delete_reminder_schedule,
+    get_reminder_versions,
+    build_reminder_item
+)
+from responses import json_response, parse_body
+
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "50"))
+SCHEDULING_CONCURRENCY = int(os.getenv("SCHEDULING_CONCURRENCY", "8"))
+
+
+def schedule_batch_entry(entry):
+    """Creates the schedule for one prepared batch entry, recording the outcome on the entry."""
+    try:
+        create_reminder_schedule(entry["rule_name"], entry["reminder_item"])
+        entry["status"] = "scheduled"
+    except ClientError as e:
+        print(f"Error scheduling reminder {entry['reminder_id']}: {e}")
+        entry["status"] = "failed"
+        entry["error"] = str(e)
+    return entry
+
+
+def write_reminder_items(reminders_table, entries):
+    """
+    Writes the items of scheduled entries. If the batch write fails, the items are written one by
+    one so only the entries that really failed are rolled back: their schedule is deleted and they
+    are marked failed, for the client to send again.
+    """
+    try:
+        with reminders_table.batch_writer() as batch:
+            for entry in entries:
+                batch.put_item(Item=entry["reminder_item"])
+        return
+    except ClientError as e:
+        print(f"Batch write of reminder items failed, writing them one by one: {e}")
+
+    for entry in entries:
+        try:
+            # Items the batch already wrote are simply overwritten with the same content
+            reminders_table.put_item(Item=entry["reminder_item"])
+        except ClientError as e:
+            print(f"Error saving reminder {entry['reminder_id']}: {e}")
+            entry["status"] = "failed"
+            entry["error"] = str(e)
+            try:
+                delete_reminder_schedule(entry["rule_name"], entry["reminder_item"])
+            except ClientError as delete_error:
+                print(f"Could not delete schedule {entry['rule_name']}: {delete_error}")
+
+
+def handler(event, context):
+    body = parse_body(event)
+    device_id = body.get("device_id")
+    reminders = body.get("reminders") or []
+
+    if not device_id or not reminders or not all(isinstance(r, dict) and r.get("text") for r in reminders):
+        return json_response(400, {"error": "device_id and reminders (each with text) are required"})
+    if len(reminders) > BATCH_MAX_SIZE:
+        return json_response(400, {"error": f"At most {BATCH_MAX_SIZE} reminders can be sent in one batch"})
+
+    entries = []
+    client_ids = []
+    for index, reminder in enumerate(reminders):
+        # Client ids are used as strings throughout, as in the item keys and rule names
+        if reminder.get("reminder_id"):
+            reminder_id = str(reminder["reminder_id"])
+            client_ids.append(reminder_id)
+        else:
+            reminder_id = str(uuid.uuid4())
+        entries.append({
+            "index": index,
+            "device_id": device_id,
+            "reminder_id": reminder_id,
+            "rule_name": f"reminder_{reminder_id}",
+            "reminder_text": reminder["text"],
+        })
+    if len(client_ids) != len(set(client_ids)):
+        # Caught before anything is scheduled, as a repeated key fails the whole batch write
+        return json_response(400, {"error": "reminder_id values must be unique within a batch"})
+
+    try:
+        # Rewritten reminders get a higher reminder_version than the items they replace
+        previous_versions = get_reminder_versions(device_id, client_ids)
+    except ClientError as e:
+        print(f"Error reading reminder batch: {e}")
+        return json_response(500, {"error": "Failed to schedule reminders"})
+
+    # One LLM round-trip for every text the rules and the parse cache cannot answer. If it fails,
+    # only those texts fail; the others are still scheduled.
+    deadline = Deadline.from_context(context, reserve_seconds=RESPONSE_RESERVE_SECONDS)
+    parsed_results = parse_reminder_texts(
+        [entry["reminder_text"] for entry in entries], deadline, raise_llm_errors=False
+    )
+
+    schedulable_entries = []
+    for entry, (parsed_data, source) in zip(entries, parsed_results):
+        if source == "llm_error":
+            entry["status"] = "failed"
+            entry["error"] = "Failed to parse reminder"
+            continue
+        if parsed_data is None:
+            entry["status"] = "failed"
+            entry["error"] = "Timed out parsing reminder"
+            continue
+        try:
+            reminder_schedule_json = resolve_reminder_schedule(parsed_data)
+            if source == "rules_fallback":
+                # A best-effort guess made after the LLM timed out is returned for confirmation, not scheduled
+                entry["status"] = "needs_confirmation"
+                entry["error"] = "Reminder could not be parsed reliably, please confirm it"
+                entry["reminder_data"] = reminder_schedule_json
+                continue
+            entry["expression"] = generate_eventbridge_expression(
+                start_date=reminder_schedule_json["start_date"],
+                time_str=reminder_schedule_json["time"],
+                repeat_frequency=reminder_schedule_json.get("repeat_frequency")
+            )
+            entry["reminder_scheduled_message"] = generate_reminder_summary(reminder_schedule_json)
+            entry["reminder_item"] = build_reminder_item(
+                device_id,
+                entry["reminder_id"],
+                reminder_schedule_json,
+                entry["expression"],
+                entry["reminder_scheduled_message"],
+                previous_versions.get(entry["reminder_id"], 0)
+            )
+            entry["source"] = source
+            schedulable_entries.append(entry)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Error preparing reminder {entry['reminder_id']}: {e}")
+            entry["status"] = "failed"
+            entry["error"] = "Could not understand reminder text"
+
+    # EventBridge and Scheduler have no batch create API, so fan the calls out concurrently
+    with ThreadPoolExecutor(max_workers=SCHEDULING_CONCURRENCY) as executor:
+        list(executor.map(schedule_batch_entry, schedulable_entries))
+
+    scheduled_entries = [entry for entry in schedulable_entries if entry["status"] == "scheduled"]
+    if scheduled_entries:
+        write_reminder_items(dynamodb.Table(REMINDERS_TABLE_NAME), scheduled_entries)
+        scheduled_entries = [entry for entry in scheduled_entries if entry["status"] == "scheduled"]
+
+    results = []
+    for entry in entries:
+        result = {
+            "index": entry["index"],
+            "reminder_id": entry["reminder_id"],
+            "status": entry["status"],
+        }
+        if entry["status"] == "scheduled":
+            result["reminder_scheduled_message"] = entry["reminder_scheduled_message"]
+        else:
+            result["error"] = entry["error"]
+        if entry["status"] == "needs_confirmation":
+            result["reminder_data"] = entry["reminder_data"]
+        results.append(result)
+
+    return json_response(200, {
+        "message": f"Scheduled {len(scheduled_entries)} of {len(entries)} reminders",
+        "results": results
+    })
@@ -1,5 +1,4 @@
 import os
-import json
 import uuid
 import boto3
 from botocore.exceptions import ClientError
@@ -8,6 +7,15 @@ from helpers import (
     generate_reminder_summary,
     generate_eventbridge_expression
 )
+from schedule_expressions import (
+    SCHEDULING_MODE,
+    get_active_fields,
+    get_delivery_input,
+    get_dispatch_fields,
+    get_occurrence_fields,
+    get_schedule_fields
+)
+from responses import json_response, parse_body
 
 # Initialize AWS resources
 dynamodb = boto3.resource("dynamodb")
@@ -18,6 +26,8 @@ scheduler = boto3.client('scheduler')
 REMINDERS_TABLE_NAME = os.environ["REMINDERS_TABLE_NAME"]
 EVENTBRIDGE_TARGET = os.environ["EVENTBRIDGE_TARGET"]
 SCHEDULER_ROLE_ARN = os.environ["SCHEDULER_ROLE_ARN"]
+# In queue mode schedules put their Input on the delivery queue instead of invoking process_events
+SCHEDULE_TARGET_ARN = os.environ["DELIVERY_QUEUE_ARN"] if SCHEDULING_MODE == "queue" else EVENTBRIDGE_TARGET
 
 def is_one_time_schedule(expression):
     """
@@ -32,8 +42,77 @@ def is_one_time_schedule(expression):
     return expression.strip().startswith("at(")
 
 
+def get_reminder_version(reminders_table, device_id, reminder_id):
+    """The stored reminder_version of a reminder about to be rewritten, or 0 if it does not exist."""
+    item = reminders_table.get_item(
+        Key={"PK": f"CUSTOMER#{device_id}", "SK": f"REMINDER#{reminder_id}"},
+        ProjectionExpression="reminder_version"
+    ).get("Item")
+    return int(item.get("reminder_version", 0)) if item else 0
+
+
+def write_reminder_schedule(rule_name, reminder_item):
+    """
+    Creates, or overwrites, the Scheduler job (one-time) or EventBridge rule (recurring) of a
+    reminder, with its delivery payload as the target Input. Nothing is written in dispatcher mode.
+
+    Parameters:
+        rule_name (str): Name of the schedule or rule (reminder_{reminder_id}).
+        reminder_item (dict): The reminder item about to be written.
+    """
+    if SCHEDULING_MODE == "dispatcher":
+        # Delivered by the dispatch_due_reminders sweeper through next_fire_at on the item
+        return
+
+    expression = reminder_item["eventbridge_expression"]
+    reminder_id = reminder_item["SK"].split("#", 1)[1]
+    target_input = get_delivery_input(reminder_item)
+
+    if is_one_time_schedule(expression):
+        schedule = {
+            "Name": rule_name,
+            "ScheduleExpression": expression,
+            "ScheduleExpressionTimezone": "Asia/Kolkata",
+            "FlexibleTimeWindow": {
+                'Mode': 'OFF'
+            },
+            "Target": {
+                'Arn': SCHEDULE_TARGET_ARN,
+                'RoleArn': SCHEDULER_ROLE_ARN,
+                'Input': target_input
+            }
+        }
+        try:
+            scheduler.create_schedule(**schedule)
+            print("One-time EventBridge Scheduler job created successfully.")
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConflictException":
+                raise
+            # An edit of an existing reminder; its fires must carry the new Input
+            scheduler.update_schedule(**schedule)
+            print("One-time EventBridge Scheduler job updated successfully.")
+    else:
+        # Create the EventBridge rule, or update it in place
+        events.put_rule(
+            Name=rule_name,
+            ScheduleExpression=expression,
+            State="ENABLED"
+        )
+        events.put_targets(
+            Rule=rule_name,
+            Targets=[
+                {
+                    "Id": f"Target_{reminder_id}",
+                    "Arn": SCHEDULE_TARGET_ARN,
+                    "Input": target_input,
+                }
+            ]
+        )
+        print("EventBridge rule and target written successfully.")
+
+
 def handler(event, context):
-    body = json.loads(event["body"])
+    body = parse_body(event)
     device_id = body["device_id"]
     reminder_data = body["reminder_data"]
     reminder_id = body.get("reminder_id", str(uuid.uuid4()))
@@ -49,65 +128,43 @@ def handler(event, context):
         reminder_scheduled_message = generate_reminder_summary(reminder_data)
 
         rule_name = f"reminder_{reminder_id}"
-        
-        if is_one_time_schedule(expression):
-            scheduler.create_schedule(
-                Name=rule_name,
-                ScheduleExpression=expression,
-                ScheduleExpressionTimezone="Asia/Kolkata",
-                FlexibleTimeWindow={
-                    'Mode': 'OFF'
-                },
-                Target={
-                    'Arn': EVENTBRIDGE_TARGET,
-                    'RoleArn': SCHEDULER_ROLE_ARN 
-                }
-            )
-            print("One-time EventBridge Scheduler job created successfully.")
-        else:
-            # Create the EventBridge rule
-            events.put_rule(
-                Name=rule_name,
-                ScheduleExpression=expression,
-                State="ENABLED"
-            )
-
-        # Add the reminder entry to DynamoDB directly
         reminders_table = dynamodb.Table(REMINDERS_TABLE_NAME)
+        # Edits outrank the item they replace, so fires built from it are recognised as stale
+        previous_version = get_reminder_version(reminders_table, device_id, reminder_id) if "reminder_id" in body else 0
+
         reminder_data["PK"] = f"CUSTOMER#{device_id}"
         reminder_data["SK"] = f"REMINDER#{reminder_id}"
         reminder_data["reminder_scheduled_message"] = reminder_scheduled_message
         reminder_data["eventbridge_expression"] = expression
         reminder_data["is_completed"] = False
+        reminder_data["reminder_version"] = previous_version + 1
         reminder_data["created_at"] = datetime.now().isoformat()
         reminder_data["updated_at"] = datetime.now().isoformat()
+        reminder_data.update(get_schedule_fields(
+            reminder_data["start_date"], reminder_data["time"], reminder_data.get("end_date")
+        ))
+        reminder_data.update(get_occurrence_fields(expression, reminder_data.get("start_at")))
+        reminder_data.update(get_active_fields(
+            device_id, expression, reminder_data.get("start_at"), reminder_data.get("end_date")
+        ))
+        if SCHEDULING_MODE == "dispatcher":
+            reminder_data.update(get_dispatch_fields(
+                expression, reminder_id, datetime.utcnow(), reminder_data.get("end_date")
+            ))
+
+        write_reminder_schedule(rule_name, reminder_data)
+
         # Insert the reminder into DynamoDB
         reminders_table.put_item(Item=reminder_data)
 
         # Send success response with reminder ID
-        return {
-            "statusCode": 200,
-            "body": json.dumps({
-                "message": "Reminder scheduled successfully",
-                "reminder_id": reminder_id,
-                "reminder_scheduled_message": reminder_scheduled_message
-            }),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",  # or specify your domain
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-        }
+        return json_response(200, {
+            "message": "Reminder scheduled successfully",
+            "reminder_id": reminder_id,
+            "reminder_scheduled_message": reminder_scheduled_message
+        })
 
     except ClientError as e:
         print(f"Error scheduling reminder: {e}")
         # Return an error response
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Failed to schedule reminder"}),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",  # or specify your domain
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-        }
+        return json_response(500, {"error": "Failed to schedule reminder"})
@@ -0,0 +1,96 @@
+# Shared by every API Lambda asset, which are packaged separately: keep every copy of this file
+# identical (tests/unit/test_responses.py checks this).
+import os
+import json
+import gzip
+import base64
+from decimal import Decimal
+from datetime import date, datetime
+
+# Bodies at least this large are gzip-compressed for clients that accept it
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", "8192"))
+# Marks the ETag of a compressed body, which is a different representation of the same content
+GZIP_ETAG_SUFFIX = "-gzip"
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",  # or specify your domain
+    "Access-Control-Allow-Headers": "Content-Type,If-None-Match",
+    "Access-Control-Allow-Methods": "OPTIONS,POST,GET",
+    "Access-Control-Expose-Headers": "ETag",
+}
+
+
+class DynamoDBEncoder(json.JSONEncoder):
+    """
+    Serializes DynamoDB items as they come back from boto3: Decimal becomes int or float, sets
+    become lists and datetimes ISO strings, while encoding, so items need no converted copy.
+    """
+
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return int(obj) if obj % 1 == 0 else float(obj)
+        if isinstance(obj, (set, frozenset)):
+            return list(obj)
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        return super().default(obj)
+
+
+def to_json(payload):
+    return json.dumps(payload, cls=DynamoDBEncoder)
+
+
+def get_header(event, name):
+    """Header value from an API Gateway proxy event; header names are case-insensitive."""
+    for header, value in ((event or {}).get("headers") or {}).items():
+        if header.lower() == name.lower():
+            return value
+    return None
+
+
+def get_gzip_etag(etag):
+    """The ETag of the gzip-compressed variant of a representation: '"3"' -> '"3-gzip"'."""
+    return f"{etag[:-1]}{GZIP_ETAG_SUFFIX}\""
+
+
+def parse_body(event):
+    """
+    The JSON request body of an API Gateway proxy event, {} if there is none.
+
+    With binary media types enabled, API Gateway hands some bodies over base64-encoded.
+    """
+    body = (event or {}).get("body") or "{}"
+    if event.get("isBase64Encoded"):
+        body = base64.b64decode(body).decode("utf-8")
+    return json.loads(body)
+
+
+def json_response(status_code, payload=None, event=None, headers=None, body=None):
+    """
+    Builds an API Gateway proxy response.
+
+    Args:
+        status_code (int): HTTP status code.
+        payload: Anything DynamoDBEncoder can serialize; ignored when body is given.
+        event (dict): The request, used to honour Accept-Encoding.
+        headers (dict): Extra response headers; an ETag is marked as such when the body is compressed.
+        body (str): An already serialized JSON body.
+    """
+    if body is None:
+        body = to_json(payload) if payload is not None else ""
+    response_headers = {**CORS_HEADERS, "Content-Type": "application/json", **(headers or {})}
+
+    accept_encoding = get_header(event, "Accept-Encoding") or ""
+    if len(body) >= GZIP_MIN_BYTES and "gzip" in accept_encoding.lower():
+        response_headers["Content-Encoding"] = "gzip"
+        response_headers["Vary"] = "Accept-Encoding"
+        if "ETag" in response_headers:
+            response_headers["ETag"] = get_gzip_etag(response_headers["ETag"])
+        return {
+            "statusCode": status_code,
+            "body": base64.b64encode(gzip.compress(body.encode("utf-8"), compresslevel=5)).decode("ascii"),
+            "isBase64Encoded": True,
+            "headers": response_headers,
+        }
+
+    return {"statusCode": status_code, "body": body, "headers": response_headers}
@@ -1,8 +1,8 @@
 import os
 import uuid
 import boto3
-import json
 from datetime import datetime
+from responses import json_response, parse_body
 
 dynamodb = boto3.resource('dynamodb')
 FEEDBACK_TABLE_NAME = os.getenv("FEEDBACK_TABLE_NAME")
@@ -10,7 +10,7 @@ feedback_table = dynamodb.Table(FEEDBACK_TABLE_NAME)
 
 def handler(event, context):
     try:
-        body = json.loads(event.get("body", "{}"))
+        body = parse_body(event)
         feedback_id = str(uuid.uuid4())
         
         # Extract fields
@@ -22,15 +22,7 @@ def handler(event, context):
 
         # Validate inputs
         if not email or not category or not feedback_text:
-            return {
-                "statusCode": 400,
-                "body": json.dumps({"message": "All fields are required."}),
-                "headers": {
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "Content-Type",
-                    "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-                },
-            }
+            return json_response(400, {"message": "All fields are required."})
         
         # Save to DynamoDB
         feedback_table.put_item(
@@ -44,24 +36,7 @@ def handler(event, context):
             }
         )
 
-        return {
-            "statusCode": 200,
-            "body": json.dumps({"message": "Feedback submitted successfully!"}),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-
-        }
+        return json_response(200, {"message": "Feedback submitted successfully!"})
 
     except Exception as e:
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": str(e)}),
-            "headers": {
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Content-Type",
-                "Access-Control-Allow-Methods": "OPTIONS,POST,GET"
-            },
-        }
+        return json_response(500, {"error": str(e)})
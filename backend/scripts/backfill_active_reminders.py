@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+One-off backfill of the ActiveRemindersIndex attributes on existing reminders.
+
+get-reminder-list reads upcoming reminders from the sparse ActiveRemindersIndex, which only
+holds items carrying active_device. Reminders written before the index existed do not have
+it, so this scans RemindersTable and adds active_device and active_fire_at (computed by
+schedule_expressions.get_active_fields, as the write paths do) to every reminder that is not
+completed and has not failed. Updates are conditional, so the script can be re-run safely.
+
+Usage:
+    python scripts/backfill_active_reminders.py --table RemindersTable [--dry-run] [--segments 4]
+"""
+import os
+import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "lambdas", "get_reminder_list"))
+
+import boto3
+from botocore.exceptions import ClientError
+from schedule_expressions import get_active_fields
+
+
+def backfill_segment(table, segment, total_segments, dry_run):
+    """Scans one parallel-scan segment. Returns (updated, skipped) counts."""
+    updated = skipped = 0
+    conditions = boto3.dynamodb.conditions
+    scan_kwargs = {
+        "FilterExpression": conditions.Attr("SK").begins_with("REMINDER#")
+        & conditions.Attr("active_device").not_exists()
+        & (conditions.Attr("is_completed").not_exists() | conditions.Attr("is_completed").eq(False))
+        & (conditions.Attr("status").not_exists() | conditions.Attr("status").ne("FAILED")),
+        "ProjectionExpression": "PK, SK, eventbridge_expression, start_at, end_date",
+        "Segment": segment,
+        "TotalSegments": total_segments,
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            fields = get_active_fields(
+                item["PK"].split("#", 1)[1], item.get("eventbridge_expression"), item.get("start_at"), item.get("end_date")
+            )
+            if dry_run:
+                print(f"Would update {item['PK']} {item['SK']}: {fields}")
+                updated += 1
+                continue
+
+            try:
+                table.update_item(
+                    Key={"PK": item["PK"], "SK": item["SK"]},
+                    UpdateExpression="SET active_device = :active_device, active_fire_at = :active_fire_at",
+                    ConditionExpression="attribute_exists(PK) AND attribute_not_exists(active_device) "
+                                        "AND (attribute_not_exists(is_completed) OR is_completed = :not_completed)",
+                    ExpressionAttributeValues={
+                        ":active_device": fields["active_device"],
+                        ":active_fire_at": fields["active_fire_at"],
+                        ":not_completed": False,
+                    },
+                )
+                updated += 1
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+                skipped += 1  # Completed, rewritten or deleted since the scan
+        if "LastEvaluatedKey" not in response:
+            return updated, skipped
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", default=os.getenv("REMINDERS_TABLE_NAME", "RemindersTable"))
+    parser.add_argument("--segments", type=int, default=4, help="parallel scan segments")
+    parser.add_argument("--dry-run", action="store_true", help="print the updates without writing them")
+    args = parser.parse_args()
+
+    table = boto3.resource("dynamodb").Table(args.table)
+    with ThreadPoolExecutor(max_workers=args.segments) as executor:
+        results = list(executor.map(
+            lambda segment: backfill_segment(table, segment, args.segments, args.dry_run),
+            range(args.segments)
+        ))
+
+    print(f"Updated {sum(updated for updated, _ in results)} reminders, skipped {sum(skipped for _, skipped in results)}")
+
+
+if __name__ == "__main__":
+    main()
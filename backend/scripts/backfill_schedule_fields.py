@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+One-off backfill of the canonical schedule fields on existing reminders.
+
+Reminders written before start_at, end_at, minutes_of_day and timezone were stored only have
+the start_date, end_date and time strings. This scans RemindersTable and adds the fields
+(computed by schedule_expressions.get_schedule_fields, the same function the set-reminder
+handlers use) to every reminder that does not have them yet. Items are updated with a
+condition on timezone not existing, so running it again, or alongside live writes, is safe.
+
+Usage:
+    python scripts/backfill_schedule_fields.py --table RemindersTable [--dry-run] [--segments 4]
+"""
+import os
+import sys
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "lambdas", "get_reminder_list"))
+
+import boto3
+from botocore.exceptions import ClientError
+from schedule_expressions import get_schedule_fields
+
+
+def backfill_segment(table, segment, total_segments, dry_run):
+    """Scans one parallel-scan segment. Returns (updated, skipped) counts."""
+    updated = skipped = 0
+    scan_kwargs = {
+        "FilterExpression": boto3.dynamodb.conditions.Attr("SK").begins_with("REMINDER#")
+        & boto3.dynamodb.conditions.Attr("timezone").not_exists(),
+        "ProjectionExpression": "PK, SK, start_date, end_date, #time",
+        "ExpressionAttributeNames": {"#time": "time"},
+        "Segment": segment,
+        "TotalSegments": total_segments,
+    }
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            fields = get_schedule_fields(item.get("start_date"), item.get("time"), item.get("end_date"))
+            if "start_at" not in fields:
+                print(f"Skipping {item['PK']} {item['SK']}: cannot parse {item.get('start_date')!r} {item.get('time')!r}")
+                skipped += 1
+                continue
+            if dry_run:
+                print(f"Would update {item['PK']} {item['SK']}: {fields}")
+                updated += 1
+                continue
+
+            names = {f"#{name}": name for name in fields}
+            values = {f":{name}": value for name, value in fields.items()}
+            try:
+                table.update_item(
+                    Key={"PK": item["PK"], "SK": item["SK"]},
+                    UpdateExpression="SET " + ", ".join(f"#{name} = :{name}" for name in fields),
+                    ConditionExpression="attribute_exists(PK) AND attribute_not_exists(#timezone)",
+                    ExpressionAttributeNames=names,
+                    ExpressionAttributeValues=values,
+                )
+                updated += 1
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+                skipped += 1  # Rewritten or deleted since the scan
+        if "LastEvaluatedKey" not in response:
+            return updated, skipped
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", default=os.getenv("REMINDERS_TABLE_NAME", "RemindersTable"))
+    parser.add_argument("--segments", type=int, default=4, help="parallel scan segments")
+    parser.add_argument("--dry-run", action="store_true", help="print the updates without writing them")
+    args = parser.parse_args()
+
+    table = boto3.resource("dynamodb").Table(args.table)
+    with ThreadPoolExecutor(max_workers=args.segments) as executor:
+        results = list(executor.map(
+            lambda segment: backfill_segment(table, segment, args.segments, args.dry_run),
+            range(args.segments)
+        ))
+
+    print(f"Updated {sum(updated for updated, _ in results)} reminders, skipped {sum(skipped for _, skipped in results)}")
+
+
+if __name__ == "__main__":
+    main()
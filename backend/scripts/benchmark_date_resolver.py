@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Times the compiled-pattern date resolver against dateparser on the phrases the parsers produce.
+
+Wall-clock comparisons depend on the machine and its load, so they are run here by hand rather
+than asserted in the unit suite.
+
+Usage:
+    python scripts/benchmark_date_resolver.py [--rounds 50]
+"""
+import os
+import sys
+import time
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "lambdas", "set_reminder_by_text"))
+
+import dateparser
+from date_resolver import resolve_date_phrase
+
+PHRASES = ["today", "tomorrow", "next friday", "in 3 days", "monday", "next week"]
+
+
+def time_calls(resolve, rounds):
+    """Seconds per call of resolve over every phrase, `rounds` times."""
+    started_at = time.perf_counter()
+    for _ in range(rounds):
+        for phrase in PHRASES:
+            resolve(phrase)
+    return (time.perf_counter() - started_at) / (rounds * len(PHRASES))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--rounds", type=int, default=50, help="Passes over the phrase list per resolver")
+    args = arg_parser.parse_args()
+
+    now = datetime.now()
+    resolver_seconds = time_calls(lambda phrase: resolve_date_phrase(phrase, now), args.rounds)
+    dateparser_seconds = time_calls(
+        lambda phrase: dateparser.parse(phrase, settings={'PREFER_DATES_FROM': 'future', 'RELATIVE_BASE': now}),
+        args.rounds
+    )
+    print(f"resolver:   {resolver_seconds * 1e6:9.1f} us/call")
+    print(f"dateparser: {dateparser_seconds * 1e6:9.1f} us/call")
+    print(f"speedup:    {dateparser_seconds / resolver_seconds:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
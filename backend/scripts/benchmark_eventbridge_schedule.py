@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Times the compiled EventBridge schedule engine against croniter, the library it replaced, on
+next-3 queries for weekday and every-few-days cron expressions.
+
+Wall-clock comparisons depend on the machine and its load, so they are run here by hand rather
+than asserted in the unit suite.
+
+Usage:
+    python scripts/benchmark_eventbridge_schedule.py [--runs 20]
+"""
+import os
+import re
+import sys
+import time
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "lambdas", "process_events"))
+
+from croniter import croniter
+from eventbridge_schedule import compile_expression
+
+START = datetime(2026, 10, 19, 3, 30)  # a Monday
+# AWS numbers days of the week from 1 (Sunday), croniter from 0; steps are left alone
+AWS_DAY_NUMBER = re.compile(r"(?<![/\d])([1-7])(?!\d)")
+
+
+def croniter_next_n(expression, after, count):
+    """The croniter path this engine replaced: drop the year and renumber days of the week."""
+    fields = expression[len("cron("):-1].split()[:5]
+    fields[4] = AWS_DAY_NUMBER.sub(lambda match: str(int(match.group(1)) - 1), fields[4])
+    cron_iter = croniter(" ".join(fields), after)
+    return [cron_iter.get_next(datetime) for _ in range(count)]
+
+
+def time_runs(next_n, expressions, runs):
+    started = time.perf_counter()
+    for _ in range(runs):
+        for expression in expressions:
+            next_n(expression)
+    return time.perf_counter() - started
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--runs", type=int, default=20, help="Passes over the expression list per engine")
+    args = arg_parser.parse_args()
+
+    expressions = [f"cron({minute} {minute % 24} ? * MON-FRI *)" for minute in range(60)]
+    expressions += [f"cron({minute} 3 1/{minute % 5 + 1} * ? *)" for minute in range(60)]
+    croniter_seconds = time_runs(lambda expression: croniter_next_n(expression, START, 3), expressions, args.runs)
+    compiled_seconds = time_runs(lambda expression: compile_expression(expression).next_n(START, 3), expressions, args.runs)
+
+    print(f"next 3 of {len(expressions)} expressions x{args.runs}: croniter {croniter_seconds * 1000:.1f} ms, "
+          f"compiled {compiled_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Times get_reminder_calendar's expansion of a month of occurrences for hundreds of reminders.
+
+Wall-clock budgets depend on the machine and its load, so they are checked here by hand rather
+than asserted in the unit suite.
+
+Usage:
+    python scripts/benchmark_reminder_calendar.py [--reminders 500] [--repeat 5]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import calendar
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend", "lambdas", "get_reminder_list"))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("REMINDERS_TABLE_NAME", "RemindersTable")
+
+import get_reminder_calendar
+
+
+def make_reminders(count):
+    """Daily, weekday, every-few-days and rate() reminders, all started before the range."""
+    random.seed(3)
+    expressions = [
+        f"cron({random.randint(0, 59)} {random.randint(0, 23)} * * ? *)",
+        f"cron({random.randint(0, 59)} {random.randint(0, 23)} ? * MON-FRI *)",
+        f"cron(0 {random.randint(0, 23)} 1/{random.randint(2, 5)} * ? *)",
+        f"rate({random.randint(1, 12)} hours)",
+    ]
+    start_at = calendar.timegm(datetime(2026, 9, 1).timetuple())
+    return [
+        {"PK": "CUSTOMER#device-1", "SK": f"REMINDER#{index}", "task": f"task {index}",
+         "eventbridge_expression": expressions[index % len(expressions)], "start_at": start_at,
+         "timezone": "Asia/Kolkata"}
+        for index in range(count)
+    ]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--reminders", type=int, default=500, help="Number of recurring reminders")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timed runs; the fastest is reported")
+    args = arg_parser.parse_args()
+
+    items = make_reminders(args.reminders)
+    from_epoch, to_epoch = get_reminder_calendar.parse_calendar_range("2026-10-01", "2026-10-31")
+    timings_ms = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        occurrences = get_reminder_calendar.expand_reminders(items, from_epoch, to_epoch)
+        timings_ms.append((time.perf_counter() - started) * 1000)
+    print(f"Expanded {len(occurrences)} occurrences of {len(items)} reminders in {min(timings_ms):.1f} ms (best of {args.repeat})")
+
+
+if __name__ == "__main__":
+    main()
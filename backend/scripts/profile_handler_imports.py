@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Prints import-time profiles for every Lambda handler.
+
+Each handler is imported in a fresh interpreter with `python -X importtime`, from its own
+asset directory, the same way the Lambda runtime loads it. The output lists the total
+init import time and the slowest modules by cumulative time.
+
+Usage:
+    python scripts/profile_handler_imports.py [--top 15] [handler_module ...]
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+LAMBDAS_DIR = os.path.join(os.path.dirname(__file__), "..", "backend", "lambdas")
+
+# (asset directory, handler module) for every function in backend_stack.py
+HANDLERS = [
+    ("set_reminder_by_text", "set_reminder_by_text"),
+    ("set_reminder_by_text", "set_reminders_by_text_batch"),
+    ("set_reminder_by_text", "process_reminder_jobs"),
+    ("set_reminder_manually", "set_reminder_manually"),
+    ("get_reminder_list", "get_reminder_list"),
+    ("get_reminder_list", "get_reminder_calendar"),
+    ("get_reminder_list", "rebuild_reminder_list_views"),
+    ("mark_reminder_complete", "mark_reminder_complete"),
+    ("process_events", "process_events"),
+    ("process_events", "dispatch_due_reminders"),
+    ("manage_customer_device_info", "manage_customer_device_info"),
+    ("submit_feedback", "submit_feedback"),
+]
+
+# Placeholder configuration so module-level os.environ lookups succeed outside Lambda
+HANDLER_ENV = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "REMINDERS_TABLE_NAME": "RemindersTable",
+    "REMINDERS_QUEUE_URL": "https://sqs.us-east-1.amazonaws.com/000000000000/RemindersQueue",
+    "CUSTOMER_DEVICES_TABLE_NAME": "CustomerDevices",
+    "FEEDBACK_TABLE_NAME": "FeedbackTable",
+    "EVENTBRIDGE_TARGET": "arn:aws:lambda:us-east-1:000000000000:function:ProcessEvents",
+    "SCHEDULER_ROLE_ARN": "arn:aws:iam::000000000000:role/SchedulerRole",
+    "FIREBASE_PROJECT_ID": "remindme",
+    "SERVICE_ACCOUNT_JSON": "{}",
+    "OPENAI_API_KEY": "profile",
+}
+
+
+def handler_env():
+    env = dict(os.environ)
+    for key, value in HANDLER_ENV.items():
+        env.setdefault(key, value)
+    return env
+
+
+def profile_handler(asset_dir, module):
+    """
+    Imports a handler module in a fresh interpreter and parses the -X importtime output.
+
+    Returns:
+        list: (cumulative_us, self_us, module_name) for every imported module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.join(LAMBDAS_DIR, asset_dir),
+        env=handler_env(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("modules", nargs="*", help="Handler modules to profile (default: all)")
+    arg_parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list per handler")
+    args = arg_parser.parse_args()
+
+    for asset_dir, module in HANDLERS:
+        if args.modules and module not in args.modules:
+            continue
+        timings = profile_handler(asset_dir, module)
+        total_us = next(cumulative for cumulative, _, name in timings if name.strip() == module)
+        print(f"\n{module} ({asset_dir}): {total_us / 1000:.1f} ms")
+        for cumulative_us, self_us, name in sorted(timings, reverse=True)[:args.top]:
+            print(f"  {cumulative_us / 1000:9.1f} ms cumulative {self_us / 1000:8.1f} ms self  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "scripts"))
+
+from profile_handler_imports import HANDLER_ENV
+
+# Handler modules read their configuration when they are imported; give them the import
+# profiler's placeholders so the suite runs from a clean shell
+for key, value in HANDLER_ENV.items():
+    os.environ.setdefault(key, value)
+# The stack attaches the dependency layer named here
+os.environ.setdefault("LAMBDA_LAYER_ARN", "arn:aws:lambda:us-east-1:000000000000:layer:Dependencies:1")
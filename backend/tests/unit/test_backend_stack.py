@@ -13,3 +13,36 @@ def test_sqs_queue_created():
 #     template.has_resource_properties("AWS::SQS::Queue", {
 #         "VisibilityTimeout": 300
 #     })
+
+
+def test_due_index_projects_what_the_dispatch_sweeper_reads():
+    app = core.App()
+    stack = RemindMeBackend(app, "backend")
+    template = assertions.Template.from_stack(stack)
+
+    template.has_resource_properties("AWS::DynamoDB::Table", {
+        "GlobalSecondaryIndexes": assertions.Match.array_with([assertions.Match.object_like({
+            "IndexName": "DueIndex",
+            "Projection": {
+                "ProjectionType": "INCLUDE",
+                "NonKeyAttributes": ["eventbridge_expression", "end_date", "retried_fire_at", "dispatch_attempts"],
+            },
+        })])
+    })
+
+
+def test_every_function_shipping_schedule_expressions_gets_the_dispatch_environment():
+    app = core.App()
+    stack = RemindMeBackend(app, "backend")
+    template = assertions.Template.from_stack(stack)
+
+    for handler in ("process_events.handler", "dispatch_due_reminders.handler", "get_reminder_list.handler",
+                    "rebuild_reminder_list_views.handler", "get_reminder_calendar.handler",
+                    "set_reminder_by_text.handler", "set_reminder_manually.handler"):
+        template.has_resource_properties("AWS::Lambda::Function", {
+            "Handler": handler,
+            "Environment": {"Variables": assertions.Match.object_like({
+                name: assertions.Match.any_value()
+                for name in ("SCHEDULING_MODE", "DISPATCH_BUCKET_SECONDS", "DISPATCH_SHARDS")
+            })},
+        })
@@ -0,0 +1,60 @@
+import os
+import sys
+from datetime import date, datetime
+
+import dateparser
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "set_reminder_by_text"))
+
+from date_resolver import resolve_date_phrase, resolve_time_phrase
+
+# A Monday afternoon, so weekday phrases that land on "today" are covered
+NOW = datetime(2026, 10, 19, 14, 30)
+
+
+@pytest.mark.parametrize("phrase, expected", [
+    ("today", date(2026, 10, 19)),
+    ("tonight", date(2026, 10, 19)),
+    ("tomorrow", date(2026, 10, 20)),
+    ("Day after tomorrow", date(2026, 10, 21)),
+    ("monday", date(2026, 10, 26)),
+    ("on Tuesday", date(2026, 10, 20)),
+    ("this friday", date(2026, 10, 23)),
+    ("next monday", date(2026, 10, 26)),
+    ("next tuesday", date(2026, 10, 27)),
+    ("coming monday", date(2026, 10, 26)),
+    ("next week", date(2026, 10, 26)),
+    ("next month", date(2026, 11, 19)),
+    ("in 3 days", date(2026, 10, 22)),
+    ("in two weeks", date(2026, 11, 2)),
+    ("25-12-2026", date(2026, 12, 25)),
+    ("2027-01-05", date(2027, 1, 5)),
+])
+def test_known_date_phrases(phrase, expected):
+    assert resolve_date_phrase(phrase, NOW) == expected
+
+
+@pytest.mark.parametrize("phrase", ["today", "tomorrow", "tuesday", "friday", "monday", "next week", "in 3 days"])
+def test_known_date_phrases_agree_with_dateparser(phrase):
+    parsed = dateparser.parse(phrase, settings={'PREFER_DATES_FROM': 'future', 'RELATIVE_BASE': NOW})
+
+    assert resolve_date_phrase(phrase, NOW) == parsed.date()
+
+
+def test_unknown_date_phrase_falls_back_to_dateparser():
+    assert resolve_date_phrase("5th march", NOW) == date(2027, 3, 5)
+
+
+@pytest.mark.parametrize("time_str, expected", [
+    ("09:00 AM", "09:00 AM"),
+    ("6 pm", "06:00 PM"),
+    ("5:38 p.m.", "05:38 PM"),
+    ("18:00", "06:00 PM"),
+    ("00:15", "12:15 AM"),
+    ("noon", "12:00 PM"),
+    ("midnight", "12:00 AM"),
+    ("morning", "08:00 AM"),
+])
+def test_time_phrases(time_str, expected):
+    assert resolve_time_phrase(time_str) == expected
@@ -0,0 +1,393 @@
+import os
+import sys
+import json
+import threading
+import time
+from datetime import date
+
+import pytest
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "process_events"))
+
+import process_events
+from device_token_cache import DeviceTokenCache
+from schedule_expressions import get_delivery_input
+
+
+@pytest.fixture(autouse=True)
+def empty_device_token_cache(monkeypatch):
+    monkeypatch.setattr(process_events, "device_token_cache", DeviceTokenCache())
+
+
+class FakeDynamoDB:
+    """Serves BatchGetItem from RemindersTable items and DeviceIdIndex queries from device tokens."""
+
+    def __init__(self, reminders, device_tokens, unprocessed_once=False, failing_devices=()):
+        self.reminders = {(item["PK"], item["SK"]): item for item in reminders}
+        self.device_tokens = device_tokens
+        self.failing_devices = set(failing_devices)
+        self.unprocessed_once = unprocessed_once
+        self.batch_gets = []
+        self.gets = []
+        self.device_queries = []
+        self.updates = []
+        self.pruned = []
+        self.lock = threading.Lock()
+
+    def batch_get_item(self, RequestItems):
+        keys = RequestItems[process_events.REMINDERS_TABLE_NAME]["Keys"]
+        assert RequestItems[process_events.REMINDERS_TABLE_NAME]["ConsistentRead"]
+        self.batch_gets.append(len(keys))
+        if self.unprocessed_once and len(keys) > 1:
+            self.unprocessed_once = False
+            processed, unprocessed = keys[:1], keys[1:]
+        else:
+            processed, unprocessed = keys, []
+        response = {"Responses": {process_events.REMINDERS_TABLE_NAME: [
+            self.reminders[(key["PK"], key["SK"])] for key in processed if (key["PK"], key["SK"]) in self.reminders
+        ]}}
+        if unprocessed:
+            response["UnprocessedKeys"] = {process_events.REMINDERS_TABLE_NAME: {"Keys": unprocessed, "ConsistentRead": True}}
+        return response
+
+    def Table(self, name):
+        return self
+
+    def query(self, IndexName, KeyConditionExpression):
+        device_id = KeyConditionExpression.get_expression()["values"][1]
+        with self.lock:
+            self.device_queries.append(device_id)
+        if device_id in self.failing_devices:
+            raise RuntimeError("throttled")
+        token = self.device_tokens.get(device_id)
+        device = {"PK": f"CUSTOMER#owner-of-{device_id}", "SK": f"DEVICE#{device_id}", "device_id": device_id}
+        return {"Items": [dict(device, device_token_id=token)] if token else []}
+
+    def get_item(self, Key, ConsistentRead=False, **kwargs):
+        self.gets.append((Key["SK"], ConsistentRead))
+        item = self.reminders.get((Key["PK"], Key["SK"]))
+        return {"Item": item} if item else {}
+
+    def update_item(self, **kwargs):
+        key, values = kwargs["Key"], kwargs["ExpressionAttributeValues"]
+        if key["SK"].startswith("DEVICE#"):
+            with self.lock:
+                self.pruned.append((key["SK"], values[":device_token_id"]))
+            return
+        item = self.reminders.get((key["PK"], key["SK"]), {})
+        if ":reminder_version" in values and item.get("reminder_version") != values[":reminder_version"]:
+            raise ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem")
+        with self.lock:
+            self.updates.append(key)
+
+
+def reminder(device_id, reminder_id):
+    return {"PK": f"CUSTOMER#{device_id}", "SK": f"REMINDER#{reminder_id}", "task": f"task {reminder_id}",
+            "eventbridge_expression": "cron(30 3 * * ? *)", "start_at": 1577849400, "timezone": "Asia/Kolkata"}
+
+
+def record(message_id, device_id, reminder_id):
+    return {"messageId": message_id, "body": json.dumps({"device_id": device_id, "reminder_id": reminder_id})}
+
+
+def payload_record(message_id, item):
+    return {"messageId": message_id, "body": get_delivery_input(item)}
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    sends = []
+    lock = threading.Lock()
+
+    def send_push_notification(device_token_id, task, reminder_message, **kwargs):
+        with lock:
+            sends.append((device_token_id, task))
+        return {"status": "Notification sent"}
+
+    monkeypatch.setattr(process_events, "send_push_notification", send_push_notification)
+    return sends
+
+
+def test_batch_reads_reminders_once_and_looks_up_each_device_once(monkeypatch, sent):
+    reminders = [reminder(f"device-{index % 3}", f"r{index}") for index in range(150)]
+    fake = FakeDynamoDB(reminders, {f"device-{index}": f"token-{index}" for index in range(3)})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+    records = [record(f"m{index}", f"device-{index % 3}", f"r{index}") for index in range(150)]
+
+    response = process_events.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": []}
+    assert fake.batch_gets == [100, 50]
+    assert sorted(fake.device_queries) == ["device-0", "device-1", "device-2"]
+    assert sorted(sent) == sorted((f"token-{index % 3}", f"task r{index}") for index in range(150))
+    assert len(fake.updates) == 150  # Every recurring reminder's next_occurrences moved on
+
+
+def test_unprocessed_keys_are_retried(monkeypatch, sent):
+    fake = FakeDynamoDB([reminder("device-1", "a"), reminder("device-1", "b")], {"device-1": "token-1"},
+                        unprocessed_once=True)
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+
+    process_events.handler({"Records": [record("m1", "device-1", "a"), record("m2", "device-1", "b")]}, None)
+
+    assert fake.batch_gets == [2, 1]
+    assert len(sent) == 2
+
+
+def test_errors_are_reported_per_message_and_missing_items_dropped(monkeypatch, sent):
+    fake = FakeDynamoDB(
+        [reminder("device-1", "a"), reminder("flaky", "b"), reminder("unknown", "c")],
+        {"device-1": "token-1", "flaky": "token-2"},
+        failing_devices={"flaky"}
+    )
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+    records = [
+        record("ok", "device-1", "a"),
+        record("throttled", "flaky", "b"),
+        record("no-device", "unknown", "c"),
+        record("no-reminder", "device-1", "deleted"),
+        {"messageId": "malformed", "body": "not json"},
+    ]
+
+    response = process_events.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "throttled"}]}
+    assert sent == [("token-1", "task a")]
+
+
+def versioned_reminder(device_id, reminder_id, reminder_version=1):
+    return dict(reminder(device_id, reminder_id), reminder_version=reminder_version)
+
+
+def test_payload_fires_are_checked_with_the_same_batch_read(monkeypatch, sent):
+    items = [versioned_reminder("device-1", f"r{index}") for index in range(5)]
+    fake = FakeDynamoDB(items, {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+    records = [payload_record(f"m{index}", item) for index, item in enumerate(items)]
+    records.append(record("legacy", "device-1", "r0"))  # Schedule written before delivery payloads
+
+    response = process_events.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": []}
+    assert fake.batch_gets == [5]
+    assert len(sent) == 6 and len(fake.updates) == 6
+
+
+def test_direct_payload_fire_only_checks_its_version_once_the_device_is_cached(monkeypatch, sent):
+    item = versioned_reminder("device-1", "a")
+    fake = FakeDynamoDB([item], {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+    event = json.loads(get_delivery_input(item))
+
+    responses = [process_events.handler(event, None) for _ in range(2)]
+
+    assert [response["statusCode"] for response in responses] == [200, 200]
+    assert fake.gets == [("REMINDER#a", True)] * 2 and fake.device_queries == ["device-1"]
+    assert sent == [("token-1", "task a")] * 2
+
+
+def test_unknown_payload_versions_fall_back_to_reading_the_reminder(monkeypatch, sent):
+    item = versioned_reminder("device-1", "a")
+    fake = FakeDynamoDB([dict(item, task="task edited")], {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+    event = dict(json.loads(get_delivery_input(item)), payload_version=process_events.DELIVERY_PAYLOAD_VERSION + 1)
+
+    process_events.handler(event, None)
+
+    assert len(fake.gets) == 1
+    assert sent == [("token-1", "task edited")]
+
+
+def test_stale_payload_of_an_edited_reminder_is_not_sent(monkeypatch, sent, schedules):
+    item = versioned_reminder("device-1", "a")
+    fake = FakeDynamoDB([dict(item, reminder_version=2, task="task edited")], {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+
+    response = process_events.handler(json.loads(get_delivery_input(item)), None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["reason"] == "stale"
+    assert sent == [] and fake.updates == []
+    assert schedules.disabled_rules == []  # The edit rewrote the schedule
+
+
+def test_batch_drops_payload_fires_of_edited_and_deleted_reminders(monkeypatch, sent, schedules):
+    current, edited, deleted = (versioned_reminder("device-1", reminder_id) for reminder_id in ("a", "b", "c"))
+    fake = FakeDynamoDB([current, dict(edited, reminder_version=2)], {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+    records = [payload_record(f"m{index}", item) for index, item in enumerate((current, edited, deleted))]
+
+    response = process_events.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": []}
+    assert sent == [("token-1", "task a")]
+    assert schedules.disabled_rules == [] and schedules.deleted_schedules == []
+
+
+class FakeSchedules:
+    """Records the rules disabled and Scheduler jobs deleted for reminders that are over."""
+
+    def __init__(self):
+        self.disabled_rules = []
+        self.deleted_schedules = []
+
+    def disable_rule(self, Name):
+        self.disabled_rules.append(Name)
+
+    def delete_schedule(self, Name):
+        self.deleted_schedules.append(Name)
+
+
+@pytest.fixture
+def schedules(monkeypatch):
+    fake = FakeSchedules()
+    monkeypatch.setattr(process_events, "events", fake)
+    monkeypatch.setattr(process_events, "scheduler", fake)
+    return fake
+
+
+@pytest.mark.parametrize("reminder_fields, today, expected", [
+    ({}, date(2026, 10, 19), None),
+    ({"is_completed": True}, date(2026, 10, 19), "completed"),
+    ({"end_date": "19-10-2026"}, date(2026, 10, 19), None),  # The last day still fires
+    ({"end_date": "19-10-2026"}, date(2026, 10, 20), "expired"),
+    ({"end_date": "None"}, date(2026, 10, 20), None),
+])
+def test_skip_reason(reminder_fields, today, expected):
+    assert process_events.get_skip_reason(dict(reminder("device-1", "a"), **reminder_fields), today) == expected
+
+
+def test_completed_reminder_is_not_sent_and_its_rule_is_disabled(monkeypatch, sent, schedules):
+    fake = FakeDynamoDB([dict(reminder("device-1", "a"), is_completed=True)], {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+
+    response = process_events.handler({"device_id": "device-1", "reminder_id": "a"}, None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["reason"] == "completed"
+    assert sent == [] and fake.updates == []
+    assert schedules.disabled_rules == ["reminder_a"]
+
+
+def test_expired_payload_fire_is_dropped(monkeypatch, sent, schedules):
+    item = dict(versioned_reminder("device-1", "a"), end_date="01-01-2020")
+    fake = FakeDynamoDB([item], {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+
+    process_events.handler(json.loads(get_delivery_input(item)), None)
+
+    assert sent == [] and fake.gets == [("REMINDER#a", True)]
+    assert schedules.disabled_rules == ["reminder_a"]
+
+
+def test_batch_skips_finished_reminders_and_stops_their_schedules(monkeypatch, sent, schedules):
+    one_time = dict(reminder("device-1", "once"), eventbridge_expression="at(2026-01-01T09:00:00)", is_completed=True)
+    fake = FakeDynamoDB([reminder("device-1", "a"), dict(reminder("device-1", "b"), is_completed=True), one_time],
+                        {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+    records = [record("m1", "device-1", "a"), record("m2", "device-1", "b"), record("m3", "device-1", "once")]
+
+    response = process_events.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": []}
+    assert sent == [("token-1", "task a")]
+    assert schedules.disabled_rules == ["reminder_b"]
+    assert schedules.deleted_schedules == ["reminder_once"]
+
+
+def test_stale_payload_of_a_completed_reminder_stops_its_rule(monkeypatch, sent, schedules):
+    item = versioned_reminder("device-1", "a")
+    fake = FakeDynamoDB([dict(item, reminder_version=2, is_completed=True)], {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+
+    process_events.handler(json.loads(get_delivery_input(item)), None)
+
+    assert sent == []
+    assert schedules.disabled_rules == ["reminder_a"]
+
+
+class FakeQueue:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, QueueUrl, MessageBody):
+        self.messages.append(json.loads(MessageBody))
+
+
+@pytest.fixture
+def dead_letter_queue(monkeypatch):
+    fake = FakeQueue()
+    monkeypatch.setattr(process_events, "sqs", fake)
+    monkeypatch.setattr(process_events, "NOTIFICATION_DEAD_LETTER_QUEUE_URL", "https://sqs/notification-dlq")
+    return fake
+
+
+def fcm_failure(status_code, error_code=None, retryable=False):
+    details = [{"@type": "type.googleapis.com/google.firebase.fcm.v1.FcmError", "errorCode": error_code}] if error_code else []
+    return {"status": "Failed", "status_code": status_code, "error": {"error": {"code": status_code, "details": details}},
+            "retryable": retryable, "attempts": 3 if retryable else 1}
+
+
+def test_batch_redelivers_retryable_failures_and_parks_permanent_ones(monkeypatch, dead_letter_queue):
+    outcomes = {"task a": {"status": "Notification sent"}, "task b": fcm_failure(503, retryable=True),
+                "task c": fcm_failure(400, "INVALID_ARGUMENT")}
+    monkeypatch.setattr(process_events, "send_push_notification", lambda token, task, message, **kwargs: outcomes[task])
+    fake = FakeDynamoDB([reminder("device-1", reminder_id) for reminder_id in "abc"], {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+    records = [record(f"m-{reminder_id}", "device-1", reminder_id) for reminder_id in "abc"]
+
+    response = process_events.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "m-b"}]}
+    assert sorted(key["SK"] for key in fake.updates) == ["REMINDER#a", "REMINDER#c"]  # b moves on when redelivered
+    assert [(message["reminder_id"], message["error_code"]) for message in dead_letter_queue.messages] == [
+        ("c", "INVALID_ARGUMENT")
+    ]
+
+
+def test_unregistered_token_is_pruned_and_parked(monkeypatch, dead_letter_queue):
+    monkeypatch.setattr(process_events, "send_push_notification", lambda *args, **kwargs: fcm_failure(404, "UNREGISTERED"))
+    fake = FakeDynamoDB([reminder("device-1", "a")], {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+
+    process_events.handler({"device_id": "device-1", "reminder_id": "a"}, None)
+
+    assert fake.pruned == [("DEVICE#device-1", "token-1")]
+    assert process_events.device_token_cache.get("device-1") is None
+    assert dead_letter_queue.messages[0]["error_code"] == "UNREGISTERED"
+    assert dead_letter_queue.messages[0]["device_token_id"] == "token-1"
+
+
+def test_direct_fire_parks_retryable_failures_it_gave_up_on(monkeypatch, dead_letter_queue):
+    monkeypatch.setattr(process_events, "send_push_notification", lambda *args, **kwargs: fcm_failure(429, retryable=True))
+    fake = FakeDynamoDB([reminder("device-1", "a")], {"device-1": "token-1"})
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+
+    response = process_events.handler({"device_id": "device-1", "reminder_id": "a"}, None)
+
+    assert response["statusCode"] == 200
+    assert dead_letter_queue.messages[0]["retryable"] is True
+    assert fake.pruned == []
+
+
+def test_batch_sends_once_and_leaves_retries_to_redelivery(monkeypatch):
+    send_kwargs = []
+    monkeypatch.setattr(process_events, "send_push_notification",
+                        lambda *args, **kwargs: send_kwargs.append(kwargs) or {"status": "Notification sent"})
+    monkeypatch.setattr(process_events, "dynamodb", FakeDynamoDB([reminder("device-1", "a")], {"device-1": "token-1"}))
+
+    process_events.process_delivery_batch([record("m1", "device-1", "a")], deadline=12345.0)
+
+    assert send_kwargs == [{"deadline": 12345.0, "retry": False}]
+
+
+def test_batch_reports_fires_it_has_no_time_left_for_without_sending(monkeypatch, dead_letter_queue):
+    transport_sends = []
+    monkeypatch.setattr(process_events.fcm_transport, "send", lambda *args, **kwargs: transport_sends.append(args))
+    monkeypatch.setattr(process_events, "dynamodb", FakeDynamoDB([reminder("device-1", "a")], {"device-1": "token-1"}))
+
+    response = process_events.process_delivery_batch([record("m1", "device-1", "a")], deadline=time.monotonic())
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "m1"}]}
+    assert transport_sends == [] and dead_letter_queue.messages == []
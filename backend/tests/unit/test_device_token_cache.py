@@ -0,0 +1,104 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "process_events"))
+
+import process_events
+from device_token_cache import DeviceTokenCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_and_least_recently_used_are_evicted():
+    clock = Clock()
+    cache = DeviceTokenCache(ttl_seconds=60, max_entries=2, clock=clock)
+    cache.put("a", "token-a")
+    cache.put("b", "token-b")
+    assert cache.get("a") == "token-a"
+
+    cache.put("c", "token-c")  # Evicts b, the least recently used
+    assert cache.get("b") is None
+    clock.now += 61
+    assert cache.get("a") is None and cache.get("c") is None
+
+
+def test_invalidate_only_drops_the_token_that_failed():
+    cache = DeviceTokenCache()
+    cache.put("a", "new-token")
+
+    cache.invalidate("a", "old-token")
+    assert cache.get("a") == "new-token"
+    cache.invalidate("a", "new-token")
+    assert cache.get("a") is None
+
+
+class FakeTables:
+    """CustomerDevices and RemindersTable for one device and one reminder, recording the calls made."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def Table(self, name):
+        return self
+
+    def query(self, **kwargs):
+        with self.lock:
+            self.calls.append("query")
+        return {"Items": [{"PK": "CUSTOMER#c1", "SK": "DEVICE#device-1", "device_id": "device-1", "device_token_id": "token-1"}]}
+
+    def update_item(self, **kwargs):
+        with self.lock:
+            self.calls.append("update_item")
+
+    def get_item(self, Key):
+        with self.lock:
+            self.calls.append("get_item")
+        return {"Item": {"PK": Key["PK"], "SK": Key["SK"], "task": "stretch", "eventbridge_expression": "at(2026-10-20T09:00:00)"}}
+
+
+@pytest.fixture
+def tables(monkeypatch):
+    fake = FakeTables()
+    monkeypatch.setattr(process_events, "dynamodb", fake)
+    monkeypatch.setattr(process_events, "device_token_cache", DeviceTokenCache())
+    return fake
+
+
+def fire():
+    return process_events.handler({"device_id": "device-1", "reminder_id": "r1"}, None)
+
+
+def test_warm_fire_reads_only_the_reminder(tables, monkeypatch):
+    monkeypatch.setattr(process_events, "send_push_notification", lambda *args, **kwargs: {"status": "Notification sent"})
+
+    assert fire()["statusCode"] == 200
+    assert sorted(tables.calls) == ["get_item", "query"]
+    tables.calls.clear()
+    assert fire()["statusCode"] == 200
+    assert tables.calls == ["get_item"]
+
+
+def test_unregistered_token_is_invalidated(tables, monkeypatch):
+    unregistered = {"status": "Failed", "error": {"error": {
+        "code": 404, "status": "NOT_FOUND",
+        "details": [{"@type": "type.googleapis.com/google.firebase.fcm.v1.FcmError", "errorCode": "UNREGISTERED"}]
+    }}}
+    monkeypatch.setattr(process_events, "send_push_notification", lambda *args, **kwargs: unregistered)
+
+    fire()
+    assert sorted(tables.calls) == ["get_item", "query", "query", "update_item"]  # Looked up, then pruned
+    tables.calls.clear()
+    monkeypatch.setattr(process_events, "send_push_notification", lambda *args, **kwargs: {"status": "Notification sent"})
+    fire()
+
+    assert sorted(tables.calls) == ["get_item", "query"]
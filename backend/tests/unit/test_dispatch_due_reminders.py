@@ -0,0 +1,115 @@
+import os
+import sys
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "process_events"))
+
+import dispatch_due_reminders
+from schedule_expressions import DISPATCH_BUCKET_SECONDS, DISPATCH_SHARDS
+
+
+class ConditionalCheckFailedException(Exception):
+    pass
+
+
+# What the DueIndex projects (see backend_stack)
+DUE_INDEX_ATTRIBUTES = ("PK", "SK", "fire_bucket", "next_fire_at", "eventbridge_expression", "end_date",
+                        "retried_fire_at", "dispatch_attempts")
+
+
+class FakeRemindersTable:
+    """
+    Serves one stored item from the DueIndex, with the attributes it projects, and applies the
+    release update to it, checking its last_fired_at condition.
+    """
+
+    def __init__(self, item):
+        self.item = dict(item)
+        self.meta = SimpleNamespace(client=SimpleNamespace(exceptions=SimpleNamespace(
+            ConditionalCheckFailedException=ConditionalCheckFailedException
+        )))
+
+    def Table(self, name):
+        return self
+
+    def query(self, IndexName, KeyConditionExpression):
+        return {"Items": [{key: value for key, value in self.item.items() if key in DUE_INDEX_ATTRIBUTES}]}
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression, ExpressionAttributeValues):
+        if self.item.get("last_fired_at") != ExpressionAttributeValues[":fired_at"]:
+            raise ConditionalCheckFailedException()
+        self.item.update(
+            next_fire_at=ExpressionAttributeValues[":claimed_fire_at"],
+            fire_bucket=ExpressionAttributeValues[":claimed_bucket"],
+            retried_fire_at=ExpressionAttributeValues[":claimed_fire_at"],
+            dispatch_attempts=ExpressionAttributeValues[":attempts"],
+        )
+
+
+NOW = datetime(2026, 10, 17, 9, 7)
+CLAIMED = {"PK": "CUSTOMER#device-1", "SK": "REMINDER#r1", "next_fire_at": 1_700_000_000, "fire_bucket": "472222#3"}
+
+
+@pytest.fixture
+def table(monkeypatch):
+    # The sweep has claimed the fire: it moved next_fire_at on and stamped last_fired_at
+    fake = FakeRemindersTable({**CLAIMED, "next_fire_at": 1_700_086_400, "fire_bucket": "472246#3",
+                               "last_fired_at": NOW.isoformat()})
+    monkeypatch.setattr(dispatch_due_reminders, "dynamodb", fake)
+    return fake
+
+
+def respond_with(monkeypatch, status_code):
+    monkeypatch.setattr(dispatch_due_reminders.process_events, "handler", lambda event, context: {"statusCode": status_code})
+
+
+def test_catchup_sweeps_reach_back_past_the_lookback():
+    regular = dispatch_due_reminders.get_due_buckets(NOW)
+    catchup = dispatch_due_reminders.get_due_buckets(NOW.replace(minute=0))
+
+    assert len(regular) == (dispatch_due_reminders.DISPATCH_LOOKBACK_BUCKETS + 1) * DISPATCH_SHARDS
+    assert len(catchup) == (dispatch_due_reminders.DISPATCH_CATCHUP_BUCKETS + 1) * DISPATCH_SHARDS
+    oldest_bucket = min(int(bucket.split("#")[0]) for bucket in catchup)
+    current_bucket = int(NOW.replace(minute=0, tzinfo=timezone.utc).timestamp()) // DISPATCH_BUCKET_SECONDS
+    assert oldest_bucket <= current_bucket - dispatch_due_reminders.DISPATCH_CATCHUP_BUCKETS
+
+
+def test_failed_delivery_puts_the_fire_back(table, monkeypatch):
+    respond_with(monkeypatch, 500)
+
+    assert dispatch_due_reminders.dispatch_reminder(CLAIMED, NOW) is False
+    assert table.item["next_fire_at"] == CLAIMED["next_fire_at"]
+    assert table.item["fire_bucket"] == CLAIMED["fire_bucket"]
+    assert table.item["dispatch_attempts"] == 1
+
+
+def test_missing_reminder_or_device_is_not_retried(table, monkeypatch):
+    respond_with(monkeypatch, 404)
+
+    assert dispatch_due_reminders.dispatch_reminder(CLAIMED, NOW) is False
+    assert table.item["next_fire_at"] == 1_700_086_400
+
+
+def test_fire_is_given_up_after_max_attempts(table, monkeypatch):
+    respond_with(monkeypatch, 500)
+    claimed_by_sweep = {key: table.item[key] for key in ("next_fire_at", "fire_bucket")}
+    table.item.update(CLAIMED, task="task r1", retried_fire_at=CLAIMED["next_fire_at"],
+                      dispatch_attempts=dispatch_due_reminders.DISPATCH_MAX_ATTEMPTS - 1)
+    [due] = dispatch_due_reminders.query_due_reminders(CLAIMED["fire_bucket"], CLAIMED["next_fire_at"])
+    table.item.update(claimed_by_sweep)
+
+    dispatch_due_reminders.dispatch_reminder(due, NOW)
+
+    assert table.item["next_fire_at"] == 1_700_086_400
+
+
+def test_release_leaves_a_reminder_claimed_by_a_later_sweep(table, monkeypatch):
+    respond_with(monkeypatch, 500)
+    table.item["last_fired_at"] = NOW.replace(minute=8).isoformat()
+
+    dispatch_due_reminders.dispatch_reminder(CLAIMED, NOW)
+
+    assert table.item["next_fire_at"] == 1_700_086_400
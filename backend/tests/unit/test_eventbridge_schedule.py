@@ -0,0 +1,109 @@
+import os
+import re
+import sys
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from croniter import croniter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "process_events"))
+
+from eventbridge_schedule import CompiledSchedule, compile_expression
+
+START = datetime(2026, 10, 19, 3, 30)  # a Monday
+
+# AWS numbers days of the week from 1 (Sunday), croniter from 0; steps are left alone
+AWS_DAY_NUMBER = re.compile(r"(?<![/\d])([1-7])(?!\d)")
+
+
+def croniter_next_n(expression, after, count):
+    """The croniter path this engine replaced: drop the year and renumber days of the week."""
+    fields = expression[len("cron("):-1].split()[:5]
+    fields[4] = AWS_DAY_NUMBER.sub(lambda match: str(int(match.group(1)) - 1), fields[4])
+    cron_iter = croniter(" ".join(fields), after)
+    return [cron_iter.get_next(datetime) for _ in range(count)]
+
+
+def random_field(minimum, maximum):
+    kind = random.choice(["*", "value", "list", "range", "step"])
+    if kind == "*":
+        return "*"
+    if kind == "value":
+        return str(random.randint(minimum, maximum))
+    if kind == "list":
+        return ",".join(str(value) for value in sorted(random.sample(range(minimum, maximum + 1), 3)))
+    if kind == "range":
+        low = random.randint(minimum, maximum - 1)
+        return f"{low}-{random.randint(low + 1, maximum)}"
+    return f"{random.randint(minimum, maximum)}/{random.randint(2, 5)}"
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_conformance_with_croniter_on_common_fields(seed):
+    random.seed(seed)
+    minutes, hours, months = random_field(0, 59), random_field(0, 23), random_field(1, 12)
+    if seed % 2:
+        expression = f"cron({minutes} {hours} {random_field(1, 28)} {months} ? *)"
+    else:
+        expression = f"cron({minutes} {hours} ? {months} {random_field(1, 7)} *)"
+
+    assert compile_expression(expression).next_n(START, 25) == croniter_next_n(expression, START, 25), expression
+
+
+@pytest.mark.parametrize("expression, expected", [
+    # Last day of the month, and three days before it
+    ("cron(0 9 L * ? *)", [datetime(2026, 10, 31, 9), datetime(2026, 11, 30, 9), datetime(2026, 12, 31, 9)]),
+    ("cron(0 9 L-3 * ? *)", [datetime(2026, 10, 28, 9), datetime(2026, 11, 27, 9), datetime(2026, 12, 28, 9)]),
+    # Weekday nearest the 1st (Nov 1 2026 is a Sunday) and the last weekday of the month
+    ("cron(0 9 1W * ? *)", [datetime(2026, 11, 2, 9), datetime(2026, 12, 1, 9), datetime(2027, 1, 1, 9)]),
+    ("cron(0 9 LW * ? *)", [datetime(2026, 10, 30, 9), datetime(2026, 11, 30, 9), datetime(2026, 12, 31, 9)]),
+    # Second Tuesday and last Friday of the month
+    ("cron(0 9 ? * 3#2 *)", [datetime(2026, 11, 10, 9), datetime(2026, 12, 8, 9), datetime(2027, 1, 12, 9)]),
+    ("cron(0 9 ? * FRIL *)", [datetime(2026, 10, 30, 9), datetime(2026, 11, 27, 9), datetime(2026, 12, 25, 9)]),
+    # Ranges that wrap around the end of the week and the day
+    ("cron(0 9 ? * FRI-MON *)", [datetime(2026, 10, 19, 9), datetime(2026, 10, 23, 9), datetime(2026, 10, 24, 9)]),
+    ("cron(0 22-1 ? * MON *)", [datetime(2026, 10, 19, 22), datetime(2026, 10, 19, 23), datetime(2026, 10, 26, 0)]),
+    # The year field is honoured, and a schedule ends with its last year
+    ("cron(0 9 1 JAN ? 2028,2030)", [datetime(2028, 1, 1, 9), datetime(2030, 1, 1, 9)]),
+    ("rate(90 minutes)", [datetime(2026, 10, 19, 5), datetime(2026, 10, 19, 6, 30), datetime(2026, 10, 19, 8)]),
+])
+def test_aws_only_features(expression, expected):
+    assert compile_expression(expression).next_n(START, 3) == expected
+
+
+def test_between_is_inclusive_and_rate_keeps_its_anchor():
+    daily = compile_expression("cron(30 3 * * ? *)")
+    assert daily.between(START, START + timedelta(days=2)) == [START, START + timedelta(days=1), START + timedelta(days=2)]
+
+    anchor = datetime(2026, 10, 1, 0, 0)
+    hourly = compile_expression("rate(6 hours)")
+    assert hourly.between(START, START + timedelta(hours=12), anchor=anchor) == [
+        datetime(2026, 10, 19, 6), datetime(2026, 10, 19, 12)
+    ]
+    assert hourly.next_after(START) == START + timedelta(hours=6)
+
+
+def test_at_fires_once():
+    schedule = compile_expression("at(2026-10-20T18:00:00)")
+
+    assert schedule.next_n(START, 3) == [datetime(2026, 10, 20, 18)]
+    assert schedule.next_after(datetime(2026, 10, 21)) is None
+
+
+@pytest.mark.parametrize("expression", [
+    "cron(0 9 * *)", "cron(0 9 1 * MON *)", "cron(60 9 * * ? *)", "cron(0 9 ? * 2#6 *)",
+    "rate(0 minutes)", "rate(5 fortnights)", "at(2026-10-20)", "every day",
+])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        compile_expression(expression)
+
+
+def test_compiled_schedules_are_cached_by_expression():
+    assert compile_expression("cron(15 4 ? * MON-FRI *)") is compile_expression("cron(15 4 ? * MON-FRI *)")
+
+
+def test_compiled_schedule_requires_iter_after():
+    with pytest.raises(TypeError):
+        CompiledSchedule()
@@ -0,0 +1,111 @@
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "process_events"))
+
+from fcm_credentials import FCMCredentialManager, TOKEN_BACKGROUND_REFRESH_SECONDS, TOKEN_REFRESH_MARGIN_SECONDS
+
+NOW = 1_800_000_000
+
+
+class FakeCredentials:
+    """Issues token-1, token-2, ... each valid for an hour from the fake clock."""
+
+    def __init__(self, clock, refresh_started=None, release_refresh=None):
+        self.clock = clock
+        self.refreshes = 0
+        self.refresh_started = refresh_started
+        self.release_refresh = release_refresh
+        self.token = None
+        self.expiry = None
+
+    def refresh(self, request):
+        if self.refresh_started:
+            self.refresh_started.set()
+            self.release_refresh.wait(5)
+        self.refreshes += 1
+        self.token = f"token-{self.refreshes}"
+        self.expiry = datetime.fromtimestamp(self.clock() + 3600, timezone.utc).replace(tzinfo=None)
+
+
+class Clock:
+    def __init__(self):
+        self.now = NOW
+
+    def __call__(self):
+        return self.now
+
+
+def make_manager(**credentials_kwargs):
+    clock = Clock()
+    credentials = FakeCredentials(clock, **credentials_kwargs)
+    factory_calls = []
+
+    def credentials_factory():
+        factory_calls.append(1)
+        return credentials
+
+    manager = FCMCredentialManager(credentials_factory, request_factory=object, clock=clock)
+    return manager, credentials, clock, factory_calls
+
+
+def test_token_is_fetched_once_and_reused():
+    manager, credentials, clock, factory_calls = make_manager()
+
+    tokens = [manager.get_token() for _ in range(50)]
+    clock.now += 3600 - TOKEN_BACKGROUND_REFRESH_SECONDS - 1
+    tokens.append(manager.get_token())
+
+    assert set(tokens) == {"token-1"}
+    assert credentials.refreshes == 1
+    assert len(factory_calls) == 1  # The service account is parsed once
+
+
+def test_token_near_expiry_is_refreshed_before_use():
+    manager, credentials, clock, factory_calls = make_manager()
+    manager.get_token()
+
+    clock.now += 3600 - TOKEN_REFRESH_MARGIN_SECONDS
+    assert manager.get_token() == "token-2"
+    assert len(factory_calls) == 1
+
+
+def test_background_refresh_keeps_serving_the_current_token():
+    refresh_started, release_refresh = threading.Event(), threading.Event()
+    manager, credentials, clock, _ = make_manager()
+    manager.get_token()
+    credentials.refresh_started, credentials.release_refresh = refresh_started, release_refresh
+
+    clock.now += 3600 - TOKEN_BACKGROUND_REFRESH_SECONDS + 1
+    # Callers are not held up while the refresh is in flight, and only one refresh starts
+    assert [manager.get_token() for _ in range(5)] == ["token-1"] * 5
+    assert refresh_started.wait(5)
+    release_refresh.set()
+    manager._background_refresh.join(5)
+
+    assert manager.get_token() == "token-2"
+    assert credentials.refreshes == 2
+
+
+def test_concurrent_callers_share_one_refresh():
+    manager, credentials, _, _ = make_manager()
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(manager.get_token())) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tokens == ["token-1"] * 16
+    assert credentials.refreshes == 1
+
+
+def test_invalidate_forces_a_new_token():
+    manager, credentials, _, _ = make_manager()
+    manager.get_token()
+
+    manager.invalidate()
+
+    assert manager.get_token() == "token-2"
@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "process_events"))
+
+from fcm_transport import FCMRetryPolicy, FCMTransport, parse_retry_after
+
+
+class FCMStubHandler(BaseHTTPRequestHandler):
+    """Answers messages:send like FCM v1, over keep-alive HTTP/1.1, after a small think time."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((self.path, self.headers["Authorization"], body))
+        time.sleep(0.005)
+        token = body["message"]["token"]
+        if token == "unregistered":
+            status = 404
+        elif token == "overloaded" and self.server.unavailable_responses:
+            self.server.unavailable_responses -= 1
+            status = 503
+        else:
+            status = 200
+        payload = json.dumps({"name": "projects/test/messages/1"} if status == 200 else {"error": {"code": status}})
+        self.send_response(status)
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+class FCMStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The bare-requests benchmark opens a connection per send; the default backlog of 5 resets some
+    request_queue_size = 128
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FCMStubHandler)
+        self.requests = []
+        self.connections = 0
+        self.unavailable_responses = 0
+        self._count_lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        # Called once per accepted TCP connection, however many requests it carries
+        with self._count_lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+@pytest.fixture
+def fcm_stub():
+    server = FCMStubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def message(token="device-token"):
+    return {"message": {"token": token, "notification": {"title": "Reminder", "body": "Task: test"}}}
+
+
+def test_send_posts_to_fcm_and_reports_latency(fcm_stub):
+    server, base_url = fcm_stub
+    transport = FCMTransport(base_url=base_url)
+
+    response, latency_ms = transport.send("test", message(), "access-token")
+    missing, _ = transport.send("test", message("unregistered"), "access-token")
+
+    assert response.status_code == 200 and latency_ms > 0
+    assert missing.status_code == 404
+    assert server.requests[0] == ("/v1/projects/test/messages:send", "Bearer access-token", message())
+    assert server.connections == 1
+
+
+def test_send_push_notification_goes_through_the_shared_transport(fcm_stub, monkeypatch):
+    import process_events
+    server, base_url = fcm_stub
+    monkeypatch.setattr(process_events, "fcm_transport", FCMTransport(base_url=base_url))
+    monkeypatch.setattr(process_events, "get_access_token", lambda: "access-token")
+
+    results = [process_events.send_push_notification("device-token", "call mom", "msg") for _ in range(3)]
+
+    assert [result["status"] for result in results] == ["Notification sent"] * 3
+    assert server.connections == 1
+
+
+def test_benchmark_connection_reuse_under_concurrent_load(fcm_stub):
+    server, base_url = fcm_stub
+    sends, concurrency = 200, 16
+    url = f"{base_url}/v1/projects/test/messages:send"
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda _: requests.post(url, json=message(), timeout=5), range(sends)))
+    bare_seconds, bare_connections = time.perf_counter() - started_at, server.connections
+
+    server.connections = 0
+    transport = FCMTransport(base_url=base_url, pool_size=concurrency)
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        statuses = list(executor.map(lambda _: transport.send("test", message(), "token")[0].status_code, range(sends)))
+    pooled_seconds = time.perf_counter() - started_at
+
+    print(f"{sends} sends x{concurrency} threads: bare {bare_connections} connections in {bare_seconds * 1000:.0f} ms, "
+          f"pooled {server.connections} connections in {pooled_seconds * 1000:.0f} ms")
+    assert statuses == [200] * sends
+    assert bare_connections == sends
+    assert server.connections <= concurrency
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("2", 2.0),
+    ("-1", 0.0),
+    ("Tue, 20 Oct 2026 09:00:30 GMT", 30.0),
+    ("soon", None),
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value, now=1792486800) == expected  # 2026-10-20 09:00:00 UTC
+
+
+def test_retry_delays_back_off_with_jitter_and_honor_retry_after():
+    policy = FCMRetryPolicy(max_attempts=4, base_delay=0.5, max_delay=5, rng=lambda: 1.0)
+
+    assert [policy.get_delay(attempt) for attempt in (1, 2, 3, 4)] == [0.5, 1.0, 2.0, None]
+    assert FCMRetryPolicy(max_attempts=4, base_delay=0.5, rng=lambda: 0.5).get_delay(3) == 1.0
+    assert policy.get_delay(1, retry_after="3") == 3.0
+    assert policy.get_delay(1, retry_after="60") is None  # Longer than we hold a Lambda for
+
+
+def test_send_push_notification_retries_retryable_errors_only(fcm_stub, monkeypatch):
+    import process_events
+    server, base_url = fcm_stub
+    delays = []
+    monkeypatch.setattr(process_events, "fcm_transport", FCMTransport(base_url=base_url))
+    monkeypatch.setattr(process_events, "fcm_retry_policy", FCMRetryPolicy(max_attempts=3, sleep=delays.append))
+    monkeypatch.setattr(process_events, "get_access_token", lambda: "access-token")
+    server.unavailable_responses = 2
+
+    recovered = process_events.send_push_notification("overloaded", "call mom", "msg")
+    missing = process_events.send_push_notification("unregistered", "call mom", "msg")
+    server.unavailable_responses = 3
+    exhausted = process_events.send_push_notification("overloaded", "call mom", "msg")
+
+    assert recovered["status"] == "Notification sent" and delays[:2] == [1.0, 1.0]
+    assert missing["status"] == "Failed" and not missing["retryable"] and missing["attempts"] == 1
+    assert exhausted == {"status": "Failed", "status_code": 503, "error": {"error": {"code": 503}},
+                         "retryable": True, "attempts": 3}
+    assert len(server.requests) == 3 + 1 + 3
+
+
+def test_no_retry_is_scheduled_past_the_deadline():
+    policy = FCMRetryPolicy(max_attempts=3, base_delay=0.5, max_delay=5, rng=lambda: 1.0)
+
+    assert policy.get_delay(1, remaining_seconds=10) == 0.5
+    assert policy.get_delay(1, remaining_seconds=1.2) is None  # No time left to run the retry
+    assert policy.get_delay(1, retry_after="3", remaining_seconds=3.5) is None
+
+
+def test_send_push_notification_stops_retrying_at_the_deadline(fcm_stub, monkeypatch):
+    import process_events
+    server, base_url = fcm_stub
+    delays = []
+    monkeypatch.setattr(process_events, "fcm_transport", FCMTransport(base_url=base_url))
+    monkeypatch.setattr(process_events, "fcm_retry_policy", FCMRetryPolicy(max_attempts=3, sleep=delays.append))
+    monkeypatch.setattr(process_events, "get_access_token", lambda: "access-token")
+    server.unavailable_responses = 10
+
+    bounded = process_events.send_push_notification("overloaded", "call mom", "msg", deadline=time.monotonic() + 1.5)
+    single = process_events.send_push_notification("overloaded", "call mom", "msg", retry=False)
+    late = process_events.send_push_notification("overloaded", "call mom", "msg", deadline=time.monotonic() - 1)
+
+    assert (bounded["attempts"], bounded["retryable"]) == (1, True)  # Retry-After 1 s + an attempt > 1.5 s
+    assert single["attempts"] == 1
+    assert late["attempts"] == 0 and late["retryable"]
+    assert delays == [] and len(server.requests) == 2
@@ -0,0 +1,426 @@
+import os
+import sys
+import json
+from decimal import Decimal
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "get_reminder_list"))
+
+import get_reminder_list
+import responses
+
+
+class PagedTable:
+    """
+    In-memory stand-in for a DynamoDB query: 1 MB pages are simulated with page_size. Queries on
+    the ActiveRemindersIndex only see items with active_device, ordered by active_fire_at. Like
+    DynamoDB, every query returns fresh copies, limited to the ProjectionExpression if there is one.
+    """
+
+    def __init__(self, items, page_size):
+        self.items = sorted(items, key=lambda item: item["SK"], reverse=True)
+        self.active_items = sorted(
+            (item for item in items if "active_device" in item), key=lambda item: (item["active_fire_at"], item["SK"])
+        )
+        self.page_size = page_size
+        self.queries = []
+
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        items = self.active_items if kwargs.get("IndexName") == "ActiveRemindersIndex" else self.items
+        start = 0
+        if "ExclusiveStartKey" in kwargs:
+            start = next(i for i, item in enumerate(items) if item["SK"] == kwargs["ExclusiveStartKey"]["SK"]) + 1
+        evaluated = items[start:start + min(self.page_size, kwargs.get("Limit", self.page_size))]
+        returned = [item for item in evaluated if may_be_past(item)] if "FilterExpression" in kwargs else evaluated
+        projected = set(kwargs["ExpressionAttributeNames"].values()) if "ProjectionExpression" in kwargs else None
+        response = {"Items": [
+            {name: value for name, value in item.items() if projected is None or name in projected} for item in returned
+        ]}
+        if start + len(evaluated) < len(items):
+            last = evaluated[-1]
+            response["LastEvaluatedKey"] = {"PK": last["PK"], "SK": last["SK"]}
+            if "IndexName" in kwargs:
+                response["LastEvaluatedKey"].update(
+                    active_device=last["active_device"], active_fire_at=Decimal(last["active_fire_at"])
+                )
+        return response
+
+
+def may_be_past(item):
+    """What get_past_filter matches."""
+    if item.get("is_completed"):
+        return True
+    if "end_at" in item:
+        return item["end_at"] < datetime.now(timezone.utc).timestamp()
+    return item.get("end_date") not in (None, "None")
+
+
+def reminder_item(index):
+    item = {"PK": "CUSTOMER#device-1", "SK": f"REMINDER#{index:03d}", "task": f"task {index}", "is_completed": index % 3 == 0}
+    if not item["is_completed"]:
+        item.update(active_device="device-1", active_fire_at=(index * 7) % 25)
+    return item
+
+
+@pytest.fixture
+def table(monkeypatch):
+    paged_table = PagedTable([reminder_item(index) for index in range(25)], page_size=4)
+    monkeypatch.setattr(get_reminder_list.dynamodb, "Table", lambda name: paged_table)
+    return paged_table
+
+
+def list_reminders(**params):
+    response = get_reminder_list.handler({"queryStringParameters": {"device_id": "device-1", **params}}, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_without_limit_a_default_page_is_read(table, monkeypatch):
+    monkeypatch.setattr(get_reminder_list, "LIST_DEFAULT_LIMIT", 10)
+    status, body = list_reminders()
+    _, rest = list_reminders(cursor=body["next_cursor"], limit="20")
+
+    assert status == 200
+    assert len(body["past"]) + len(body["upcoming"]) == 10
+    assert len(rest["past"]) + len(rest["upcoming"]) == 15
+    assert rest["next_cursor"] is None
+
+
+def test_cursor_walks_through_all_reminders(table):
+    seen = []
+    cursor = None
+    while True:
+        params = {"filter": "upcoming", "limit": "5"}
+        if cursor:
+            params["cursor"] = cursor
+        status, body = list_reminders(**params)
+        assert status == 200
+        assert len(body["upcoming"]) <= 5
+        seen.extend(reminder["SK"] for reminder in body["upcoming"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    expected = [f"REMINDER#{index:03d}" for index in sorted(range(25), key=lambda index: (index * 7) % 25) if index % 3 != 0]
+    assert seen == expected
+    assert all(query["Limit"] <= 5 for query in table.queries)
+    # Completed reminders are never read for the upcoming list
+    assert all(query["IndexName"] == "ActiveRemindersIndex" and "FilterExpression" not in query for query in table.queries)
+
+
+def test_past_cursor_walks_the_whole_partition(table):
+    seen = []
+    cursor = None
+    while True:
+        params = {"filter": "past", "limit": "4"}
+        if cursor:
+            params["cursor"] = cursor
+        status, body = list_reminders(**params)
+        assert status == 200
+        seen.extend(reminder["SK"] for reminder in body["past"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [f"REMINDER#{index:03d}" for index in reversed(range(25)) if index % 3 == 0]
+
+
+@pytest.mark.parametrize("params", [{"limit": "0"}, {"limit": "abc"}, {"cursor": "not-a-cursor"}])
+def test_invalid_paging_parameters(table, params):
+    status, body = list_reminders(**params)
+
+    assert status == 400
+
+
+@pytest.mark.parametrize("params, last_evaluated_key", [
+    ({}, {"PK": "CUSTOMER#device-2", "SK": "REMINDER#001"}),
+    ({"filter": "upcoming"}, {"PK": "CUSTOMER#device-1", "SK": "REMINDER#001", "active_device": "device-2", "active_fire_at": 7}),
+    # A cursor from the upcoming index cannot continue another listing
+    ({}, {"PK": "CUSTOMER#device-1", "SK": "REMINDER#001", "active_device": "device-1", "active_fire_at": 7}),
+])
+def test_cursor_cannot_read_another_device_or_listing(table, params, last_evaluated_key):
+    status, _ = list_reminders(cursor=get_reminder_list.encode_cursor(last_evaluated_key), **params)
+
+    assert status == 400
+
+
+def test_past_and_schedule_come_from_stored_fields(monkeypatch):
+    now = datetime.now(timezone.utc)
+    items = [
+        {"PK": "CUSTOMER#device-1", "SK": "REMINDER#ended", "start_date": "01-01-2020", "time": "09:00 AM",
+         "end_date": "02-01-2020", "timezone": "Asia/Kolkata", "start_at": 1577849400, "end_at": 1577989799,
+         "minutes_of_day": 540, "eventbridge_expression": "cron(30 3 * * ? *)"},
+        {"PK": "CUSTOMER#device-1", "SK": "REMINDER#daily", "start_date": "01-01-2020", "time": "09:00 AM",
+         "timezone": "Asia/Kolkata", "start_at": 1577849400, "minutes_of_day": 540,
+         "eventbridge_expression": "cron(30 3 * * ? *)"},
+        # Written before the canonical fields existed
+        {"PK": "CUSTOMER#device-1", "SK": "REMINDER#legacy", "start_date": "2020-01-01", "time": "9:00 am",
+         "end_date": "2099-12-31", "eventbridge_expression": "rate(1 day)"},
+    ]
+    monkeypatch.setattr(get_reminder_list.dynamodb, "Table", lambda name: PagedTable(items, page_size=10))
+
+    status, body = list_reminders(include_schedule="true")
+
+    assert status == 200
+    assert [reminder["SK"] for reminder in body["past"]] == ["REMINDER#ended"]
+    upcoming = {reminder["SK"]: reminder for reminder in body["upcoming"]}
+    assert set(upcoming) == {"REMINDER#daily", "REMINDER#legacy"}
+    first = datetime.fromisoformat(upcoming["REMINDER#daily"]["next_occurrences"][0])
+    assert first > now and (first.hour, first.minute) == (9, 0)
+    assert len(upcoming["REMINDER#legacy"]["next_occurrences"]) == 3
+
+
+def test_stored_occurrences_are_served_until_stale(monkeypatch):
+    now_epoch = int(datetime.now(timezone.utc).timestamp())
+    stored = ["stored-1", "stored-2", "stored-3"]
+    base = {"PK": "CUSTOMER#device-1", "start_date": "01-01-2020", "time": "09:00 AM", "timezone": "Asia/Kolkata",
+            "start_at": 1577849400, "minutes_of_day": 540, "eventbridge_expression": "cron(30 3 * * ? *)",
+            "next_occurrences": stored}
+    items = [
+        {**base, "SK": "REMINDER#fresh", "next_occurrences_expire_at": now_epoch + 3600},
+        {**base, "SK": "REMINDER#stale", "next_occurrences_expire_at": now_epoch - 60},
+    ]
+    monkeypatch.setattr(get_reminder_list.dynamodb, "Table", lambda name: PagedTable(items, page_size=10))
+
+    _, with_schedule = list_reminders(include_schedule="true")
+    _, without_schedule = list_reminders()
+
+    upcoming = {reminder["SK"]: reminder for reminder in with_schedule["upcoming"]}
+    assert upcoming["REMINDER#fresh"]["next_occurrences"] == stored
+    assert upcoming["REMINDER#stale"]["next_occurrences"] != stored
+    assert len(upcoming["REMINDER#stale"]["next_occurrences"]) == 3
+    assert all("next_occurrences" not in reminder and "next_occurrences_expire_at" not in reminder
+               for reminder in without_schedule["upcoming"])
+
+
+class ViewsTable:
+    """In-memory ReminderListViewsTable supporting the two updates store_list_view makes."""
+
+    def __init__(self):
+        self.views = {}
+        self.gets = 0
+
+    def get_item(self, Key):
+        self.gets += 1
+        view = self.views.get(Key["device_id"])
+        return {"Item": dict(view)} if view else {}
+
+    def delete_item(self, Key):
+        self.views.pop(Key["device_id"], None)
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues=None, ConditionExpression=None, **kwargs):
+        view = dict(self.views.get(Key["device_id"], {"device_id": Key["device_id"]}))
+        values = ExpressionAttributeValues or {}
+        if ConditionExpression and not self.condition_holds(view, ConditionExpression, values):
+            raise get_reminder_list.dynamodb.meta.client.exceptions.ConditionalCheckFailedException(
+                {"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem"
+            )
+        if UpdateExpression.startswith("ADD source_version"):
+            view["source_version"] = Decimal(view.get("source_version", 0) + values[":one"])
+        else:
+            for name in ("body", "content_hash", "valid_until", "built_at", "too_large"):
+                if f":{name}" in values:
+                    view[name] = values[f":{name}"]
+                elif f" {name}" in UpdateExpression.partition("REMOVE")[2].partition("ADD")[0]:
+                    view.pop(name, None)
+            if ":one" in values:
+                view["version"] = Decimal(view.get("version", 0) + values[":one"])
+        self.views[Key["device_id"]] = view
+        return {"Attributes": dict(view)}
+
+    @staticmethod
+    def condition_holds(view, condition, values):
+        if "source_version = :source_version" in condition and view.get("source_version") != values[":source_version"]:
+            return False
+        if "attribute_not_exists(source_version)" in condition and "source_version" in view:
+            return False
+        if "content_hash <> :content_hash" in condition:
+            return view.get("content_hash") != values[":content_hash"]
+        if "content_hash = :content_hash" in condition:
+            return view.get("content_hash") == values[":content_hash"]
+        return True
+
+
+@pytest.fixture
+def views(monkeypatch, table):
+    views_table = ViewsTable()
+    monkeypatch.setattr(get_reminder_list, "REMINDER_LIST_VIEWS_TABLE_NAME", "views")
+    monkeypatch.setattr(get_reminder_list.dynamodb, "Table", lambda name: views_table if name == "views" else table)
+    return views_table
+
+
+def list_reminders_with_headers(headers=None, **params):
+    return get_reminder_list.handler(
+        {"queryStringParameters": {"device_id": "device-1", **params}, "headers": headers or {}}, None
+    )
+
+
+def test_view_is_built_once_then_served_with_a_single_get(table, views):
+    first = list_reminders_with_headers(include_schedule="true")
+    queries_after_build = len(table.queries)
+    second = list_reminders_with_headers(include_schedule="true")
+    upcoming = json.loads(list_reminders_with_headers(filter="upcoming")["body"])
+
+    assert first["statusCode"] == second["statusCode"] == 200
+    assert first["body"] == second["body"]
+    assert len(table.queries) == queries_after_build
+    assert second["headers"]["ETag"] == '"1-all-schedule"'
+    assert set(upcoming) == {"upcoming", "next_cursor"}
+    assert len(upcoming["upcoming"]) == len(json.loads(first["body"])["upcoming"])
+
+
+def test_if_none_match_gets_304_until_the_content_changes(table, views):
+    etag = list_reminders_with_headers()["headers"]["ETag"]
+
+    assert list_reminders_with_headers({"If-None-Match": etag})["statusCode"] == 304
+
+    # Rebuilding unchanged content keeps the version, so clients keep their cached list
+    document, valid_until = get_reminder_list.build_list_view(table, "device-1", datetime.now(timezone.utc))
+    get_reminder_list.store_list_view("device-1", document, valid_until)
+    assert list_reminders_with_headers({"if-none-match": etag})["statusCode"] == 304
+
+    table.items[0]["task"] = "changed"
+    document, valid_until = get_reminder_list.build_list_view(table, "device-1", datetime.now(timezone.utc))
+    get_reminder_list.store_list_view("device-1", document, valid_until)
+    response = list_reminders_with_headers({"If-None-Match": etag})
+    assert response["statusCode"] == 200
+    assert response["headers"]["ETag"] == '"2-all-plain"'
+
+
+def test_each_representation_has_its_own_etag(table, views, monkeypatch):
+    monkeypatch.setattr(responses, "GZIP_MIN_BYTES", 1)
+    etags = {
+        list_reminders_with_headers(**params)["headers"]["ETag"]
+        for params in ({}, {"include_schedule": "true"}, {"filter": "past"}, {"filter": "upcoming"})
+    }
+    gzipped = list_reminders_with_headers({"Accept-Encoding": "gzip"})
+
+    assert len(etags) == 4
+    assert gzipped["headers"]["ETag"] == '"1-all-plain-gzip"'
+    assert list_reminders_with_headers({"If-None-Match": gzipped["headers"]["ETag"]})["statusCode"] == 304
+    assert list_reminders_with_headers({"If-None-Match": '"1-all-plain"'}, filter="past")["statusCode"] == 200
+
+
+def test_request_rebuild_does_not_overwrite_a_newer_stream_rebuild(table, views):
+    # The request path reads the (missing) view and the reminders...
+    stale_document, valid_until = get_reminder_list.build_list_view(table, "device-1", datetime.now(timezone.utc))
+    # ...then a reminder changes, and the stream consumer marks and rebuilds the view first
+    table.items[0]["task"] = "changed"
+    source_version = get_reminder_list.mark_list_view_changed("device-1")
+    document, valid_until = get_reminder_list.build_list_view(table, "device-1", datetime.now(timezone.utc))
+    assert get_reminder_list.store_list_view("device-1", document, valid_until, source_version) is not None
+
+    assert get_reminder_list.store_list_view("device-1", stale_document, valid_until, None) is None
+    assert "changed" in views.views["device-1"]["body"]
+
+
+def test_expired_view_is_rebuilt(table, views):
+    list_reminders_with_headers()
+    views.views["device-1"]["valid_until"] = 0
+    queries = len(table.queries)
+
+    list_reminders_with_headers()
+
+    assert len(table.queries) > queries
+    assert views.views["device-1"]["valid_until"] > 0
+
+
+def test_lists_too_large_for_a_view_are_paged(table, views, monkeypatch):
+    monkeypatch.setattr(get_reminder_list, "LIST_VIEW_MAX_BYTES", 100)
+    monkeypatch.setattr(get_reminder_list, "LIST_DEFAULT_LIMIT", 10)
+    first = json.loads(list_reminders_with_headers()["body"])
+    queries = len(table.queries)
+    second = json.loads(list_reminders_with_headers()["body"])
+
+    assert views.views["device-1"]["too_large"] is True and "body" not in views.views["device-1"]
+    assert len(first["past"]) + len(first["upcoming"]) == 10 and first["next_cursor"]
+    assert second == first
+    # The marker is served from the view table, so the whole list is not rebuilt again
+    assert len(table.queries) - queries == 3
+
+
+def test_paged_requests_bypass_the_view(table, views):
+    status, body = list_reminders(limit="5")
+
+    assert status == 200
+    assert views.gets == 0 and not views.views
+
+
+def test_stream_rebuilds_each_changed_device_once(table, views, monkeypatch):
+    import rebuild_reminder_list_views
+    monkeypatch.setattr(rebuild_reminder_list_views.dynamodb, "Table", lambda name: table)
+    records = [
+        {"dynamodb": {"Keys": {"PK": {"S": "CUSTOMER#device-1"}, "SK": {"S": f"REMINDER#{index:03d}"}},
+                      "SequenceNumber": str(100 + index)}}
+        for index in range(3)
+    ]
+
+    response = rebuild_reminder_list_views.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": []}
+    assert list(views.views) == ["device-1"]
+    assert len(table.queries) == 7  # One pass over the 25 items in pages of 4
+
+
+def test_stream_skips_fires_that_only_advance_next_occurrences(table, views, monkeypatch):
+    import rebuild_reminder_list_views
+    monkeypatch.setattr(rebuild_reminder_list_views.dynamodb, "Table", lambda name: table)
+    old_image = {"PK": {"S": "CUSTOMER#device-1"}, "SK": {"S": "REMINDER#001"}, "task": {"S": "task 1"},
+                 "next_occurrences": {"L": [{"S": "2026-10-18T09:00:00"}]}, "next_occurrences_expire_at": {"N": "1"},
+                 "active_fire_at": {"N": "1"}}
+    advanced = dict(old_image, next_occurrences={"L": [{"S": "2026-10-19T09:00:00"}]},
+                    next_occurrences_expire_at={"N": "2"}, active_fire_at={"N": "2"})
+    fire = {"eventName": "MODIFY", "dynamodb": {"Keys": {"PK": old_image["PK"], "SK": old_image["SK"]},
+                                                 "OldImage": old_image, "NewImage": advanced, "SequenceNumber": "100"}}
+    edit = {"eventName": "MODIFY", "dynamodb": dict(fire["dynamodb"], NewImage=dict(advanced, task={"S": "edited"}))}
+
+    rebuild_reminder_list_views.handler({"Records": [fire]}, None)
+    assert views.views == {}
+
+    rebuild_reminder_list_views.handler({"Records": [fire, edit]}, None)
+    assert list(views.views) == ["device-1"]
+
+
+def test_past_means_completed_or_expired_with_or_without_the_view(monkeypatch):
+    base = {"PK": "CUSTOMER#device-1", "start_date": "01-01-2020", "time": "09:00 AM", "timezone": "Asia/Kolkata",
+            "start_at": 1577849400, "minutes_of_day": 540, "eventbridge_expression": "cron(30 3 * * ? *)"}
+    items = [
+        dict(base, SK="REMINDER#active", active_device="device-1", active_fire_at=1),
+        dict(base, SK="REMINDER#completed", is_completed=True),
+        dict(base, SK="REMINDER#completed-before-its-end", is_completed=True, end_date="31-12-2099", end_at=4102444799),
+        dict(base, SK="REMINDER#expired", end_date="02-01-2020", end_at=1577989799, active_device="device-1",
+             active_fire_at=2),
+    ]
+    paged_table = PagedTable(items, page_size=10)
+    views_table = ViewsTable()
+    monkeypatch.setattr(get_reminder_list.dynamodb, "Table", lambda name: views_table if name == "views" else paged_table)
+
+    _, paged = list_reminders(filter="past", limit="10")
+    monkeypatch.setattr(get_reminder_list, "REMINDER_LIST_VIEWS_TABLE_NAME", "views")
+    _, viewed = list_reminders(filter="past")
+
+    expected = {"REMINDER#completed", "REMINDER#completed-before-its-end", "REMINDER#expired"}
+    assert {reminder["SK"] for reminder in paged["past"]} == expected
+    assert {reminder["SK"] for reminder in viewed["past"]} == expected
+    assert views_table.views
+
+
+def test_fields_are_projected_and_bypass_the_view(table, views):
+    status, body = list_reminders(filter="upcoming", fields="task, SK,task")
+
+    assert status == 200
+    assert views.gets == 0
+    query = table.queries[-1]
+    # The keys and what enrichment needs are always read; time is a reserved word
+    assert {"task", "SK", "is_completed", "time"} <= set(query["ExpressionAttributeNames"].values())
+    assert "time" not in query["ProjectionExpression"]
+    assert body["upcoming"] and all(set(reminder) == {"SK", "task"} for reminder in body["upcoming"])
+
+
+@pytest.mark.parametrize("fields", [",", "task;SK", "1task", ",".join(f"field_{index}" for index in range(21))])
+def test_invalid_fields(table, fields):
+    status, _ = list_reminders(fields=fields)
+
+    assert status == 400
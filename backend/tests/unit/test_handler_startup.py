@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "scripts"))
+
+from profile_handler_imports import HANDLERS, profile_handler
+
+# Container init budget for importing a handler module; override with HANDLER_IMPORT_BUDGET_MS on slow machines
+HANDLER_IMPORT_BUDGET_MS = float(os.getenv("HANDLER_IMPORT_BUDGET_MS", "1200"))
+
+# Only imported by the code paths that need them, never during container init
+DEFERRED_MODULES = {
+    "langchain_core", "langchain_openai", "openai", "pydantic", "httpx",
+    "dateparser", "parsedatetime", "croniter", "google.auth", "google.oauth2", "requests", "dotenv",
+}
+
+
+@pytest.mark.parametrize("asset_dir, module", HANDLERS)
+def test_handler_import_stays_within_budget(asset_dir, module):
+    timings = profile_handler(asset_dir, module)
+    imported = {name.strip() for _, _, name in timings}
+    total_ms = next(cumulative for cumulative, _, name in timings if name.strip() == module) / 1000
+
+    assert not imported & DEFERRED_MODULES, f"{module} imports {sorted(imported & DEFERRED_MODULES)} at init"
+    assert total_ms < HANDLER_IMPORT_BUDGET_MS, f"{module} took {total_ms:.0f} ms to import"
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "set_reminder_by_text"))
+
+import helpers
+import llm_invoker
+from llm_invoker import Deadline, LLMDeadlineExceeded, run_hedged
+
+
+class AuthenticationError(Exception):
+    """Stands in for the SDK's 401 error."""
+
+
+class APITimeoutError(Exception):
+    """Stands in for the SDK's timeout error; matched by name like the real one."""
+
+
+def failing(error):
+    def call(*args):
+        raise error
+    return call
+
+
+def test_errors_other_than_timeouts_propagate():
+    with pytest.raises(AuthenticationError):
+        run_hedged(failing(AuthenticationError("invalid api key")), Deadline(5), attempt_timeout=5, hedge_after=5)
+
+
+def test_timeout_errors_become_deadline_exceeded():
+    with pytest.raises(LLMDeadlineExceeded):
+        run_hedged(failing(APITimeoutError("timed out")), Deadline(5), attempt_timeout=5, hedge_after=5)
+
+
+def test_running_out_of_budget_is_deadline_exceeded(monkeypatch):
+    monkeypatch.setattr(llm_invoker, "LLM_MIN_ATTEMPT_SECONDS", 0.05)
+
+    with pytest.raises(LLMDeadlineExceeded):
+        run_hedged(lambda: time.sleep(1), Deadline(0.2), attempt_timeout=0.2, hedge_after=0.1)
+
+
+def test_best_effort_parse_is_returned_for_confirmation_not_as_a_result(monkeypatch):
+    monkeypatch.setattr(helpers, "invoke_reminder_chain", failing(LLMDeadlineExceeded("no answer")))
+    monkeypatch.setattr(helpers.parse_cache, "get", lambda text: None)
+    monkeypatch.setattr(helpers, "FAST_PARSER_MODE", "off")
+
+    with pytest.raises(helpers.ReminderNeedsConfirmation) as raised:
+        helpers.get_reminder_schedule_json("call mom every monday at 9am", Deadline(5))
+
+    assert raised.value.parsed_data["task"]
+
+
+def test_llm_errors_are_not_replaced_by_a_rules_parse(monkeypatch):
+    monkeypatch.setattr(helpers, "invoke_reminder_chain", failing(AuthenticationError("invalid api key")))
+    monkeypatch.setattr(helpers.parse_cache, "get", lambda text: None)
+    monkeypatch.setattr(helpers, "FAST_PARSER_MODE", "off")
+
+    with pytest.raises(AuthenticationError):
+        helpers.get_reminder_schedule_json("call mom every monday at 9am", Deadline(5))
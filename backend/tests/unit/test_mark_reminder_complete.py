@@ -0,0 +1,84 @@
+import os
+import sys
+import json
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "mark_reminder_complete"))
+
+import mark_reminder_complete
+
+
+class ResourceNotFoundException(Exception):
+    pass
+
+
+class FakeClient:
+    """Scheduler or EventBridge client recording calls; names in `missing` do not exist."""
+
+    def __init__(self, missing=()):
+        self.calls = []
+        self.missing = set(missing)
+        self.exceptions = SimpleNamespace(ResourceNotFoundException=ResourceNotFoundException)
+
+    def __getattr__(self, operation):
+        def call(Name):
+            self.calls.append((operation, Name))
+            if Name in self.missing:
+                raise ResourceNotFoundException(Name)
+        return call
+
+
+class FakeRemindersTable:
+    def __init__(self, item):
+        self.item = item
+
+    def Table(self, name):
+        return self
+
+    def update_item(self, **kwargs):
+        self.item.update(is_completed=True, updated_at="now", reminder_version=self.item["reminder_version"] + 1)
+        return {"Attributes": dict(self.item)}
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    scheduler, events = FakeClient(missing=["reminder_gone"]), FakeClient()
+    monkeypatch.setattr(mark_reminder_complete, "scheduler", scheduler)
+    monkeypatch.setattr(mark_reminder_complete, "events_client", events)
+    return scheduler, events
+
+
+def complete(monkeypatch, reminder_id, expression):
+    table = FakeRemindersTable({"PK": "CUSTOMER#device-1", "SK": f"REMINDER#{reminder_id}",
+                                "eventbridge_expression": expression, "reminder_version": 1})
+    monkeypatch.setattr(mark_reminder_complete, "dynamodb", table)
+    event = {"body": json.dumps({"device_id": "device-1", "reminder_id": reminder_id})}
+    return mark_reminder_complete.handler(event, None)
+
+
+def test_one_time_reminder_has_its_scheduler_job_deleted(monkeypatch, clients):
+    scheduler, events = clients
+
+    response = complete(monkeypatch, "once", "at(2026-10-20T09:00:00)")
+
+    assert response["statusCode"] == 200
+    assert scheduler.calls == [("delete_schedule", "reminder_once")]
+    assert events.calls == []
+    assert json.loads(response["body"])["updated_attributes"] == {
+        "is_completed": True, "updated_at": "now", "reminder_version": 2
+    }
+
+
+def test_missing_scheduler_job_is_not_an_error(monkeypatch, clients):
+    assert complete(monkeypatch, "gone", "at(2026-10-20T09:00:00)")["statusCode"] == 200
+
+
+def test_recurring_reminder_has_its_rule_disabled(monkeypatch, clients):
+    scheduler, events = clients
+
+    complete(monkeypatch, "daily", "cron(30 3 * * ? *)")
+
+    assert scheduler.calls == []
+    assert events.calls == [("describe_rule", "reminder_daily"), ("disable_rule", "reminder_daily")]
@@ -0,0 +1,110 @@
+import os
+import sys
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "set_reminder_by_text"))
+
+import parse_cache
+from parse_cache import ParseCache, get_cache_key, normalize_reminder_text
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCacheTable:
+    """ParseCacheTable by cache_key; like DynamoDB TTL, expired items stay readable until deleted."""
+
+    def __init__(self):
+        self.items = {}
+        self.fail_reads = False
+
+    def Table(self, name):
+        return self
+
+    def get_item(self, Key):
+        if self.fail_reads:
+            raise ClientError({"Error": {"Code": "ProvisionedThroughputExceededException", "Message": "slow down"}}, "GetItem")
+        item = self.items.get(Key["cache_key"])
+        return {"Item": dict(item)} if item else {}
+
+    def put_item(self, Item):
+        self.items[Item["cache_key"]] = dict(Item)
+
+
+PARSED = {"task": "drink water", "start_date_phrase": "today", "time": "05:00 PM", "repeat_frequency": {}}
+
+
+@pytest.fixture
+def table(monkeypatch):
+    fake = FakeCacheTable()
+    monkeypatch.setattr(parse_cache, "dynamodb", fake)
+    return fake
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ParseCache(table_name=None, max_entries=2)
+    cache.put("a", {"task": "a"})
+    cache.put("b", {"task": "b"})
+    assert cache.get("a") == {"task": "a"}
+
+    cache.put("c", {"task": "c"})  # Evicts b, the least recently used
+    assert cache.get("b") is None
+    assert cache.get("a") == {"task": "a"} and cache.get("c") == {"task": "c"}
+
+
+def test_trivially_different_texts_share_a_versioned_key(monkeypatch):
+    cache = ParseCache(table_name=None)
+    cache.put("Drink water at 5 P.M.!!", PARSED)
+
+    assert normalize_reminder_text("  drink WATER at 5 p.m ") == "drink water at 5 pm"
+    assert cache.get("  drink WATER at 5 pm ") == PARSED
+    assert get_cache_key("drink water at 5 pm").startswith(f"{parse_cache.PARSE_CACHE_VERSION}#")
+
+    # A new prompt or Reminder model bumps the version, so earlier parses are no longer served
+    monkeypatch.setattr(parse_cache, "PARSE_CACHE_VERSION", "v-next")
+    assert cache.get("drink water at 5 pm") is None
+
+
+def test_parses_are_shared_through_the_table_until_their_ttl(table):
+    clock = Clock()
+    ParseCache(table_name="cache", ttl_seconds=60, clock=clock).put("Drink water at 5 pm", PARSED)
+    [item] = table.items.values()
+    assert item["expires_at"] == 1060
+    assert item["normalized_text"] == "drink water at 5 pm"
+
+    # Another container misses its own LRU and reads the table, then serves it locally
+    other = ParseCache(table_name="cache", ttl_seconds=60, clock=clock)
+    assert other.get("drink water at 5 pm") == PARSED
+    assert other.get("drink water at 5 pm") == PARSED
+    assert other.stats == {"LocalHit": 1, "RemoteHit": 1, "Miss": 0}
+
+    clock.now += 61
+    assert ParseCache(table_name="cache", clock=clock).get("drink water at 5 pm") is None
+    assert other.get("drink water at 5 pm") is None
+
+
+def test_table_errors_are_misses(table):
+    cache = ParseCache(table_name="cache")
+    table.fail_reads = True
+
+    assert cache.get("drink water at 5 pm") is None
+    assert cache.stats["Miss"] == 1
+
+
+def test_every_lookup_emits_one_emf_record(capsys):
+    cache = ParseCache(table_name=None)
+    cache.get("drink water at 5 pm")
+    cache.put("drink water at 5 pm", PARSED)
+    cache.get("drink water at 5 pm")
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record["_aws"]["CloudWatchMetrics"][0]["Namespace"] for record in records] == [parse_cache.METRICS_NAMESPACE] * 2
+    assert [(record["LocalHit"], record["RemoteHit"], record["Miss"]) for record in records] == [(0, 0, 1), (1, 0, 0)]
@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "set_reminder_by_text"))
+
+import process_reminder_jobs
+import set_reminder_by_text
+from set_reminder_by_text import parse_bool
+
+
+class FakeRemindersTable:
+    def __init__(self, reminder_version=1):
+        self.puts = []
+        self.reminder_version = reminder_version
+
+    def Table(self, name):
+        return self
+
+    def get_item(self, Key):
+        return {"Item": {"PK": Key["PK"], "SK": Key["SK"], "status": "PENDING", "reminder_version": self.reminder_version}}
+
+    def put_item(self, Item):
+        self.puts.append(Item)
+
+
+def job_record(message_id, reminder_id, message_type=set_reminder_by_text.REMINDER_JOB_MESSAGE_TYPE):
+    return {"messageId": message_id, "body": json.dumps({
+        "type": message_type, "device_id": "device-1", "reminder_id": reminder_id,
+        "reminder_text": f"reminder {reminder_id}"
+    })}
+
+
+@pytest.fixture
+def table(monkeypatch):
+    fake = FakeRemindersTable()
+    monkeypatch.setattr(process_reminder_jobs, "dynamodb", fake)
+    return fake
+
+
+def test_best_effort_guesses_are_retried_not_scheduled(table, monkeypatch):
+    guess = {"task": "reminder a", "start_date_phrase": "today", "time": "11:00 AM", "repeat_frequency": {}}
+    monkeypatch.setattr(process_reminder_jobs, "parse_reminder_texts", lambda texts, deadline: [(guess, "rules_fallback")])
+
+    response = process_reminder_jobs.handler({"Records": [job_record("m1", "a")]}, None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "m1"}]}
+    assert table.puts == []
+
+
+def test_error_reports_on_the_queue_are_not_scheduled(table, monkeypatch):
+    parsed = {"task": "reminder a", "start_date_phrase": "today", "time": "11:00 AM", "repeat_frequency": {}}
+    monkeypatch.setattr(process_reminder_jobs, "parse_reminder_texts", lambda texts, deadline: [(parsed, "llm")] * len(texts))
+    records = [job_record("m1", "a", set_reminder_by_text.REMINDER_ERROR_MESSAGE_TYPE), job_record("m2", "b", None)]
+
+    response = process_reminder_jobs.handler({"Records": records}, None)
+
+    assert response == {"batchItemFailures": []}
+    assert table.puts == []
+
+
+def test_llm_errors_fail_every_job(table, monkeypatch):
+    def parse_reminder_texts(texts, deadline):
+        raise RuntimeError("invalid api key")
+    monkeypatch.setattr(process_reminder_jobs, "parse_reminder_texts", parse_reminder_texts)
+
+    response = process_reminder_jobs.handler({"Records": [job_record("m1", "a"), job_record("m2", "b")]}, None)
+
+    assert response == {"batchItemFailures": [{"itemIdentifier": "m1"}, {"itemIdentifier": "m2"}]}
+
+
+class FakeScheduler:
+    def __init__(self, existing=()):
+        self.schedules = {name: None for name in existing}
+
+    def create_schedule(self, Name, **kwargs):
+        if Name in self.schedules:
+            raise ClientError({"Error": {"Code": "ConflictException", "Message": "exists"}}, "CreateSchedule")
+        self.schedules[Name] = kwargs["Target"]["Input"]
+
+    def update_schedule(self, Name, **kwargs):
+        self.schedules[Name] = kwargs["Target"]["Input"]
+
+
+def test_retried_job_outranks_the_pending_item_and_overwrites_the_schedule(monkeypatch):
+    table = FakeRemindersTable(reminder_version=3)
+    monkeypatch.setattr(process_reminder_jobs, "dynamodb", table)
+    # A previous attempt created the schedule but did not get to write the item
+    scheduler = FakeScheduler(existing=["reminder_a"])
+    monkeypatch.setattr(set_reminder_by_text, "scheduler", scheduler)
+    monkeypatch.setattr(set_reminder_by_text, "SCHEDULING_MODE", "eventbridge")
+    parsed = {"task": "call mom", "start_date_phrase": "tomorrow", "time": "09:00 AM", "repeat_frequency": {}}
+    monkeypatch.setattr(process_reminder_jobs, "parse_reminder_texts", lambda texts, deadline: [(parsed, "llm")])
+
+    response = process_reminder_jobs.handler({"Records": [job_record("m1", "a")]}, None)
+
+    assert response == {"batchItemFailures": []}
+    [item] = table.puts
+    assert item["reminder_version"] == 4
+    payload = json.loads(scheduler.schedules["reminder_a"])
+    assert payload["reminder_version"] == 4
+    assert payload["task"] == "call mom"
+
+
+@pytest.mark.parametrize("value, expected", [
+    (True, True), (False, False), ("true", True), ("false", False), ("False", False), ("0", False), ("1", True), (None, False),
+])
+def test_async_flag_is_parsed_as_a_boolean(value, expected):
+    assert parse_bool(value) is expected
+
+
+def test_unreadable_time_is_rejected_not_stored_as_none():
+    reminder_schedule_json = {"task": "call mom", "start_date": "18-10-2026", "time": "whenever you like"}
+
+    with pytest.raises(ValueError):
+        set_reminder_by_text.build_reminder_item(
+            "device-1", "a", reminder_schedule_json, "at(2026-10-18T09:00:00)", "Tomorrow"
+        )
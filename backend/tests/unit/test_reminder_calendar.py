@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import random
+import calendar
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "get_reminder_list"))
+
+import get_reminder_calendar
+from occurrence_expansion import expand_cron_with_schedule, expand_occurrences, format_occurrences
+
+
+def epoch(*args):
+    return calendar.timegm(datetime(*args).timetuple())
+
+
+FROM_EPOCH = epoch(2026, 10, 1)
+TO_EPOCH = epoch(2026, 12, 31, 23, 59, 59)
+
+
+@pytest.mark.parametrize("expression", [
+    "cron(30 3 * * ? *)",
+    "cron(0 4 ? * MON-FRI *)",
+    "cron(15 10 ? * 1,7 *)",
+    "cron(0 9 1/3 * ? *)",
+    "cron(0/20 8-9 ? * WED *)",
+    "cron(45 23 5,20 NOV-DEC ? *)",
+    "cron(0 12 31 * ? *)",
+])
+def test_cron_expansion_matches_compiled_schedule(expression):
+    assert expand_occurrences(expression, FROM_EPOCH, TO_EPOCH).tolist() == \
+        expand_cron_with_schedule(expression, FROM_EPOCH, TO_EPOCH).tolist()
+
+
+def test_unsupported_cron_features_fall_back_to_compiled_schedule():
+    fires = expand_occurrences("cron(0 9 L * ? *)", FROM_EPOCH, TO_EPOCH)
+
+    assert fires.tolist() == [epoch(2026, 10, 31, 9), epoch(2026, 11, 30, 9), epoch(2026, 12, 31, 9)]
+
+
+def test_rate_is_anchored_to_the_start_and_bounded_by_the_end():
+    start_at = epoch(2026, 9, 30, 22)
+
+    fires = expand_occurrences("rate(6 hours)", FROM_EPOCH, TO_EPOCH, start_at=start_at, end_at=epoch(2026, 10, 2))
+
+    assert fires.tolist() == [epoch(2026, 10, 1, hour) for hour in (4, 10, 16, 22)]
+
+
+def test_at_expression_is_in_local_time():
+    assert expand_occurrences("at(2026-10-20T18:00:00)", FROM_EPOCH, TO_EPOCH).tolist() == [epoch(2026, 10, 20, 12, 30)]
+    assert expand_occurrences("at(2027-01-20T18:00:00)", FROM_EPOCH, TO_EPOCH).tolist() == []
+
+
+def test_format_occurrences_uses_the_offset_in_effect():
+    assert format_occurrences([epoch(2026, 10, 20, 3, 30)]) == ["2026-10-20T09:00:00+05:30"]
+    assert format_occurrences([epoch(2026, 3, 8, 6, 30), epoch(2026, 3, 8, 7, 30)], "America/New_York") == [
+        "2026-03-08T01:30:00-05:00", "2026-03-08T03:30:00-04:00"
+    ]
+
+
+@pytest.mark.parametrize("params", [{}, {"from": "2026-10-01"}, {"from": "01-10-2026", "to": "31-10-2026"},
+                                    {"from": "2026-10-31", "to": "2026-10-01"}, {"from": "2026-01-01", "to": "2026-12-31"},
+                                    {"from": "2026-10-01", "to": "2026-10-31", "offset": "-1"}])
+def test_invalid_ranges(params):
+    response = get_reminder_calendar.handler({"queryStringParameters": {"device_id": "device-1", **params}}, None)
+
+    assert response["statusCode"] == 400
+
+
+def test_calendar_lists_occurrences_in_order(monkeypatch):
+    items = [
+        {"PK": "CUSTOMER#device-1", "SK": "REMINDER#daily", "task": "walk", "eventbridge_expression": "cron(30 3 * * ? *)",
+         "start_at": epoch(2026, 10, 10, 3, 30), "end_at": epoch(2026, 10, 12, 18, 29, 59), "timezone": "Asia/Kolkata"},
+        {"PK": "CUSTOMER#device-1", "SK": "REMINDER#once", "task": "call", "eventbridge_expression": "at(2026-10-11T07:00:00)",
+         "start_date": "11-10-2026", "time": "07:00 AM"},
+    ]
+
+    class Table:
+        def query(self, **kwargs):
+            return {"Items": items}
+
+    monkeypatch.setattr(get_reminder_calendar.dynamodb, "Table", lambda name: Table())
+    response = get_reminder_calendar.handler(
+        {"queryStringParameters": {"device_id": "device-1", "from": "2026-10-01", "to": "2026-10-31"}}, None
+    )
+
+    assert response["statusCode"] == 200
+    assert [(occurrence["reminder_id"], occurrence["occurs_at"]) for occurrence in json.loads(response["body"])["occurrences"]] == [
+        ("daily", "2026-10-10T09:00:00+05:30"),
+        ("once", "2026-10-11T07:00:00+05:30"),
+        ("daily", "2026-10-11T09:00:00+05:30"),
+        ("daily", "2026-10-12T09:00:00+05:30"),
+    ]
+
+
+def hundreds_of_reminders():
+    random.seed(3)
+    expressions = [
+        f"cron({random.randint(0, 59)} {random.randint(0, 23)} * * ? *)",
+        f"cron({random.randint(0, 59)} {random.randint(0, 23)} ? * MON-FRI *)",
+        f"cron(0 {random.randint(0, 23)} 1/{random.randint(2, 5)} * ? *)",
+        f"rate({random.randint(1, 12)} hours)",
+    ]
+    return [
+        {"PK": "CUSTOMER#device-1", "SK": f"REMINDER#{index}", "task": f"task {index}",
+         "eventbridge_expression": expressions[index % len(expressions)], "start_at": epoch(2026, 9, 1),
+         "timezone": "Asia/Kolkata"}
+        for index in range(500)
+    ]
+
+
+def test_month_of_hundreds_of_reminders_expands_in_order():
+    from_epoch, to_epoch = get_reminder_calendar.parse_calendar_range("2026-10-01", "2026-10-31")
+
+    occurrences = get_reminder_calendar.expand_reminders(hundreds_of_reminders(), from_epoch, to_epoch)
+
+    assert len(occurrences) > 10_000
+    occurs_at = [occurrence["occurs_at"] for occurrence in occurrences]
+    assert occurs_at == sorted(occurs_at) and occurs_at[0] >= "2026-10-01T00:00:00+05:30"
+
+
+def test_calendar_is_paged_by_offset(monkeypatch):
+    items = hundreds_of_reminders()
+
+    class Table:
+        def query(self, **kwargs):
+            return {"Items": items}
+
+    monkeypatch.setattr(get_reminder_calendar.dynamodb, "Table", lambda name: Table())
+    monkeypatch.setattr(get_reminder_calendar, "CALENDAR_MAX_OCCURRENCES", 4000)
+    from_epoch, to_epoch = get_reminder_calendar.parse_calendar_range("2026-10-01", "2026-10-31")
+    expected = get_reminder_calendar.expand_reminders(items, from_epoch, to_epoch)
+
+    pages = []
+    params = {"device_id": "device-1", "from": "2026-10-01", "to": "2026-10-31"}
+    while True:
+        body = json.loads(get_reminder_calendar.handler({"queryStringParameters": params}, None)["body"])
+        pages.append(body["occurrences"])
+        if body["next_offset"] is None:
+            break
+        params = {**params, "offset": str(body["next_offset"])}
+
+    assert all(len(page) == 4000 for page in pages[:-1]) and 0 < len(pages[-1]) <= 4000
+    assert [occurrence for page in pages for occurrence in page] == expected
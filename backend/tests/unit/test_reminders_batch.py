@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "set_reminder_by_text"))
+
+import helpers
+import set_reminders_by_text_batch as batch_handler
+
+
+def client_error(code):
+    return ClientError({"Error": {"Code": code, "Message": code}}, "PutItem")
+
+
+class FakeBatchWriter:
+    def __init__(self, table):
+        self.table = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.table.fail_batch:
+            raise client_error("ValidationException")
+        return False
+
+    def put_item(self, Item):
+        self.table.batched.append(Item)
+
+
+class FakeRemindersTable:
+    def __init__(self):
+        self.fail_batch = False
+        self.failing_ids = set()
+        self.batched = []
+        self.items = {}
+
+    def Table(self, name):
+        return self
+
+    def batch_writer(self):
+        return FakeBatchWriter(self)
+
+    def put_item(self, Item):
+        if Item["reminder_id"] in self.failing_ids:
+            raise client_error("ProvisionedThroughputExceededException")
+        self.items[Item["reminder_id"]] = Item
+
+
+@pytest.fixture
+def table(monkeypatch):
+    fake = FakeRemindersTable()
+    monkeypatch.setattr(batch_handler, "dynamodb", fake)
+    return fake
+
+
+@pytest.fixture
+def schedules(monkeypatch):
+    calls = {"created": [], "deleted": []}
+    parsed = {"start_date": "2026-10-18", "time": "09:00 AM", "repeat_frequency": {}}
+    monkeypatch.setattr(batch_handler, "parse_reminder_texts",
+                        lambda texts, deadline, **kwargs: [(parsed, "llm") for _ in texts])
+    monkeypatch.setattr(batch_handler, "resolve_reminder_schedule", lambda parsed_data: parsed_data)
+    monkeypatch.setattr(batch_handler, "generate_eventbridge_expression", lambda **kwargs: "at(2026-10-18T09:00:00)")
+    monkeypatch.setattr(batch_handler, "generate_reminder_summary", lambda schedule: "Tomorrow at 9 AM")
+    # "a" and "7" are rewrites of reminders stored at version 2
+    monkeypatch.setattr(batch_handler, "get_reminder_versions", lambda device_id, reminder_ids: {"a": 2, "7": 2})
+    monkeypatch.setattr(
+        batch_handler, "build_reminder_item",
+        lambda device_id, reminder_id, *args: {
+            "PK": f"CUSTOMER#{device_id}", "SK": f"REMINDER#{reminder_id}", "reminder_id": reminder_id,
+            "previous_version": args[-1]
+        }
+    )
+    monkeypatch.setattr(batch_handler, "create_reminder_schedule", lambda rule_name, item: calls["created"].append(rule_name))
+    monkeypatch.setattr(batch_handler, "delete_reminder_schedule", lambda rule_name, item: calls["deleted"].append(rule_name))
+    return calls
+
+
+def batch_event(*reminder_ids):
+    return {"body": json.dumps({
+        "device_id": "device-1",
+        "reminders": [{"reminder_id": reminder_id, "text": f"reminder {reminder_id}"} for reminder_id in reminder_ids]
+    })}
+
+
+def test_duplicate_reminder_ids_are_rejected_before_scheduling(table, schedules):
+    response = batch_handler.handler(batch_event("a", "b", "a"), None)
+
+    assert response["statusCode"] == 400
+    assert schedules["created"] == []
+    assert table.batched == []
+
+
+def test_failed_batch_write_rolls_back_only_the_unsaved_reminders(table, schedules):
+    table.fail_batch = True
+    table.failing_ids = {"b"}
+
+    response = batch_handler.handler(batch_event("a", "b"), None)
+    results = {result["reminder_id"]: result for result in json.loads(response["body"])["results"]}
+
+    assert response["statusCode"] == 200
+    assert results["a"]["status"] == "scheduled"
+    assert results["b"]["status"] == "failed"
+    assert set(table.items) == {"a"}
+    assert table.items["a"]["previous_version"] == 2
+    assert schedules["deleted"] == ["reminder_b"]
+
+
+def test_numeric_reminder_ids_are_used_as_strings(table, schedules):
+    response = batch_handler.handler(batch_event(7, "b"), None)
+
+    assert [result["reminder_id"] for result in json.loads(response["body"])["results"]] == ["7", "b"]
+    assert table.batched[0]["SK"] == "REMINDER#7" and table.batched[0]["previous_version"] == 2
+    assert sorted(schedules["created"]) == ["reminder_7", "reminder_b"]
+
+
+def test_llm_error_fails_only_the_reminders_sent_to_the_llm(table, schedules, monkeypatch):
+    parsed = {"start_date": "2026-10-18", "time": "09:00 AM", "repeat_frequency": {}}
+    monkeypatch.setattr(batch_handler, "parse_reminder_texts",
+                        lambda texts, deadline, **kwargs: [(parsed, "rules"), (None, "llm_error")])
+
+    response = batch_handler.handler(batch_event("a", "b"), None)
+    results = {result["reminder_id"]: result for result in json.loads(response["body"])["results"]}
+
+    assert response["statusCode"] == 200
+    assert results["a"]["status"] == "scheduled"
+    assert results["b"]["status"] == "failed"
+    assert schedules["created"] == ["reminder_a"]
+
+
+class FakeParseCache:
+    def __init__(self, parses):
+        self.parses = parses
+
+    def get(self, reminder_text):
+        return self.parses.get(reminder_text)
+
+
+def test_parse_reminder_texts_can_keep_other_parses_when_the_llm_fails(monkeypatch):
+    def invoke_batch_reminder_chain(texts, deadline):
+        raise RuntimeError("invalid api key")
+    monkeypatch.setattr(helpers, "FAST_PARSER_MODE", "off")
+    monkeypatch.setattr(helpers, "parse_cache", FakeParseCache({"cached": {"task": "cached"}}))
+    monkeypatch.setattr(helpers, "invoke_batch_reminder_chain", invoke_batch_reminder_chain)
+
+    with pytest.raises(RuntimeError):
+        helpers.parse_reminder_texts(["cached", "new"])
+    assert helpers.parse_reminder_texts(["cached", "new"], raise_llm_errors=False) == [
+        ({"task": "cached"}, "cache"), (None, "llm_error")
+    ]
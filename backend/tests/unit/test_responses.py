@@ -0,0 +1,58 @@
+import os
+import sys
+import json
+import gzip
+import base64
+import filecmp
+from decimal import Decimal
+from datetime import datetime
+
+import pytest
+
+LAMBDAS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas")
+sys.path.insert(0, os.path.join(LAMBDAS_DIR, "get_reminder_list"))
+
+import responses
+
+API_ASSET_DIRS = [
+    "manage_customer_device_info", "mark_reminder_complete", "set_reminder_by_text", "set_reminder_manually",
+    "submit_feedback",
+]
+
+
+@pytest.mark.parametrize("asset_dir", API_ASSET_DIRS)
+def test_copies_are_identical(asset_dir):
+    assert filecmp.cmp(
+        os.path.join(LAMBDAS_DIR, "get_reminder_list", "responses.py"),
+        os.path.join(LAMBDAS_DIR, asset_dir, "responses.py"),
+        shallow=False
+    )
+
+
+def test_dynamodb_types_are_converted_while_encoding():
+    item = {"count": Decimal("3"), "ratio": Decimal("0.5"), "tags": {"a"}, "at": datetime(2026, 10, 19, 9, 30)}
+
+    assert json.loads(responses.to_json(item)) == {"count": 3, "ratio": 0.5, "tags": ["a"], "at": "2026-10-19T09:30:00"}
+
+
+def test_large_bodies_are_gzipped_for_clients_that_accept_it():
+    payload = {"reminders": [{"task": f"task {index}"} for index in range(1000)]}
+    event = {"headers": {"accept-encoding": "br, gzip"}}
+
+    compressed = responses.json_response(200, payload, event=event)
+    plain = responses.json_response(200, payload)
+    small = responses.json_response(200, {"ok": True}, event=event)
+
+    assert compressed["isBase64Encoded"] and compressed["headers"]["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(base64.b64decode(compressed["body"]))) == payload
+    assert "isBase64Encoded" not in plain and json.loads(plain["body"]) == payload
+    assert "Content-Encoding" not in small["headers"]
+
+
+@pytest.mark.parametrize("event, expected", [
+    ({"body": '{"device_id": "d"}'}, {"device_id": "d"}),
+    ({"body": base64.b64encode(b'{"device_id": "d"}').decode(), "isBase64Encoded": True}, {"device_id": "d"}),
+    ({"body": None}, {}),
+])
+def test_parse_body(event, expected):
+    assert responses.parse_body(event) == expected
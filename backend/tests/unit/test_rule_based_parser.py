@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "set_reminder_by_text"))
+
+from reminder_models import Reminder
+from rule_based_parser import parse_reminder_text
+
+
+@pytest.mark.parametrize("text, task, start_date_phrase, time, repeat_frequency", [
+    ("Remind me to call mom every Monday at 9am", "call mom", "today", "09:00 AM", {"selected_days_of_week": [2]}),
+    ("pay rent tomorrow at 6 pm", "pay rent", "tomorrow", "06:00 PM", {}),
+    ("water the plants every 2 days at night", "water the plants", "today", "09:00 PM", {"daily": 2}),
+    ("drink water every 2 hours", "drink water", "today", "11:00 AM", {"hourly": 2}),
+    ("take vitamins every morning", "take vitamins", "today", "08:00 AM", {"daily": 1}),
+    ("standup every weekday at 10:30 a.m.", "standup", "today", "10:30 AM", {"selected_days_of_week": [2, 3, 4, 5, 6]}),
+    ("gym on mondays and thursdays at 18:00", "gym", "today", "06:00 PM", {"selected_days_of_week": [2, 5]}),
+    ("call dad next friday", "call dad", "next friday", "11:00 AM", {}),
+])
+def test_recognised_phrasings(text, task, start_date_phrase, time, repeat_frequency):
+    parsed_data, confidence = parse_reminder_text(text)
+
+    assert confidence == 1.0
+    assert parsed_data == {
+        "task": task,
+        "start_date_phrase": start_date_phrase,
+        "end_date": None,
+        "time": time,
+        "repeat_frequency": repeat_frequency,
+        "tags": [],
+    }
+    # Rule-based output must have the same shape the LLM is asked for
+    Reminder.model_validate(parsed_data)
+
+
+@pytest.mark.parametrize("text", [
+    "meeting on 5th march",
+    "call mom at 9am and 6pm",
+    "submit report every monday until december",
+    "check in with mom",
+    "stretch every 30 minutes",
+    "call mom on christmas",
+    "pay rent at the end of the month",
+    "dentist soon",
+    "call mom later",
+    "water the plants every 0 days",
+])
+def test_unrecognised_phrasings_fall_back(text):
+    parsed_data, confidence = parse_reminder_text(text)
+
+    assert parsed_data is None
+    assert confidence == 0.0
+
+
+def test_task_keeps_the_original_casing():
+    parsed_data, confidence = parse_reminder_text("Remind me to Call John about the NDA tomorrow at 5 PM")
+
+    assert confidence == 1.0
+    assert parsed_data["task"] == "Call John about the NDA"
+
+
+def test_best_effort_parse_rejects_zero_intervals():
+    assert parse_reminder_text("water the plants every 0 days", strict=False) == (None, 0.0)
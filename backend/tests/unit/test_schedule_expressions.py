@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import calendar
+import filecmp
+from datetime import date, datetime
+
+import pytest
+
+LAMBDAS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas")
+sys.path.insert(0, os.path.join(LAMBDAS_DIR, "process_events"))
+
+from schedule_expressions import DELIVERY_PAYLOAD_VERSION, get_active_fields, get_delivery_input, get_dispatch_fields, get_fire_bucket, get_next_fire_time, get_occurrence_fields, get_schedule_fields
+
+# Lambda assets are packaged per directory, so the modules are copied rather than shared
+SCHEDULE_EXPRESSIONS_COPIES = ["get_reminder_list", "set_reminder_by_text", "set_reminder_manually"]
+
+NOW = datetime(2026, 10, 19, 3, 30)  # UTC, a Monday
+
+
+@pytest.mark.parametrize("module_file", ["schedule_expressions.py", "eventbridge_schedule.py"])
+@pytest.mark.parametrize("asset_dir", SCHEDULE_EXPRESSIONS_COPIES)
+def test_copies_are_identical(asset_dir, module_file):
+    assert filecmp.cmp(
+        os.path.join(LAMBDAS_DIR, "process_events", module_file),
+        os.path.join(LAMBDAS_DIR, asset_dir, module_file),
+        shallow=False
+    )
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("cron(30 3 * * ? *)", datetime(2026, 10, 20, 3, 30)),
+    ("cron(0 4 ? * MON,THU *)", datetime(2026, 10, 19, 4, 0)),
+    ("cron(30 3 1/2 * ? *)", datetime(2026, 10, 21, 3, 30)),
+    ("rate(2 hours)", datetime(2026, 10, 19, 5, 30)),
+    ("rate(14 days)", datetime(2026, 11, 2, 3, 30)),
+    # at() is in Asia/Kolkata (UTC+5:30)
+    ("at(2026-10-19T18:00:00)", datetime(2026, 10, 19, 12, 30)),
+])
+def test_next_fire_time(expression, expected):
+    assert get_next_fire_time(expression, NOW) == expected
+
+
+def test_schedules_stop_after_their_last_fire():
+    assert get_next_fire_time("at(2026-10-19T08:00:00)", NOW) is None
+    assert get_next_fire_time("cron(30 3 * * ? *)", NOW, end_date=date(2026, 10, 19)) is None
+
+
+def test_dispatch_fields_place_reminder_in_its_bucket():
+    fields = get_dispatch_fields("rate(2 hours)", "reminder-1", NOW, end_date="None")
+
+    assert fields["next_fire_at"] == calendar.timegm(datetime(2026, 10, 19, 5, 30).timetuple())
+    assert fields["fire_bucket"] == get_fire_bucket(datetime(2026, 10, 19, 5, 30), "reminder-1")
+    assert get_dispatch_fields("at(2026-10-19T08:00:00)", "reminder-1", NOW) == {}
+
+
+def test_schedule_fields_are_epochs_in_the_reminder_timezone():
+    fields = get_schedule_fields("20-10-2026", "06:30 PM", "2026-10-25")
+
+    assert fields == {
+        "timezone": "Asia/Kolkata",
+        "minutes_of_day": 18 * 60 + 30,
+        "start_at": calendar.timegm(datetime(2026, 10, 20, 13, 0).timetuple()),
+        "end_at": calendar.timegm(datetime(2026, 10, 25, 18, 29, 59).timetuple()),
+    }
+
+
+@pytest.mark.parametrize("time_str", ["6:30 p.m.", "18:30", " 06:30 pm"])
+def test_schedule_fields_accept_stored_time_variants(time_str):
+    assert get_schedule_fields("20-10-2026", time_str)["minutes_of_day"] == 18 * 60 + 30
+
+
+def test_schedule_fields_leave_out_what_cannot_be_parsed():
+    assert get_schedule_fields("next tuesday", "evening", "None") == {"timezone": "Asia/Kolkata"}
+
+
+def test_occurrence_fields_start_after_now_and_expire_at_the_first():
+    now_epoch = calendar.timegm(datetime(2026, 10, 19, 12, 0).timetuple())
+    start_at = calendar.timegm(datetime(2026, 10, 1, 3, 30).timetuple())
+
+    fields = get_occurrence_fields("cron(30 3 * * ? *)", start_at, now_epoch)
+
+    assert fields["next_occurrences"] == [
+        "2026-10-20T09:00:00+05:30", "2026-10-21T09:00:00+05:30", "2026-10-22T09:00:00+05:30"
+    ]
+    assert fields["next_occurrences_expire_at"] == calendar.timegm(datetime(2026, 10, 20, 3, 30).timetuple())
+
+
+def test_one_time_occurrence_never_expires():
+    assert get_occurrence_fields("at(2026-10-20T18:00:00)") == {"next_occurrences": ["2026-10-20T18:00:00"]}
+    assert get_occurrence_fields("every day") == {}
+
+
+def test_active_fields_order_by_next_fire_and_keep_finished_schedules_listed():
+    assert get_active_fields("device-1", "cron(30 3 * * ? *)", after=NOW) == {
+        "active_device": "device-1", "active_fire_at": calendar.timegm(datetime(2026, 10, 20, 3, 30).timetuple())
+    }
+    # A one-time reminder that already fired stays at its fire time until it is completed
+    assert get_active_fields("device-1", "at(2026-10-01T09:00:00)", after=NOW)["active_fire_at"] == \
+        calendar.timegm(datetime(2026, 10, 1, 3, 30).timetuple())
+    assert get_active_fields("device-1", "cron(30 3 * * ? *)", start_at=1234, end_date="01-10-2026", after=NOW)["active_fire_at"] == 1234
+
+
+def test_delivery_input_carries_the_notification_and_schedule():
+    item = {"PK": "CUSTOMER#device-1", "SK": "REMINDER#r1", "task": "call mom", "reminder_version": 3,
+            "eventbridge_expression": "cron(30 3 * * ? *)", "start_at": 1577849400, "timezone": "Asia/Kolkata"}
+
+    assert json.loads(get_delivery_input(item)) == {
+        "device_id": "device-1", "reminder_id": "r1", "payload_version": DELIVERY_PAYLOAD_VERSION,
+        "reminder_version": 3, "task": "call mom", "message": "This is a reminder to - call mom",
+        "eventbridge_expression": "cron(30 3 * * ? *)", "start_at": 1577849400, "timezone": "Asia/Kolkata",
+    }
+
+
+def test_delivery_input_too_large_for_a_target_carries_ids_only():
+    item = {"PK": "CUSTOMER#device-1", "SK": "REMINDER#r1", "task": "x" * 5000, "eventbridge_expression": "rate(1 day)"}
+
+    assert json.loads(get_delivery_input(item)) == {"device_id": "device-1", "reminder_id": "r1"}
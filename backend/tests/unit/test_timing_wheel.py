@@ -0,0 +1,74 @@
+import os
+import sys
+import random
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "backend", "lambdas", "process_events"))
+
+from local_dispatcher import LocalDispatcher, SimulatedClock, to_epoch
+from timing_wheel import TimingWheel
+
+START = datetime(2026, 10, 19, 0, 0)  # UTC, a Monday
+
+
+def test_tasks_expire_in_order_across_wheel_levels():
+    wheel = TimingWheel(start_time=0, wheel_size=8)
+    delays = [3, 70, 1, 600, 9, 5000, 64, 8]
+    for delay in delays:
+        wheel.schedule(f"task-{delay}", delay)
+    fired = []
+
+    wheel.advance_to(10_000, lambda task: fired.append((wheel.current_time, task.expires_at)))
+
+    assert [expires_at for _, expires_at in fired] == sorted(delays)
+    assert all(fired_at == expires_at for fired_at, expires_at in fired)
+    assert len(wheel) == 0
+
+
+def test_cancel_and_reschedule():
+    wheel = TimingWheel(start_time=0)
+    wheel.schedule("a", 100)
+    wheel.schedule("b", 200)
+    wheel.schedule("b", 50)
+
+    assert wheel.cancel("a")
+    assert not wheel.cancel("missing")
+    fired = []
+    wheel.advance_to(1_000, lambda task: fired.append((task.key, task.expires_at)))
+    assert fired == [("b", 50)]
+
+
+def test_dispatcher_fast_forwards_through_a_week():
+    deliveries = []
+    clock = SimulatedClock(START)
+    dispatcher = LocalDispatcher(deliver=deliveries.append, clock=clock)
+    dispatcher.add_reminder("device-1", "daily", "cron(30 3 * * ? *)")
+    dispatcher.add_reminder("device-1", "hourly", "rate(6 hours)")
+    dispatcher.add_reminder("device-2", "once", "at(2026-10-20T18:00:00)")
+    dispatcher.add_reminder("device-2", "weekdays", "cron(0 4 ? * MON-FRI *)", end_date="21-10-2026")
+
+    dispatcher.run_for(7 * 24 * 60 * 60)
+
+    counts = {}
+    for event in deliveries:
+        counts[event["reminder_id"]] = counts.get(event["reminder_id"], 0) + 1
+    assert counts == {"daily": 7, "hourly": 28, "once": 1, "weekdays": 3}
+    assert {"device_id": "device-2", "reminder_id": "once"} in deliveries
+    # Only the recurring reminders without an end date are still pending
+    assert len(dispatcher) == 2
+
+
+def test_hundreds_of_thousands_of_pending_reminders():
+    wheel = TimingWheel(start_time=to_epoch(START))
+    random.seed(7)
+    count = 200_000
+    for index in range(count):
+        wheel.schedule(index, to_epoch(START) + random.randint(1, 30 * 24 * 60 * 60))
+    for index in range(0, count, 2):
+        wheel.cancel(index)
+    fired = []
+
+    wheel.advance_to(to_epoch(START) + 30 * 24 * 60 * 60, lambda task: fired.append(task.expires_at))
+
+    assert len(fired) == count // 2
+    assert fired == sorted(fired)